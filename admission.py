@@ -0,0 +1,184 @@
+"""
+Admission control and load shedding for the prediction endpoints
+
+Requests are admitted or rejected before any parsing or scoring, so an
+overloaded service answers fast instead of letting queues (and p99) grow
+for everyone. Every limit is off (0) unless configured:
+
+- Batch-style requests (batch, stream, bulk, job submission) may run on at
+  most NEXORA_MAX_BULK_WORKERS workers at once, across the whole gunicorn
+  pool; the remaining workers stay free for single predictions. Extra
+  batches get 429 + Retry-After.
+- NEXORA_MAX_INFLIGHT caps the prediction requests a worker runs at once
+  (relevant with --threads > 1); beyond it single predictions get 503,
+  batches 429. NEXORA_MAX_INFLIGHT_BULK caps batches within a worker.
+- With NEXORA_MAX_QUEUE_MS, requests that waited longer than that before
+  reaching a worker (per the proxy's X-Request-Start header) get 503: the
+  client has probably given up already.
+- Batches above NEXORA_MAX_BATCH_ROWS employees get 413 (see api.py);
+  /api/jobs is the way to score those.
+
+Cross-worker batch slots are flock()ed files in the shared metrics
+directory, so a crashed worker's slot frees itself. Admitted and shed
+counts per priority and reason are reported in /api/stats and /metrics.
+"""
+
+import fcntl
+import os
+import threading
+import time
+
+from metrics_export import metrics_dir
+
+MAX_INFLIGHT = int(os.environ.get('NEXORA_MAX_INFLIGHT', '0'))
+MAX_INFLIGHT_BULK = int(os.environ.get('NEXORA_MAX_INFLIGHT_BULK', '0'))
+MAX_BULK_WORKERS = int(os.environ.get('NEXORA_MAX_BULK_WORKERS', '0'))
+MAX_BATCH_ROWS = int(os.environ.get('NEXORA_MAX_BATCH_ROWS', '0'))
+MAX_QUEUE_MS = float(os.environ.get('NEXORA_MAX_QUEUE_MS', '0'))
+RETRY_AFTER_SECONDS = int(os.environ.get('NEXORA_RETRY_AFTER', '1'))
+
+SINGLE = 'single'
+BULK = 'bulk'
+
+
+def queue_ms(header, now=None):
+    """Milliseconds since a proxy's X-Request-Start header, or None
+
+    Accepts 't=<timestamp>' or a bare timestamp in seconds, milliseconds or
+    microseconds since the epoch (nginx and Heroku styles).
+    """
+    if not header:
+        return None
+    value = header.strip()
+    if value.startswith('t='):
+        value = value[2:]
+    try:
+        started = float(value)
+    except ValueError:
+        return None
+    # Normalize to seconds by magnitude
+    if started > 1e14:
+        started /= 1e6
+    elif started > 1e11:
+        started /= 1e3
+    return max(0.0, ((now or time.time()) - started) * 1000)
+
+
+class BulkSlots:
+    """At most `n` batch requests at once across every process sharing a directory"""
+
+    def __init__(self, n, directory=None):
+        self.n = n
+        self._directory = directory
+        # Fallback when there is no shared directory: per-process counter
+        self._lock = threading.Lock()
+        self._local_used = 0
+
+    @property
+    def directory(self):
+        # Resolved on use: gunicorn.conf.py creates the shared directory
+        if self._directory is not None:
+            return self._directory
+        return os.environ.get('NEXORA_ADMISSION_DIR') or metrics_dir()
+
+    def acquire(self):
+        """A slot token, or None when all slots are taken"""
+        if self.n <= 0:
+            return True
+        directory = self.directory
+        if not directory:
+            with self._lock:
+                if self._local_used >= self.n:
+                    return None
+                self._local_used += 1
+                return True
+        for i in range(self.n):
+            fd = os.open(os.path.join(directory, f'bulk-slot-{i}.lock'), os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return fd
+            except BlockingIOError:
+                os.close(fd)
+        return None
+
+    def release(self, token):
+        if token is True:
+            if self.n > 0 and not self.directory:
+                with self._lock:
+                    self._local_used = max(0, self._local_used - 1)
+        elif token is not None:
+            # Closing the descriptor drops the lock
+            os.close(token)
+
+
+class AdmissionController:
+    """Admit or shed prediction requests; keeps admitted / shed counts"""
+
+    def __init__(self, max_inflight=MAX_INFLIGHT, max_inflight_bulk=MAX_INFLIGHT_BULK,
+                 max_bulk_workers=MAX_BULK_WORKERS, max_queue_ms=MAX_QUEUE_MS):
+        self.max_inflight = max_inflight
+        self.max_inflight_bulk = max_inflight_bulk
+        self.max_queue_ms = max_queue_ms
+        self.bulk_slots = BulkSlots(max_bulk_workers)
+        self._lock = threading.Lock()
+        self.in_flight = {SINGLE: 0, BULK: 0}
+        self.peak_in_flight = 0
+        self.admitted = {SINGLE: 0, BULK: 0}
+        # (priority, reason) -> count
+        self.shed = {}
+
+    def admit(self, priority, queued_ms=None):
+        """(ticket, None) when admitted - pass the ticket to release() - else (None, (status, reason))"""
+        if self.max_queue_ms > 0 and queued_ms is not None and queued_ms > self.max_queue_ms:
+            return None, self._reject(priority, 'queue_timeout', 503)
+        rejected = None
+        with self._lock:
+            total = self.in_flight[SINGLE] + self.in_flight[BULK]
+            if self.max_inflight > 0 and total >= self.max_inflight:
+                rejected = ('worker_full', 503 if priority == SINGLE else 429)
+            elif priority == BULK and self.max_inflight_bulk > 0 and self.in_flight[BULK] >= self.max_inflight_bulk:
+                rejected = ('worker_bulk_full', 429)
+            else:
+                self.in_flight[priority] += 1
+        if rejected:
+            return None, self._reject(priority, *rejected)
+        slot = None
+        if priority == BULK:
+            slot = self.bulk_slots.acquire()
+            if slot is None:
+                with self._lock:
+                    self.in_flight[priority] -= 1
+                return None, self._reject(priority, 'bulk_workers_full', 429)
+        with self._lock:
+            self.admitted[priority] += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight[SINGLE] + self.in_flight[BULK])
+        return (priority, slot), None
+
+    def _reject(self, priority, reason, status):
+        with self._lock:
+            self.shed[(priority, reason)] = self.shed.get((priority, reason), 0) + 1
+        return status, reason
+
+    def release(self, ticket):
+        priority, slot = ticket
+        if slot is not None:
+            self.bulk_slots.release(slot)
+        with self._lock:
+            self.in_flight[priority] = max(0, self.in_flight[priority] - 1)
+
+    def stats(self):
+        with self._lock:
+            total_shed = sum(self.shed.values())
+            total_admitted = sum(self.admitted.values())
+            return {
+                'max_inflight': self.max_inflight,
+                'max_inflight_bulk': self.max_inflight_bulk,
+                'max_bulk_workers': self.bulk_slots.n,
+                'max_batch_rows': MAX_BATCH_ROWS,
+                'max_queue_ms': self.max_queue_ms,
+                'in_flight': dict(self.in_flight),
+                'peak_in_flight': self.peak_in_flight,
+                'admitted': dict(self.admitted),
+                'shed': {f'{priority}:{reason}': n for (priority, reason), n in sorted(self.shed.items())},
+                'shed_rate': round(total_shed / (total_shed + total_admitted), 4) if total_shed + total_admitted else 0.0
+            }
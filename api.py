@@ -3,13 +3,32 @@ Flask API for Nexora Integration - 4 Fields
 salary, performanceRating, department, jobTitle
 """
 
-from flask import Flask, request, jsonify
+from contextlib import contextmanager
+from flask import Flask, Response, request, jsonify, stream_with_context, g, has_request_context
 from flask_cors import CORS
-import joblib
 import numpy as np
-import pandas as pd
 import json
+import io
 import logging
+import os
+import time
+
+from inference import (
+    load_model, build_engines, build_bundle_engines, compiled_wanted, batch_policy, score_frame, warm_up, risk_categories,
+    LOW_RISK_MAX, MEDIUM_RISK_MAX, WARMUP_ENABLED
+)
+from model_bundle import load_bundle
+from risk_index import file_sha256
+from coalescer import RequestCoalescer, COALESCE_WINDOW_MS
+from prediction_cache import PredictionCache, cache_key
+from metrics import process_memory_kb, StageTimings
+from metrics_export import registry as metrics_registry, error_cause, METRICS_ENABLED
+from request_capture import RequestCapture
+from job_store import JobStore, JobQueueFull
+from score_store import ScoreStore, input_fingerprint
+from prediction_history import PredictionHistory, parse_time, HISTORY_MAX_POINTS
+from employee_store import EmployeeStore, EMPLOYEES_DB_PATH
+from admission import AdmissionController, queue_ms, MAX_BATCH_ROWS, RETRY_AFTER_SECONDS, SINGLE, BULK
 
 app = Flask(__name__)
 CORS(app)
@@ -17,6 +36,55 @@ CORS(app)
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Start of model loading, for the startup time reported by /api/ready
+IMPORT_STARTED = time.monotonic()
+
+REQUIRED_FIELDS = ['salary', 'performanceRating', 'department', 'jobTitle']
+
+# Employees scored per chunk by the NDJSON streaming endpoint
+STREAM_CHUNK_SIZE = int(os.environ.get('NEXORA_STREAM_CHUNK_SIZE', '1000'))
+
+# Inference engine: 'sklearn' (model.predict_proba), 'native' (ArrayForest),
+# 'compiled' (generated code, see forest_codegen.py) or 'lookup'
+# (precomputed RiskLookupIndex, see risk_index.py)
+# Overridable per request with ?engine=<name>; ?engine=compiled needs
+# NEXORA_COMPILED=1 unless it is the default
+DEFAULT_ENGINE = os.environ.get('NEXORA_ENGINE', 'sklearn')
+
+# Per-stage request timing: Server-Timing response header plus in-process
+# histograms in /api/stats. About a microsecond per stage; NEXORA_TIMING=0 disables it
+TIMING_ENABLED = os.environ.get('NEXORA_TIMING', '1') != '0'
+stage_timings = StageTimings()
+# Stages are also the source of the inference time exported on /metrics
+COLLECT_STAGES = TIMING_ENABLED or METRICS_ENABLED
+
+# Sampled request log for replay.py (NEXORA_CAPTURE_SAMPLE, off by default)
+request_capture = RequestCapture()
+CAPTURE_ENDPOINTS = ('predict_attrition', 'predict_attrition_batch',
+                     'predict_attrition_stream', 'predict_attrition_bulk')
+
+# Append-only prediction history written in the background (NEXORA_HISTORY=1)
+prediction_history = PredictionHistory()
+
+# Admission control (see admission.py): overloaded workers shed load with a
+# fast 429/503 + Retry-After, and batches never take every worker away from
+# single predictions
+admission = AdmissionController()
+ADMISSION_PRIORITY = {
+    'predict_attrition': SINGLE,
+    'test_endpoint': SINGLE,
+    'predict_attrition_batch': BULK,
+    'predict_attrition_stream': BULK,
+    'predict_attrition_bulk': BULK,
+    'submit_job': BULK,
+    'load_employees': BULK,
+    'score_all_employees': BULK,
+}
+
+# Single-file memory-mapped model bundle (see model_bundle.py); serves the
+# native and lookup engines without unpickling the forest in every worker
+MODEL_BUNDLE_PATH = os.environ.get('NEXORA_MODEL_BUNDLE', '')
+
 # Root route for testing
 @app.route('/', methods=['GET'])
 def root():
@@ -27,9 +95,22 @@ def root():
         'version': '1.0',
         'endpoints': {
             '/api/health': 'Health check endpoint',
+            '/api/ready': 'Readiness probe (503 until the model is loaded and warmed up)',
             '/api/config': 'Get API configuration',
+            '/api/stats': 'Runtime inference statistics',
+            '/metrics': 'Prometheus metrics (all workers)',
             '/api/predict-attrition': 'Single employee prediction (POST)',
             '/api/predict-attrition-batch': 'Batch predictions (POST)',
+            '/api/predict-attrition-stream': 'Streaming NDJSON batch predictions (POST)',
+            '/api/predict-attrition-bulk': 'Columnar CSV/Parquet bulk scoring (POST)',
+            '/api/jobs': 'Asynchronous batch jobs: submit (POST), list (GET)',
+            '/api/jobs/<job_id>': 'Job progress (GET), cancel (DELETE)',
+            '/api/jobs/<job_id>/results': 'Finished job results as NDJSON (GET, ?after=<chunk>)',
+            '/api/employees': 'Employee profiles for scoring by ID: bulk load (POST), counts (GET)',
+            '/api/employees/<employee_id>': 'Stored profile (GET), remove (DELETE)',
+            '/api/employees/score': 'Score every stored employee in one call (POST, ?department=)',
+            '/api/history/employees/<employee_id>': 'Risk trajectory of one employee (GET, NEXORA_HISTORY=1)',
+            '/api/history/departments/<department>': 'Department risk time series (GET, NEXORA_HISTORY=1)',
             '/api/test': 'Test endpoint with sample data'
         }
     }), 200
@@ -43,6 +124,11 @@ def test_endpoint():
         performance_rating = request.args.get('performanceRating', None, type=int)
         department = request.args.get('department', None, type=str)
         job_title = request.args.get('jobTitle', None, type=str)
+        engine = request.args.get('engine', None, type=str)
+        
+        invalid_engine = engine_error(engine)
+        if invalid_engine:
+            return invalid_engine
         
         # Validate all fields are provided
         if None in [salary, performance_rating, department, job_title]:
@@ -57,7 +143,9 @@ def test_endpoint():
             salary=salary,
             performance_rating=performance_rating,
             department=department,
-            job_title=job_title
+            job_title=job_title,
+            engine=engine,
+            use_cache=cache_requested()
         )
         
         if 'error' in result:
@@ -93,26 +181,236 @@ def not_found(error):
 def internal_error(error):
     return jsonify({'error': 'Internal server error', 'details': str(error)}), 500
 
-# Load model and encoders
+# Load model and encoders (from the memory-mapped bundle when NEXORA_MODEL_BUNDLE is set)
 try:
-    model = joblib.load('nexora_attrition_model.pkl')
-    dept_encoder = joblib.load('department_encoder.pkl')
-    job_encoder = joblib.load('job_encoder.pkl')
-    
-    with open('model_config.json', 'r') as f:
-        config = json.load(f)
+    if MODEL_BUNDLE_PATH:
+        bundle = load_bundle(MODEL_BUNDLE_PATH)
+        model = bundle.forest
+        dept_encoder = bundle.dept_encoder
+        job_encoder = bundle.job_encoder
+        config = bundle.config
+        model_sha256 = bundle.model_sha256
+        logger.info(f"✅ Model bundle mapped: {MODEL_BUNDLE_PATH}")
+    else:
+        import joblib
+        bundle = None
+        # Hash of the pickle actually loaded: identifies the model in memory even
+        # after a retrain replaces the file on disk
+        model_sha256 = file_sha256('nexora_attrition_model.pkl')
+        model = load_model('nexora_attrition_model.pkl')
+        dept_encoder = joblib.load('department_encoder.pkl')
+        job_encoder = joblib.load('job_encoder.pkl')
+        
+        with open('model_config.json', 'r') as f:
+            config = json.load(f)
     
     logger.info("✅ Model loaded successfully")
     logger.info(f"✅ Accuracy: {config['accuracy']*100:.2f}%")
 except Exception as e:
     logger.error(f"❌ Error loading model: {str(e)}")
     model = None
+    model_sha256 = None
+
+
+engines = {}
+if model is not None:
+    compiled = compiled_wanted(DEFAULT_ENGINE)
+    engines = build_bundle_engines(bundle, compiled=compiled) if bundle else build_engines(model, compiled=compiled)
+    if DEFAULT_ENGINE not in engines:
+        fallback = 'sklearn' if 'sklearn' in engines else next(iter(engines))
+        logger.error(f"❌ Engine '{DEFAULT_ENGINE}' not available, falling back to {fallback}")
+        DEFAULT_ENGINE = fallback
+
+
+# Micro-batching of concurrent single predictions (NEXORA_COALESCE_WINDOW_MS > 0)
+coalescer = None
+if engines and COALESCE_WINDOW_MS > 0:
+    coalescer = RequestCoalescer(engines[DEFAULT_ENGINE])
+    logger.info(f"✅ Request coalescing enabled ({COALESCE_WINDOW_MS} ms window)")
+
+
+# LRU cache of risk scores shared by single and batch predictions (NEXORA_CACHE_SIZE)
+try:
+    prediction_cache = PredictionCache(artifact_paths=(MODEL_BUNDLE_PATH,)) if MODEL_BUNDLE_PATH else PredictionCache()
+except Exception as e:
+    logger.error(f"❌ Error initializing prediction cache: {str(e)}")
+    prediction_cache = PredictionCache(capacity=0, artifact_paths=())
+
+
+# Warm-up: synthetic predictions over every department, job title, rating and
+# a spread of salaries through every engine (NEXORA_WARMUP=0 to skip). Only
+# then do /api/ready and /api/health report ready, so start.py or a load
+# balancer never routes traffic to a cold worker
+ready = False
+warmup_stats = {'enabled': WARMUP_ENABLED}
+if engines:
+    try:
+        if WARMUP_ENABLED:
+            warmup_stats = warm_up(engines, len(dept_encoder.classes_), len(job_encoder.classes_))
+            logger.info(f"✅ Warm-up done in {warmup_stats['total_ms']:.0f} ms "
+                        f"({warmup_stats['batch_rows']} batch + {warmup_stats['single_rows']} single rows per engine)")
+        ready = True
+    except Exception as e:
+        logger.error(f"❌ Warm-up failed: {str(e)}")
+startup_seconds = time.monotonic() - IMPORT_STARTED
+logger.info(f"{'✅' if ready else '❌'} Ready: {ready} (startup {startup_seconds:.2f}s)")
+
+# Latency of the first prediction request served by this process
+first_request = {}
+
+
+@contextmanager
+def timed(stage):
+    """Time a block of the current request as a Server-Timing stage"""
+    if not COLLECT_STAGES or not has_request_context():
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        g.setdefault('stages', []).append((stage, (time.perf_counter() - started) * 1000))
+
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+    priority = ADMISSION_PRIORITY.get(request.endpoint)
+    if priority:
+        ticket, rejection = admission.admit(priority, queue_ms(request.headers.get('X-Request-Start')))
+        if METRICS_ENABLED:
+            metrics_registry.inc('nexora_admission_total', (priority, rejection[1] if rejection else 'admitted'))
+        if rejection:
+            status, reason = rejection
+            response = jsonify({'success': False, 'error': 'Server busy, retry later', 'reason': reason})
+            response.headers['Retry-After'] = str(RETRY_AFTER_SECONDS)
+            return response, status
+        g.admission_ticket = ticket
+    if request_capture.enabled and request.endpoint in CAPTURE_ENDPOINTS \
+            and request_capture.should_sample(request.content_length):
+        body = request.get_data(cache=True)
+        # get_data drains the stream the streaming and bulk endpoints read from
+        request.stream = io.BytesIO(body)
+        request_capture.submit(request.method, request.path, request.query_string.decode('latin-1'),
+                               request.content_type, body)
+
+
+@app.after_request
+def record_request_timing(response):
+    if 'request_started' not in g:
+        return response
+    total_ms = (time.perf_counter() - g.request_started) * 1000
+    
+    if not first_request and request.path.startswith('/api/predict'):
+        first_request.update({
+            'endpoint': request.path,
+            'latency_ms': round(total_ms, 3),
+            'seconds_after_startup': round(time.monotonic() - IMPORT_STARTED - startup_seconds, 3),
+            'pid': os.getpid()
+        })
+    
+    if not request.endpoint:
+        return response
+    
+    # Stages that ran more than once (e.g. validation) are summed
+    stages = {}
+    for stage, ms in g.get('stages', ()):
+        stages[stage] = stages.get(stage, 0.0) + ms
+    stages['total'] = total_ms
+    
+    if TIMING_ENABLED:
+        for stage, ms in stages.items():
+            stage_timings.observe(request.endpoint, stage, ms)
+        response.headers['Server-Timing'] = ', '.join(f'{stage};dur={ms:.3f}' for stage, ms in stages.items())
+    
+    if METRICS_ENABLED:
+        endpoint = request.endpoint
+        metrics_registry.inc('nexora_http_requests_total', (endpoint, request.method, str(response.status_code)))
+        metrics_registry.observe('nexora_http_request_duration_seconds', (endpoint,), total_ms / 1000)
+        inference_ms = stages.get('inference', stages.get('score'))
+        if inference_ms is not None:
+            engine = request.args.get('engine') or DEFAULT_ENGINE
+            metrics_registry.observe('nexora_inference_duration_seconds', (endpoint, engine), inference_ms / 1000)
+        if 'batch_size' in g:
+            metrics_registry.observe('nexora_batch_size_rows', (endpoint,), g.batch_size)
+    return response
+
+
+@app.teardown_request
+def release_admission(exc=None):
+    # Runs after streamed responses finish too
+    ticket = g.pop('admission_ticket', None)
+    if ticket is not None:
+        admission.release(ticket)
+
+
+def too_many_rows(n_rows):
+    """413 response for batches above NEXORA_MAX_BATCH_ROWS, else None"""
+    if MAX_BATCH_ROWS > 0 and n_rows > MAX_BATCH_ROWS:
+        return jsonify({
+            'success': False,
+            'error': f'Too many employees: {n_rows} (max {MAX_BATCH_ROWS} per request); use /api/jobs for larger batches'
+        }), 413
+    return None
+
+
+def count_errors(messages):
+    """Count rejected employees by cause for /metrics"""
+    if METRICS_ENABLED:
+        for message in messages:
+            metrics_registry.inc('nexora_prediction_errors_total', (error_cause(message),))
+
+
+def get_engine(name=None):
+    """Scoring function (feature matrix -> risk probabilities) for an engine"""
+    name = name or DEFAULT_ENGINE
+    if name not in engines:
+        raise ValueError(f"Unknown engine '{name}'. Available: {list(engines)}")
+    return engines[name]
+
+
+def engine_error(name):
+    """400 response for an unknown ?engine= value, or None if it is valid"""
+    if name is not None and name not in engines:
+        return jsonify({
+            'success': False,
+            'error': f"Unknown engine '{name}'. Available: {list(engines)}"
+        }), 400
+    return None
+
+
+def cache_requested():
+    """False when the request opts out of the prediction cache (?cache=0)"""
+    return request.args.get('cache', '1').lower() not in ('0', 'false', 'no', 'off')
+
+
+def incremental_requested():
+    """True when a batch asks to reuse stored scores of unchanged employees (?incremental=1)"""
+    return request.args.get('incremental', '0').lower() in ('1', 'true', 'yes', 'on')
+
+
+# Last score per employee for incremental batches (see score_store.py)
+_score_store = None
+
+
+def get_score_store():
+    """Score database, opened on first incremental batch"""
+    global _score_store
+    if _score_store is None:
+        _score_store = ScoreStore()
+    return _score_store
 
 
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """Health check"""
     try:
+        if not ready:
+            return jsonify({
+                'status': 'unavailable',
+                'message': 'Model not loaded or warm-up failed',
+                'model_loaded': model is not None
+            }), 503
         return jsonify({
             'status': 'ok',
             'message': 'Attrition API is working',
@@ -125,6 +423,49 @@ def health_check():
         return jsonify({'status': 'error', 'message': str(e)}), 500
 
 
+@app.route('/api/ready', methods=['GET'])
+def readiness_check():
+    """Readiness probe: 200 once the model is loaded and warmed up, else 503"""
+    return jsonify({
+        'ready': ready,
+        'model_loaded': model is not None,
+        'engine': DEFAULT_ENGINE,
+        'startup_seconds': round(startup_seconds, 3),
+        'warmup_ms': warmup_stats.get('total_ms'),
+        'pid': os.getpid()
+    }), 200 if ready else 503
+
+
+@app.route('/metrics', methods=['GET'])
+def prometheus_metrics():
+    """Prometheus text-format metrics, merged across all gunicorn workers"""
+    if not METRICS_ENABLED:
+        return jsonify({'error': 'Metrics disabled (NEXORA_METRICS=0)'}), 404
+    return Response(metrics_registry.render(), mimetype='text/plain; version=0.0.4')
+
+
+@app.route('/api/stats', methods=['GET'])
+def get_stats():
+    """Runtime inference statistics"""
+    return jsonify({
+        'engine': DEFAULT_ENGINE,
+        'coalescer': coalescer.stats() if coalescer else {'enabled': False},
+        'cache': prediction_cache.stats(),
+        'process': {'pid': os.getpid(), **process_memory_kb()},
+        'timing': {'enabled': TIMING_ENABLED, 'stages_ms': stage_timings.snapshot()},
+        'capture': request_capture.stats(),
+        'jobs': _job_store.stats() if _job_store else None,
+        'admission': admission.stats(),
+        'scores': _score_store.stats() if _score_store else None,
+        'history': prediction_history.stats(),
+        'startup': {
+            'startup_seconds': round(startup_seconds, 3),
+            'warmup': warmup_stats,
+            'first_request': first_request or None
+        }
+    }), 200
+
+
 @app.route('/api/config', methods=['GET'])
 def get_config():
     """Get configuration"""
@@ -137,72 +478,288 @@ def get_config():
         'required_fields': ['salary', 'performanceRating', 'department', 'jobTitle'],
         'supported_departments': list(dept_encoder.classes_),
         'supported_job_titles': list(job_encoder.classes_),
-        'performance_scale': '1-4'
+        'performance_scale': '1-4',
+        'inference_engine': DEFAULT_ENGINE,
+        'available_engines': list(engines),
+        'inference_policy': batch_policy.describe()
     }), 200
 
 
-def predict_single(salary, performance_rating, department, job_title):
+def categorize_risk(risk_proba):
+    """Map a risk probability to its category"""
+    if risk_proba < LOW_RISK_MAX:
+        return "Low-risk"
+    elif risk_proba < MEDIUM_RISK_MAX:
+        return "Medium-risk"
+    return "High-risk"
+
+
+def build_prediction(risk_proba, salary, performance_rating, department, job_title):
+    """Build the prediction payload for one employee"""
+    # Generate factors (no hardcoded thresholds - just based on input)
+    factors = []
+    factors.append(f"💰 Salary: Rs {salary:,}")
+    factors.append(f"⭐ Performance Rating: {performance_rating}/4")
+    factors.append(f"🏢 Department: {department}")
+    factors.append(f"👔 Job Title: {job_title}")
+    
+    return {
+        'risk_score': round(risk_proba, 3),
+        'risk_percentage': round(risk_proba * 100, 1),
+        'risk_category': categorize_risk(risk_proba),
+        'factors': factors,
+        'prediction_details': {
+            'salary': salary,
+            'performance_rating': performance_rating,
+            'department': department,
+            'job_title': job_title
+        }
+    }
+
+
+def predict_single(salary, performance_rating, department, job_title, engine=None, use_cache=True):
     """Predict attrition for single employee"""
     try:
+        score = get_engine(engine)
+        engine = engine or DEFAULT_ENGINE
+        
         # No hardcoded mappings - use encoder classes directly
         # If user provides invalid department/job_title, raise error
         
-        # Validate department
-        if department not in dept_encoder.classes_:
-            return {
-                'error': f'Invalid department. Supported: {list(dept_encoder.classes_)}'
-            }
-        
-        # Validate job title
-        if job_title not in job_encoder.classes_:
-            return {
-                'error': f'Invalid job title. Supported: {list(job_encoder.classes_)}'
-            }
-        
-        # Encode
-        dept_enc = dept_encoder.transform([department])[0]
-        job_enc = job_encoder.transform([job_title])[0]
-        
-        # Create feature vector (4 fields)
-        X = pd.DataFrame([[salary, performance_rating, dept_enc, job_enc]],
-                        columns=['salary', 'performanceRating', 'department_encoded', 'jobTitle_encoded'])
-        
-        # Predict
-        risk_proba = model.predict_proba(X)[0][1]
-        
-        # Categorize
-        if risk_proba < 0.33:
-            risk_category = "Low-risk"
-        elif risk_proba < 0.66:
-            risk_category = "Medium-risk"
-        else:
-            risk_category = "High-risk"
+        with timed('validate'):
+            # Validate department
+            if department not in dept_encoder.classes_:
+                return {
+                    'error': f'Invalid department. Supported: {list(dept_encoder.classes_)}'
+                }
+            
+            # Validate job title
+            if job_title not in job_encoder.classes_:
+                return {
+                    'error': f'Invalid job title. Supported: {list(job_encoder.classes_)}'
+                }
         
-        # Generate factors (no hardcoded thresholds - just based on input)
-        factors = []
-        factors.append(f"💰 Salary: Rs {salary:,}")
-        factors.append(f"⭐ Performance Rating: {performance_rating}/4")
-        factors.append(f"🏢 Department: {department}")
-        factors.append(f"👔 Job Title: {job_title}")
+        with timed('cache'):
+            key = cache_key(salary, performance_rating, department, job_title, engine) if use_cache else None
+            risk_proba = prediction_cache.get(key) if key else None
+        if risk_proba is None:
+            with timed('encode'):
+                dept_enc = dept_encoder.transform([department])[0]
+                job_enc = job_encoder.transform([job_title])[0]
+                
+                # Create feature vector (4 fields)
+                X = np.array([[salary, performance_rating, dept_enc, job_enc]], dtype=float)
+            
+            with timed('inference'):
+                # Predict (coalesced with concurrent requests when enabled)
+                if coalescer is not None and engine == DEFAULT_ENGINE:
+                    risk_proba = coalescer.submit(X[0])
+                else:
+                    risk_proba = score(X)[0]
+            if key:
+                prediction_cache.put(key, risk_proba)
         
-        return {
-            'risk_score': round(risk_proba, 3),
-            'risk_percentage': round(risk_proba * 100, 1),
-            'risk_category': risk_category,
-            'factors': factors,
-            'prediction_details': {
-                'salary': salary,
-                'performance_rating': performance_rating,
-                'department': department,
-                'job_title': job_title
-            }
-        }
+        with timed('factors'):
+            return build_prediction(risk_proba, salary, performance_rating, department, job_title)
     
     except Exception as e:
         logger.error(f"Prediction error: {str(e)}")
         return {'error': str(e)}
 
 
+def _is_known(value, classes):
+    """Membership check that treats unhashable/odd inputs as unknown"""
+    try:
+        return value in classes
+    except TypeError:
+        return False
+
+
+def predict_batch(employees, engine=None, use_cache=True, rescore=None):
+    """Predict attrition for many employees with one vectorized model call.
+    
+    Returns (predictions, errors) in the same shape and order that calling
+    predict_single row by row would produce. Passing a dict as `rescore`
+    turns on incremental mode: employees whose inputs and model version match
+    the score store reuse their stored score, and the dict receives the
+    'rescored' and 'reused' counts.
+    """
+    score = get_engine(engine)
+    engine = engine or DEFAULT_ENGINE
+    departments = set(dept_encoder.classes_)
+    job_titles = set(job_encoder.classes_)
+    
+    # Validate the whole payload up front; remember the row order of failures
+    with timed('validate'):
+        row_errors = {}
+        valid_rows = []
+        for i, emp in enumerate(employees):
+            if isinstance(emp, dict) and '_invalid' in emp:
+                # Rejected before scoring (e.g. unknown employee_id, see join_profiles)
+                row_errors[i] = emp['_invalid']
+                continue
+            if not isinstance(emp, dict) or not all(k in emp for k in REQUIRED_FIELDS):
+                row_errors[i] = 'Missing fields'
+                continue
+            if not _is_known(emp['department'], departments):
+                row_errors[i] = f'Invalid department. Supported: {list(dept_encoder.classes_)}'
+                continue
+            if not _is_known(emp['jobTitle'], job_titles):
+                row_errors[i] = f'Invalid job title. Supported: {list(job_encoder.classes_)}'
+                continue
+            try:
+                float(emp['salary'])
+                float(emp['performanceRating'])
+            except (TypeError, ValueError) as e:
+                row_errors[i] = str(e)
+                continue
+            valid_rows.append(i)
+    
+    risk_by_row = {}
+    
+    # Incremental mode: skip employees that did not change since their last score
+    fingerprints = {}
+    if rescore is not None:
+        with timed('reuse'):
+            store = get_score_store()
+            model_version = f'{model_sha256[:16]}:{engine}'
+            for i in valid_rows:
+                emp = employees[i]
+                if emp.get('employee_id') is not None:
+                    fingerprints[i] = (str(emp['employee_id']), input_fingerprint(
+                        emp['salary'], emp['performanceRating'], emp['department'], emp['jobTitle']))
+            stored = store.lookup(employee_id for employee_id, _ in fingerprints.values())
+            for i, (employee_id, fingerprint) in fingerprints.items():
+                previous = stored.get(employee_id)
+                if previous and previous[:2] == (fingerprint, model_version):
+                    risk_by_row[i] = previous[2]
+            reused = set(risk_by_row)
+            rescore['reused'] = len(reused)
+            rescore['rescored'] = len(valid_rows) - len(reused)
+            valid_rows = [i for i in valid_rows if i not in reused]
+    
+    # Serve repeated inputs from the cache, score only the misses
+    with timed('cache'):
+        keys = {}
+        if use_cache and prediction_cache.enabled:
+            for i in valid_rows:
+                emp = employees[i]
+                keys[i] = cache_key(emp['salary'], emp['performanceRating'], emp['department'], emp['jobTitle'], engine)
+                risk = prediction_cache.get(keys[i])
+                if risk is not None:
+                    risk_by_row[i] = risk
+            valid_rows = [i for i in valid_rows if i not in risk_by_row]
+    
+    if valid_rows:
+        with timed('encode'):
+            rows = [employees[i] for i in valid_rows]
+            # Encode every department and job title in a single pass
+            dept_enc = dept_encoder.transform([emp['department'] for emp in rows])
+            job_enc = job_encoder.transform([emp['jobTitle'] for emp in rows])
+            
+            X = np.column_stack([
+                np.array([emp['salary'] for emp in rows], dtype=float),
+                np.array([emp['performanceRating'] for emp in rows], dtype=float),
+                dept_enc,
+                job_enc
+            ])
+        
+        with timed('inference'):
+            scored = dict(zip(valid_rows, batch_policy.run(score, X)))
+        for i, risk in scored.items():
+            if i in keys:
+                prediction_cache.put(keys[i], risk)
+        risk_by_row.update(scored)
+    
+    if fingerprints:
+        with timed('store'):
+            store.save([(*fingerprints[i], model_version, risk_by_row[i]) for i in fingerprints if i not in reused])
+            store.record(rescore['reused'], rescore['rescored'])
+    
+    with timed('factors'):
+        predictions = []
+        errors = []
+        history_rows = []
+        source = request.endpoint if has_request_context() else None
+        for i, emp in enumerate(employees):
+            employee_id = emp.get('employee_id', 'Unknown') if isinstance(emp, dict) else 'Unknown'
+            if i in row_errors:
+                errors.append({'employee_id': employee_id, 'error': row_errors[i]})
+                continue
+            try:
+                result = build_prediction(
+                    risk_by_row[i],
+                    emp['salary'],
+                    emp['performanceRating'],
+                    emp['department'],
+                    emp['jobTitle']
+                )
+            except Exception as e:
+                logger.error(f"Prediction error: {str(e)}")
+                errors.append({'employee_id': employee_id, 'error': str(e)})
+                continue
+            
+            result['employee_id'] = emp.get('employee_id', 'N/A')
+            result['employee_name'] = emp.get('employee_name', 'N/A')
+            predictions.append(result)
+            if prediction_history.enabled:
+                history_rows.append(history_row(emp, result, engine, source))
+    
+    prediction_history.record(history_rows)
+    return predictions, errors
+
+
+def history_row(emp, result, engine, source):
+    """Prediction history tuple for one employee (see prediction_history.py)"""
+    employee_id = emp.get('employee_id')
+    return (None if employee_id is None else str(employee_id), emp['department'], emp['jobTitle'],
+            float(emp['salary']), float(emp['performanceRating']),
+            float(result['risk_score']), result['risk_category'], engine, source)
+
+
+class RiskSummary:
+    """Running high/medium/low counts and average score of a batch.
+    
+    Holds only counters and the first 10 high-risk employees, so it can
+    summarize a stream of any length in constant memory.
+    """
+    
+    def __init__(self):
+        self.total = 0
+        self.counts = {'High-risk': 0, 'Medium-risk': 0, 'Low-risk': 0}
+        self.high_employees = []
+        self.score_sum = 0
+    
+    def add(self, predictions):
+        for p in predictions:
+            self.total += 1
+            self.counts[p['risk_category']] += 1
+            self.score_sum += p['risk_score']
+            if p['risk_category'] == 'High-risk' and len(self.high_employees) < 10:
+                self.high_employees.append({'id': p['employee_id'], 'name': p['employee_name'], 'risk': p['risk_percentage']})
+    
+    def _percentage(self, count):
+        return round((count / self.total * 100) if self.total > 0 else 0, 1)
+    
+    def to_dict(self):
+        return {
+            'high_risk': {
+                'count': self.counts['High-risk'],
+                'percentage': self._percentage(self.counts['High-risk']),
+                'employees': self.high_employees
+            },
+            'medium_risk': {
+                'count': self.counts['Medium-risk'],
+                'percentage': self._percentage(self.counts['Medium-risk'])
+            },
+            'low_risk': {
+                'count': self.counts['Low-risk'],
+                'percentage': self._percentage(self.counts['Low-risk'])
+            },
+            'average_risk_score': round(self.score_sum / self.total if self.total > 0 else 0, 3)
+        }
+
+
 @app.route('/api/predict-attrition', methods=['POST'])
 def predict_attrition():
     """Single employee prediction"""
@@ -210,32 +767,59 @@ def predict_attrition():
         if not model:
             return jsonify({'error': 'Model not loaded'}), 500
         
-        data = request.get_json()
+        with timed('parse'):
+            data = request.get_json()
+            engine = request.args.get('engine')
         
-        # Validate
-        required = ['salary', 'performanceRating', 'department', 'jobTitle']
-        missing = [f for f in required if f not in data]
-        if missing:
-            return jsonify({
-                'success': False,
-                'error': f'Missing fields: {", ".join(missing)}'
-            }), 400
+        with timed('validate'):
+            invalid_engine = engine_error(engine)
+            if invalid_engine:
+                return invalid_engine
+            
+            if not isinstance(data, dict):
+                count_errors(['Missing fields'])
+                return jsonify({
+                    'success': False,
+                    'error': f'Missing fields: {", ".join(REQUIRED_FIELDS)}'
+                }), 400
+            
+            if data.get('employee_id') is not None and any(f not in data for f in REQUIRED_FIELDS):
+                # Scoring by ID: features come from the employee store
+                joined, unknown = join_profiles([data])
+                if unknown:
+                    count_errors(['Unknown employee_id'])
+                    return jsonify({'success': False, 'error': f"Unknown employee_id: {data['employee_id']}"}), 404
+                data = joined[0]
+            
+            missing = [f for f in REQUIRED_FIELDS if f not in data]
+            if missing:
+                count_errors(['Missing fields'])
+                return jsonify({
+                    'success': False,
+                    'error': f'Missing fields: {", ".join(missing)}'
+                }), 400
         
         # Predict
         result = predict_single(
             data['salary'],
             data['performanceRating'],
             data['department'],
-            data['jobTitle']
+            data['jobTitle'],
+            engine=engine,
+            use_cache=cache_requested()
         )
         
         if 'error' in result:
+            count_errors([result['error']])
             return jsonify({'success': False, **result}), 400
         
         result['employee_id'] = data.get('employee_id', 'N/A')
         result['employee_name'] = data.get('employee_name', 'N/A')
+        if prediction_history.enabled:
+            prediction_history.record([history_row(data, result, engine or DEFAULT_ENGINE, request.endpoint)])
         
-        return jsonify({'success': True, 'prediction': result}), 200
+        with timed('serialize'):
+            return jsonify({'success': True, 'prediction': result}), 200
     
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -248,69 +832,556 @@ def predict_attrition_batch():
         if not model:
             return jsonify({'error': 'Model not loaded'}), 500
         
-        data = request.get_json()
+        with timed('parse'):
+            data = request.get_json()
+            engine = request.args.get('engine')
+        
+        invalid_engine = engine_error(engine)
+        if invalid_engine:
+            return invalid_engine
+        
+        if not isinstance(data, dict):
+            return jsonify({'success': False, 'error': 'Expected employees array'}), 400
+        
+        if 'employees' not in data and isinstance(data.get('employee_ids'), list):
+            data['employees'] = [{'employee_id': employee_id} for employee_id in data['employee_ids']]
         
         if 'employees' not in data:
             return jsonify({'success': False, 'error': 'Expected employees array'}), 400
         
-        predictions = []
-        errors = []
+        oversized = too_many_rows(len(data['employees']))
+        if oversized:
+            return oversized
+        
+        with timed('join'):
+            employees, _ = join_profiles(data['employees'])
+        
+        g.batch_size = len(data['employees'])
+        rescore = {} if incremental_requested() else None
+        predictions, errors = predict_batch(employees, engine=engine, use_cache=cache_requested(),
+                                            rescore=rescore)
+        count_errors(e['error'] for e in errors)
+        
+        with timed('summary'):
+            summary = RiskSummary()
+            summary.add(predictions)
         
-        for emp in data['employees']:
-            required = ['salary', 'performanceRating', 'department', 'jobTitle']
-            if not all(k in emp for k in required):
-                errors.append({'employee_id': emp.get('employee_id', 'Unknown'), 'error': 'Missing fields'})
+        with timed('serialize'):
+            body = {
+                'success': True,
+                'total_employees': summary.total,
+                'predictions': predictions,
+                'summary': summary.to_dict(),
+                'errors': errors if errors else None
+            }
+            if rescore is not None:
+                body['incremental'] = rescore
+            return jsonify(body), 200
+    
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@app.route('/api/predict-attrition-stream', methods=['POST'])
+def predict_attrition_stream():
+    """Streaming batch prediction: NDJSON employees in, NDJSON results out
+    
+    Employees are read line by line and scored in chunks of STREAM_CHUNK_SIZE,
+    so memory stays constant however many are sent. Each output line is a
+    prediction, an error or, last, the batch summary.
+    """
+    if not model:
+        return jsonify({'error': 'Model not loaded'}), 500
+    
+    engine = request.args.get('engine')
+    invalid_engine = engine_error(engine)
+    if invalid_engine:
+        return invalid_engine
+    use_cache = cache_requested()
+    
+    def read_employees():
+        for line_no, line in enumerate(request.stream, 1):
+            line = line.strip()
+            if not line:
                 continue
-            
-            result = predict_single(
-                emp['salary'],
-                emp['performanceRating'],
-                emp['department'],
-                emp['jobTitle']
-            )
-            
-            if 'error' in result:
-                errors.append({'employee_id': emp.get('employee_id', 'Unknown'), 'error': result['error']})
+            try:
+                emp = json.loads(line)
+            except ValueError:
+                yield {'employee_id': f'line {line_no}', '_invalid': 'Invalid JSON'}
                 continue
+            if not isinstance(emp, dict):
+                # 5, null, [..]: one error record, the stream goes on
+                emp = {'employee_id': f'line {line_no}', '_invalid': 'Expected a JSON object'}
+            yield emp
+    
+    def score_chunk(chunk, summary):
+        """NDJSON lines and error count for one chunk of employees"""
+        invalid = [emp for emp in chunk if '_invalid' in emp]
+        chunk = [emp for emp in chunk if '_invalid' not in emp]
+        predictions, errors = predict_batch(chunk, engine=engine, use_cache=use_cache)
+        summary.add(predictions)
+        if METRICS_ENABLED:
+            metrics_registry.observe('nexora_batch_size_rows', ('predict_attrition_stream',), len(chunk) + len(invalid))
+        count_errors([emp['_invalid'] for emp in invalid] + [e['error'] for e in errors])
+        
+        lines = [json.dumps({'type': 'error', 'employee_id': emp['employee_id'], 'error': emp['_invalid']}) for emp in invalid]
+        lines += [json.dumps({'type': 'prediction', **p}) for p in predictions]
+        lines += [json.dumps({'type': 'error', **e}) for e in errors]
+        return '\n'.join(lines) + '\n', len(invalid) + len(errors)
+    
+    def generate():
+        summary = RiskSummary()
+        n_errors = 0
+        chunk = []
+        try:
+            for emp in read_employees():
+                chunk.append(emp)
+                if len(chunk) >= STREAM_CHUNK_SIZE:
+                    body, chunk_errors = score_chunk(chunk, summary)
+                    n_errors += chunk_errors
+                    yield body
+                    chunk = []
+            if chunk:
+                body, chunk_errors = score_chunk(chunk, summary)
+                n_errors += chunk_errors
+                yield body
+        except Exception as e:
+            logger.error(f"Stream prediction error: {str(e)}")
+            yield json.dumps({'type': 'error', 'employee_id': 'Unknown', 'error': str(e)}) + '\n'
+            n_errors += 1
+        
+        yield json.dumps({
+            'type': 'summary',
+            'success': True,
+            'total_employees': summary.total,
+            'total_errors': n_errors,
+            'summary': summary.to_dict()
+        }) + '\n'
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+
+PARQUET_MIMETYPES = ('application/vnd.apache.parquet', 'application/x-parquet')
+BULK_ID_COLUMNS = {'employee_id': str, 'employee_name': str}
+
+
+def _bulk_format(value):
+    value = (value or '').lower()
+    if value in ('parquet',) or value in PARQUET_MIMETYPES:
+        return 'parquet'
+    if value in ('json',):
+        return 'json'
+    return 'csv'
+
+
+@app.route('/api/predict-attrition-bulk', methods=['POST'])
+def predict_attrition_bulk():
+    """Columnar bulk scoring: CSV or Parquet in, same format (or compact JSON) out
+    
+    Input format comes from ?format= or the Content-Type; output defaults to
+    the input format and can be changed with ?output=csv|parquet|json.
+    """
+    try:
+        if not model:
+            return jsonify({'error': 'Model not loaded'}), 500
+        
+        engine = request.args.get('engine')
+        invalid_engine = engine_error(engine)
+        if invalid_engine:
+            return invalid_engine
+        
+        input_format = _bulk_format(request.args.get('format') or request.mimetype)
+        output_format = _bulk_format(request.args.get('output') or input_format)
+        
+        import pandas as pd
+        with timed('parse'):
+            try:
+                if input_format == 'parquet':
+                    df = pd.read_parquet(io.BytesIO(request.get_data()))
+                else:
+                    df = pd.read_csv(request.stream, dtype=BULK_ID_COLUMNS)
+            except ImportError:
+                return jsonify({'success': False, 'error': 'Parquet support requires pyarrow'}), 415
+            except Exception as e:
+                return jsonify({'success': False, 'error': f'Could not read {input_format} body: {str(e)}'}), 400
+        
+        oversized = too_many_rows(len(df))
+        if oversized:
+            return oversized
+        
+        with timed('score'):
+            g.batch_size = len(df)
+            try:
+                result = score_frame(df, get_engine(engine), dept_encoder, job_encoder)
+            except ValueError as e:
+                return jsonify({'success': False, 'error': str(e)}), 400
+            count_errors(result['error'].dropna())
+        
+        with timed('serialize'):
+            if output_format == 'json':
+                # Parallel arrays, no per-employee dicts or factor strings
+                columns = {c: result[c].astype(object).where(result[c].notna(), None).tolist() for c in result.columns}
+                return jsonify({
+                    'success': True,
+                    'total_employees': int(result['error'].isna().sum()),
+                    'total_errors': int(result['error'].notna().sum()),
+                    'columns': columns
+                }), 200
             
-            result['employee_id'] = emp.get('employee_id', 'N/A')
-            result['employee_name'] = emp.get('employee_name', 'N/A')
-            predictions.append(result)
+            if output_format == 'parquet':
+                buffer = io.BytesIO()
+                try:
+                    result.to_parquet(buffer, index=False)
+                except ImportError:
+                    return jsonify({'success': False, 'error': 'Parquet support requires pyarrow'}), 415
+                return Response(buffer.getvalue(), mimetype=PARQUET_MIMETYPES[0])
+            
+            return Response(result.to_csv(index=False), mimetype='text/csv')
+    
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+# Asynchronous batch jobs, scored by job_worker.py processes (see job_store.py)
+_job_store = None
+
+
+def get_job_store():
+    """Job database, opened on first use so workers that never see a job do not create it"""
+    global _job_store
+    if _job_store is None:
+        _job_store = JobStore()
+    return _job_store
+
+
+def read_job_employees():
+    """Employees of a job submission: {"employees": [...]} JSON or NDJSON lines"""
+    if request.mimetype in ('application/x-ndjson', 'application/jsonl'):
+        employees = []
+        for line_no, line in enumerate(request.stream, 1):
+            line = line.strip()
+            if line:
+                try:
+                    employees.append(json.loads(line))
+                except ValueError:
+                    raise ValueError(f'Invalid JSON on line {line_no}')
+        return employees
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict) or not isinstance(data.get('employees'), list):
+        raise ValueError('Expected employees array')
+    return data['employees']
+
+
+@app.route('/api/jobs', methods=['POST'])
+def submit_job():
+    """Queue a batch for background scoring; returns a job id at once (202)"""
+    try:
+        engine = request.args.get('engine')
+        invalid_engine = engine_error(engine)
+        if invalid_engine:
+            return invalid_engine
         
-        # Summary
-        high = [p for p in predictions if p['risk_category'] == 'High-risk']
-        medium = [p for p in predictions if p['risk_category'] == 'Medium-risk']
-        low = [p for p in predictions if p['risk_category'] == 'Low-risk']
+        with timed('parse'):
+            try:
+                employees = read_job_employees()
+            except ValueError as e:
+                return jsonify({'success': False, 'error': str(e)}), 400
         
-        total = len(predictions)
+        g.batch_size = len(employees)
+        store = get_job_store()
+        try:
+            # Pin the engine validated here so workers never pick their own default
+            job_id = store.submit(employees, engine=engine or DEFAULT_ENGINE)
+        except JobQueueFull as e:
+            response = jsonify({'success': False, 'error': f'Job queue full: {str(e)}'})
+            response.headers['Retry-After'] = '30'
+            return response, 429
+        except ValueError as e:
+            status = 413 if str(e).startswith('Too many') else 400
+            return jsonify({'success': False, 'error': str(e)}), status
         
+        job = store.get(job_id)
         return jsonify({
             'success': True,
-            'total_employees': total,
-            'predictions': predictions,
-            'summary': {
-                'high_risk': {
-                    'count': len(high),
-                    'percentage': round((len(high) / total * 100) if total > 0 else 0, 1),
-                    'employees': [{'id': p['employee_id'], 'name': p['employee_name'], 'risk': p['risk_percentage']} for p in high[:10]]
-                },
-                'medium_risk': {
-                    'count': len(medium),
-                    'percentage': round((len(medium) / total * 100) if total > 0 else 0, 1)
-                },
-                'low_risk': {
-                    'count': len(low),
-                    'percentage': round((len(low) / total * 100) if total > 0 else 0, 1)
+            'job_id': job_id,
+            'status': job['status'],
+            'total_employees': job['total_rows'],
+            'chunks': job['n_chunks'],
+            'status_url': f'/api/jobs/{job_id}',
+            'results_url': f'/api/jobs/{job_id}/results'
+        }), 202
+    
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@app.route('/api/jobs', methods=['GET'])
+def list_jobs():
+    """Most recent jobs with their progress"""
+    limit = request.args.get('limit', 50, type=int)
+    return jsonify({'jobs': get_job_store().list(limit=limit), 'queue': get_job_store().stats()}), 200
+
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    """Progress of a job: status, rows done, errors, running summary and ETA"""
+    job = get_job_store().get(job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': 'Job not found'}), 404
+    return jsonify({'success': True, 'job': job}), 200
+
+
+@app.route('/api/jobs/<job_id>', methods=['DELETE'])
+def cancel_job(job_id):
+    """Cancel a queued or running job (chunks already scored are kept)"""
+    store = get_job_store()
+    if store.get(job_id) is None:
+        return jsonify({'success': False, 'error': 'Job not found'}), 404
+    if not store.cancel(job_id):
+        return jsonify({'success': False, 'error': 'Job already finished'}), 409
+    return jsonify({'success': True, 'job': store.get(job_id)}), 200
+
+
+@app.route('/api/jobs/<job_id>/results', methods=['GET'])
+def job_results(job_id):
+    """NDJSON results of the finished chunks from ?after=<chunk index>
+    
+    Returns the consecutive chunks that are done; X-Next-Chunk is the index
+    to pass as ?after= on the next poll and X-Job-Status the job status, so
+    results can be downloaded incrementally while the job runs.
+    """
+    store = get_job_store()
+    job = store.get(job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': 'Job not found'}), 404
+    after = max(0, request.args.get('after', 0, type=int))
+    max_chunks = min(max(1, request.args.get('max_chunks', 20, type=int)), 200)
+    
+    texts, next_chunk = store.results(job_id, after=after, max_chunks=max_chunks)
+    response = Response(''.join(texts), mimetype='application/x-ndjson')
+    response.headers['X-Next-Chunk'] = str(next_chunk)
+    response.headers['X-Job-Status'] = job['status']
+    response.headers['X-Chunks-Total'] = str(job['n_chunks'])
+    return response, 200
+
+
+# Employee profiles for scoring by ID (see employee_store.py)
+_employee_store = None
+
+
+def get_employee_store():
+    """Employee database, opened on first use with the current encoders' classes"""
+    global _employee_store
+    if _employee_store is None:
+        _employee_store = EmployeeStore(dept_encoder.classes_, job_encoder.classes_, path=EMPLOYEES_DB_PATH)
+    return _employee_store
+
+
+def existing_employee_store():
+    """Employee database if one exists, else None; read-only paths never create it"""
+    if _employee_store is None and not os.path.exists(EMPLOYEES_DB_PATH):
+        return None
+    return get_employee_store()
+
+
+def join_profiles(employees):
+    """Fill in stored features for employees sent by employee_id only.
+    
+    Fields sent in the request override stored ones. Returns (employees,
+    unknown): employees missing from the store are replaced in place by an
+    'Unknown employee_id' error row, which predict_batch reports at its input
+    position, and `unknown` lists their row indexes. Until profiles have
+    been loaded, employees pass through unchanged.
+    """
+    by_id = [i for i, emp in enumerate(employees)
+             if isinstance(emp, dict) and emp.get('employee_id') is not None
+             and any(f not in emp for f in REQUIRED_FIELDS)]
+    if not by_id:
+        return employees, []
+    store = existing_employee_store()
+    if store is None or not store.has_profiles():
+        return employees, []
+    profiles = store.profiles(employees[i]['employee_id'] for i in by_id)
+    joined = list(employees)
+    unknown = []
+    for i in by_id:
+        profile = profiles.get(str(employees[i]['employee_id']))
+        if profile is None:
+            unknown.append(i)
+            joined[i] = {'employee_id': employees[i]['employee_id'], '_invalid': 'Unknown employee_id'}
+        else:
+            joined[i] = {**profile, **employees[i]}
+    return joined, unknown
+
+
+@app.route('/api/employees', methods=['POST'])
+def load_employees():
+    """Bulk insert or replace employee profiles (JSON, NDJSON or CSV)"""
+    try:
+        if not model:
+            return jsonify({'error': 'Model not loaded'}), 500
+        
+        with timed('parse'):
+            try:
+                if request.mimetype == 'text/csv':
+                    import pandas as pd
+                    df = pd.read_csv(request.stream, dtype=BULK_ID_COLUMNS)
+                    employees = df.astype(object).where(df.notna(), None).to_dict('records')
+                else:
+                    employees = read_job_employees()
+            except Exception as e:
+                return jsonify({'success': False, 'error': str(e)}), 400
+        
+        g.batch_size = len(employees)
+        with timed('store'):
+            loaded, errors = get_employee_store().load(employees)
+        return jsonify({
+            'success': loaded > 0 or not errors,
+            'loaded': loaded,
+            'rejected': len(errors),
+            # First 100 rejected rows
+            'errors': errors[:100] if errors else None
+        }), 200 if loaded or not errors else 400
+    
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@app.route('/api/employees', methods=['GET'])
+def employee_counts():
+    """Stored employees, total and per department"""
+    store = existing_employee_store()
+    if store is None:
+        return jsonify({'success': True, 'path': EMPLOYEES_DB_PATH, 'employees': 0, 'by_department': {}}), 200
+    return jsonify({'success': True, **store.stats()}), 200
+
+
+@app.route('/api/employees/<employee_id>', methods=['GET'])
+def get_employee(employee_id):
+    store = existing_employee_store()
+    profile = store.profiles([employee_id]).get(employee_id) if store else None
+    if profile is None:
+        return jsonify({'success': False, 'error': f'Unknown employee_id: {employee_id}'}), 404
+    return jsonify({'success': True, 'employee': profile}), 200
+
+
+@app.route('/api/employees/<employee_id>', methods=['DELETE'])
+def delete_employee(employee_id):
+    store = existing_employee_store()
+    if store is None or not store.delete(employee_id):
+        return jsonify({'success': False, 'error': f'Unknown employee_id: {employee_id}'}), 404
+    return jsonify({'success': True, 'employee_id': employee_id}), 200
+
+
+@app.route('/api/employees/score', methods=['POST'])
+def score_all_employees():
+    """Score every stored employee (or one ?department=) in one vectorized pass
+    
+    Compact columnar JSON like the bulk endpoint, or CSV with ?output=csv.
+    """
+    try:
+        if not model:
+            return jsonify({'error': 'Model not loaded'}), 500
+        
+        engine = request.args.get('engine')
+        invalid_engine = engine_error(engine)
+        if invalid_engine:
+            return invalid_engine
+        
+        with timed('load'):
+            store = existing_employee_store()
+            if store is None:
+                ids, names, X, encodable = [], [], np.empty((0, 4)), np.empty(0, dtype=bool)
+            else:
+                ids, names, X, encodable = store.features(request.args.get('department'))
+        
+        g.batch_size = len(ids)
+        with timed('inference'):
+            risks = np.full(len(ids), np.nan)
+            if encodable.any():
+                risks[encodable] = batch_policy.run(get_engine(engine), X[encodable])
+        
+        with timed('serialize'):
+            categories = risk_categories(np.nan_to_num(risks))
+            columns = {
+                'employee_id': ids,
+                'employee_name': names,
+                'risk_score': [None if np.isnan(r) else r for r in np.round(risks, 3).tolist()],
+                'risk_percentage': [None if np.isnan(r) else r for r in np.round(risks * 100, 1).tolist()],
+                'risk_category': [c if ok else None for c, ok in zip(categories.tolist(), encodable.tolist())]
+            }
+            if request.args.get('output') == 'csv':
+                import pandas as pd
+                return Response(pd.DataFrame(columns).to_csv(index=False), mimetype='text/csv')
+            
+            scored = risks[encodable]
+            return jsonify({
+                'success': True,
+                'total_employees': int(encodable.sum()),
+                # Stored employees the current model's encoders do not know
+                'total_errors': int((~encodable).sum()),
+                'summary': {
+                    'high_risk': int((categories[encodable] == 'High-risk').sum()),
+                    'medium_risk': int((categories[encodable] == 'Medium-risk').sum()),
+                    'low_risk': int((categories[encodable] == 'Low-risk').sum()),
+                    'average_risk_score': round(float(scored.mean()), 3) if len(scored) else 0
                 },
-                'average_risk_score': round(sum([p['risk_score'] for p in predictions]) / total if total > 0 else 0, 3)
-            },
-            'errors': errors if errors else None
-        }), 200
+                'columns': columns
+            }), 200
     
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
+def history_disabled():
+    return jsonify({'success': False, 'error': 'Prediction history disabled (set NEXORA_HISTORY=1)'}), 404
+
+
+@app.route('/api/history/employees/<employee_id>', methods=['GET'])
+def employee_history(employee_id):
+    """Risk trajectory of one employee, oldest first (?since=&until=&limit=)"""
+    if not prediction_history.enabled:
+        return history_disabled()
+    try:
+        since = parse_time(request.args.get('since'))
+        until = parse_time(request.args.get('until'))
+        limit = request.args.get('limit', HISTORY_MAX_POINTS, type=int)
+        points, truncated = prediction_history.employee_trajectory(employee_id, since, until, limit)
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+    return jsonify({
+        'success': True,
+        'employee_id': employee_id,
+        'points': points,
+        # Only the newest `limit` points in range were returned
+        'truncated': truncated
+    }), 200
+
+
+@app.route('/api/history/departments/<department>', methods=['GET'])
+def department_history(department):
+    """Predictions, average risk and category counts per day, week or month (?since=&until=&interval=)"""
+    if not prediction_history.enabled:
+        return history_disabled()
+    try:
+        until = parse_time(request.args.get('until'), time.time())
+        since = parse_time(request.args.get('since'), until - 90 * 86400)
+        interval = request.args.get('interval', 'day')
+        series = prediction_history.department_series(department, since, until, interval)
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+    return jsonify({
+        'success': True,
+        'department': department,
+        'interval': interval,
+        'series': series
+    }), 200
+
+
 if __name__ == '__main__':
     print("""
     ╔════════════════════════════════════════════════════════════╗
@@ -2,15 +2,10 @@ import pandas as pd
 import numpy as np
 import pickle
 import streamlit as st
-import plotly.express as px
-import pydeck as pdk
-from faker import Faker
-import seaborn as sns
-import matplotlib.pyplot as plt
-from sklearn.metrics import confusion_matrix, classification_report, precision_recall_curve, recall_score, accuracy_score, average_precision_score
 import time
 import os
 import joblib
+from inference import apply_online_policy, batch_policy
 
 # Define paths relative to the script location
 MODEL_PATH = os.path.join(os.path.dirname(__file__), "nexora_attrition_model.pkl")
@@ -51,11 +46,11 @@ if "processed" not in st.session_state:
 def load_model():
     try:
         # Try using joblib first (more reliable for scikit-learn models)
-        return joblib.load(MODEL_PATH)
+        return apply_online_policy(joblib.load(MODEL_PATH))
     except:
         # Fallback to pickle if joblib fails
         with open(MODEL_PATH, "rb") as model_file:
-            return pickle.load(model_file)
+            return apply_online_policy(pickle.load(model_file))
 
 @st.cache_resource
 def load_dept_encoder():
@@ -90,7 +85,6 @@ try:
 except FileNotFoundError:
     st.error(f"❌ Job encoder not found: {JOB_ENCODER_PATH}")
     st.stop()
-fake = Faker()
 
 # --- Advanced UI Configuration ---
 def apply_custom_theme():
@@ -446,7 +440,7 @@ def process_and_store_data(data, have_true_labels):
         data_for_prediction = data[required_features]
 
         # Make predictions
-        predictions = model.predict_proba(data_for_prediction)[:, 1]
+        predictions = batch_policy.run(lambda X: model.predict_proba(X)[:, 1], data_for_prediction)
 
         # Categorize risk levels
         data['Risk Category'] = np.select(
@@ -493,6 +487,7 @@ def display_model_evaluation():
         with col1:
             st.markdown("### Key Metrics")
             if st.session_state.true_labels is not None:
+                from sklearn.metrics import recall_score, accuracy_score, average_precision_score
                 y_true = st.session_state.true_labels
                 y_pred = (st.session_state.predictions > 0.5).astype(int)
                 st.write("Accuracy:", round(accuracy_score(y_true, y_pred), 2))
@@ -504,6 +499,9 @@ def display_model_evaluation():
         with col2:
             if st.session_state.true_labels is not None:
                 st.markdown("### Confusion Matrix")
+                import matplotlib.pyplot as plt
+                import seaborn as sns
+                from sklearn.metrics import confusion_matrix
                 cm = confusion_matrix(y_true, y_pred)
                 fig, ax = plt.subplots()
                 sns.heatmap(cm, annot=True, fmt="d", cmap="Blues",
@@ -527,6 +525,7 @@ def display_risk_summary():
         col1, col2 = st.columns([3, 2])
         with col1:
             st.markdown("### Organizational Risk Distribution")
+            import plotly.express as px
             fig = px.sunburst(
                 data,
                 path=['Risk Category'],
@@ -579,6 +578,8 @@ def display_feature_importance():
 
         with col2:
             st.markdown("### Feature Importance Distribution")
+            import matplotlib.pyplot as plt
+            import seaborn as sns
             fig, ax = plt.subplots(figsize=(10, 6))
             sns.barplot(x=importances[indices][:10], y=features[:10], ax=ax)
             ax.set_title("Top 10 Most Important Features")
@@ -588,6 +589,7 @@ def display_work_model_analysis():
     st.markdown("## 🏢 Work Model - Remote VS Office")
     
     if st.session_state.uploaded_data is not None:
+        import plotly.express as px
         data = st.session_state.uploaded_data
         
         # Calculate commute time in minutes (assuming distance in kilometers and average speed in km/h)
@@ -0,0 +1,87 @@
+"""
+Benchmark: compiled forest module vs sklearn predict_proba
+Reports single-row and 10k-row latency and checks the outputs are identical.
+
+Usage: python bench_codegen.py --rows 10000 --repeat 200
+"""
+
+import argparse
+import json
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from inference import load_model, load_compiled, FEATURE_COLUMNS, MODEL_PATH
+from risk_index import file_sha256
+
+
+def feature_matrix(n, seed=42):
+    rng = np.random.default_rng(seed)
+    return np.column_stack([
+        rng.integers(1000, 20000, n) + rng.random(n),
+        rng.integers(1, 5, n),
+        rng.integers(0, 3, n),
+        rng.integers(0, 9, n)
+    ]).astype(float)
+
+
+def timed_ms(fn, X, repeat):
+    """Median wall time of fn(X) in milliseconds"""
+    fn(X)
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(X)
+        times.append((time.perf_counter() - started) * 1000)
+    return float(np.median(times))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compiled forest vs sklearn latency')
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=200, help='Single-row repetitions')
+    parser.add_argument('--output', help='Optional JSON file for the results')
+    args = parser.parse_args()
+
+    warnings.filterwarnings('ignore')
+    model = load_model()
+    # Generates nexora_forest_compiled.py if it is missing or stale
+    compiled = load_compiled(file_sha256(MODEL_PATH))
+    if compiled is None:
+        raise SystemExit("❌ Compiled engine unavailable")
+    engines = {
+        'sklearn': lambda X: model.predict_proba(pd.DataFrame(X, columns=FEATURE_COLUMNS))[:, 1],
+        'compiled': compiled.predict
+    }
+
+    X = feature_matrix(args.rows)
+    identical = bool(np.array_equal(engines['sklearn'](X), engines['compiled'](X)))
+    single_identical = all(
+        engines['sklearn'](X[i:i + 1])[0] == compiled.predict(X[i])[0] for i in range(min(args.rows, 500))
+    )
+
+    print("=" * 60)
+    print(f"{'Engine':<10} | {'1 row (ms)':>12} | {f'{args.rows:,} rows (ms)':>18}")
+    print("=" * 60)
+    results = {}
+    for name, fn in engines.items():
+        single = timed_ms(fn, X[:1], args.repeat)
+        batch = timed_ms(fn, X, max(3, args.repeat // 50))
+        results[name] = {'single_row_ms': single, 'batch_ms': batch}
+        print(f"{name:<10} | {single:>12.3f} | {batch:>18.1f}")
+
+    speedup = results['sklearn']['single_row_ms'] / results['compiled']['single_row_ms']
+    print(f"\nSingle-row speedup: {speedup:.1f}x")
+    print(f"{'✅' if identical else '❌'} Batch outputs identical: {identical}")
+    print(f"{'✅' if single_identical else '❌'} Single-row outputs identical: {single_identical}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'rows': args.rows, 'identical': identical and single_identical, 'results': results}, f, indent=2)
+        print(f"✅ Results saved: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,313 @@
+"""
+Open-loop load test of the Nexora API with a baseline regression check
+
+Starts the API under gunicorn (or targets a running one with --url) and
+sends requests at fixed arrival rates no matter how fast the server
+answers: a slow server builds a backlog instead of quietly lowering the
+offered load. Latency is measured from each request's scheduled send time,
+so time spent queued behind a stalled server is counted too.
+
+Traffic is a mix of single predictions, batches and invalid requests
+(--mix). For every rate and request kind it reports throughput and
+p50/p95/p99 latency; --output saves the results as JSON and --baseline
+compares them with an earlier run, exiting with status 1 on a regression.
+
+Usage: python bench_load.py --rates 10 25 50 --duration 20 --output load.json
+       python bench_load.py --rates 10 25 50 --duration 20 --baseline load.json
+"""
+
+import argparse
+import json
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import requests
+
+from start import probe
+
+KINDS = ('single', 'batch', 'invalid')
+EXPECTED_STATUS = {'single': 200, 'batch': 200, 'invalid': 400}
+ENDPOINTS = {
+    'single': '/api/predict-attrition',
+    'batch': '/api/predict-attrition-batch',
+    'invalid': '/api/predict-attrition'
+}
+SALARY_RANGE = (1000, 20000)
+READY_TIMEOUT = 180
+REQUEST_TIMEOUT = 30
+
+with open('model_config.json') as f:
+    _config = json.load(f)
+DEPARTMENTS = _config['departments']
+JOB_TITLES = _config['job_titles']
+
+
+def parse_mix(text):
+    """'single=0.7,batch=0.2,invalid=0.1' -> normalized {kind: share}"""
+    mix = {}
+    for part in text.split(','):
+        kind, _, share = part.partition('=')
+        kind = kind.strip()
+        if kind not in KINDS:
+            raise argparse.ArgumentTypeError(f"unknown request kind '{kind}', expected one of {KINDS}")
+        mix[kind] = float(share)
+    total = sum(mix.values())
+    if total <= 0:
+        raise argparse.ArgumentTypeError('mix shares must add up to more than 0')
+    return {kind: share / total for kind, share in mix.items()}
+
+
+def random_employee(rng):
+    return {
+        'salary': round(float(rng.uniform(*SALARY_RANGE)), 2),
+        'performanceRating': int(rng.integers(1, 5)),
+        'department': DEPARTMENTS[rng.integers(len(DEPARTMENTS))],
+        'jobTitle': JOB_TITLES[rng.integers(len(JOB_TITLES))]
+    }
+
+
+def make_payload(kind, rng, batch_size):
+    """JSON body for one request of the given kind"""
+    if kind == 'single':
+        return random_employee(rng)
+    if kind == 'batch':
+        return {'employees': [random_employee(rng) for _ in range(batch_size)]}
+    employee = random_employee(rng)
+    if rng.random() < 0.5:
+        del employee['jobTitle']
+    else:
+        employee['department'] = 'Unknown Department'
+    return employee
+
+
+def start_server(port, workers):
+    """Gunicorn serving api:app on 127.0.0.1:port, once it reports ready"""
+    log = open(os.path.join(tempfile.gettempdir(), f'bench_load_server_{port}.log'), 'w')
+    process = subprocess.Popen(
+        ['gunicorn', '--config', 'gunicorn.conf.py', '--bind', f'127.0.0.1:{port}',
+         '--workers', str(workers), 'api:app'],
+        stdout=log, stderr=subprocess.STDOUT, start_new_session=True
+    )
+    url = f'http://127.0.0.1:{port}'
+    started = time.monotonic()
+    while time.monotonic() - started < READY_TIMEOUT:
+        if process.poll() is not None:
+            raise RuntimeError(f"gunicorn exited with code {process.returncode}, see {log.name}")
+        if probe(f'{url}/api/ready')[0]:
+            print(f"✅ API ready in {time.monotonic() - started:.1f}s ({workers} workers, log: {log.name})")
+            return process, url
+        time.sleep(0.25)
+    stop_server(process)
+    raise RuntimeError(f"API not ready after {READY_TIMEOUT}s, see {log.name}")
+
+
+def stop_server(process):
+    process.terminate()
+    try:
+        process.wait(timeout=15)
+    except subprocess.TimeoutExpired:
+        pass
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except OSError:
+        pass
+
+
+def arrival_times(rate, duration, rng, poisson):
+    """Scheduled send offsets (s) for one run"""
+    if not poisson:
+        return np.arange(0, duration, 1.0 / rate)
+    gaps = rng.exponential(1.0 / rate, size=int(rate * duration * 1.5) + 16)
+    times = np.cumsum(gaps)
+    return times[times < duration]
+
+
+def run_rate(url, rate, args, rng):
+    """Offer `rate` requests/s for args.duration seconds; one record per request"""
+    kinds = list(args.mix)
+    offsets = arrival_times(rate, args.duration, rng, args.arrivals == 'poisson')
+    plan = [
+        (offset, kinds[i], make_payload(kinds[i], rng, args.batch_size))
+        for offset, i in zip(offsets, rng.choice(len(kinds), size=len(offsets), p=[args.mix[k] for k in kinds]))
+    ]
+    query = {}
+    if args.engine:
+        query['engine'] = args.engine
+    if not args.use_cache:
+        query['cache'] = '0'
+
+    local = threading.local()
+    records = []
+    records_lock = threading.Lock()
+
+    def send(scheduled, kind, payload):
+        session = getattr(local, 'session', None)
+        if session is None:
+            session = local.session = requests.Session()
+        sent = time.perf_counter()
+        try:
+            response = session.post(url + ENDPOINTS[kind], json=payload, params=query, timeout=REQUEST_TIMEOUT)
+            status = response.status_code
+        except requests.RequestException:
+            status = 0
+        done = time.perf_counter()
+        with records_lock:
+            records.append((kind, status, (done - scheduled) * 1000, (done - sent) * 1000, done))
+
+    max_lag = 0.0
+    with ThreadPoolExecutor(max_workers=args.senders) as pool:
+        start = time.perf_counter()
+        for offset, kind, payload in plan:
+            scheduled = start + offset
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                max_lag = max(max_lag, -delay)
+            pool.submit(send, scheduled, kind, payload)
+    return summarize(records, rate, start, max_lag)
+
+
+def latency_stats(values):
+    if not values:
+        return {'p50_ms': None, 'p95_ms': None, 'p99_ms': None, 'max_ms': None, 'mean_ms': None}
+    values = np.asarray(values)
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {'p50_ms': round(float(p50), 2), 'p95_ms': round(float(p95), 2), 'p99_ms': round(float(p99), 2),
+            'max_ms': round(float(values.max()), 2), 'mean_ms': round(float(values.mean()), 2)}
+
+
+def summarize(records, rate, start, max_lag):
+    """Per-kind and overall throughput / latency for one rate"""
+    elapsed = max((r[4] for r in records), default=start) - start
+    result = {'offered_rps': rate, 'elapsed_s': round(elapsed, 2),
+              'dispatch_lag_max_ms': round(max_lag * 1000, 2), 'kinds': {}}
+    for kind in KINDS + ('all',):
+        rows = [r for r in records if kind == 'all' or r[0] == kind]
+        if not rows:
+            continue
+        ok = [r for r in rows if r[1] == EXPECTED_STATUS[r[0]]]
+        result['kinds'][kind] = {
+            'requests': len(rows),
+            'ok': len(ok),
+            'errors': len(rows) - len(ok),
+            'throughput_rps': round(len(ok) / elapsed, 2) if elapsed > 0 else 0.0,
+            **latency_stats([r[2] for r in ok]),
+            'service_p50_ms': latency_stats([r[3] for r in ok])['p50_ms']
+        }
+    return result
+
+
+def compare(results, baseline, tolerance, min_delta_ms):
+    """Regression messages of results against a baseline report"""
+    previous = {run['offered_rps']: run for run in baseline['results']}
+    problems = []
+    for run in results:
+        base_run = previous.get(run['offered_rps'])
+        if base_run is None:
+            continue
+        for kind, stats in run['kinds'].items():
+            base = base_run['kinds'].get(kind)
+            if base is None:
+                continue
+            label = f"{run['offered_rps']} rps / {kind}"
+            for key in ('p95_ms', 'p99_ms'):
+                if stats[key] is None or base[key] is None:
+                    continue
+                if stats[key] > base[key] * (1 + tolerance) and stats[key] - base[key] > min_delta_ms:
+                    problems.append(f"{label}: {key} {base[key]:.1f} -> {stats[key]:.1f}")
+            if stats['throughput_rps'] < base['throughput_rps'] * (1 - tolerance):
+                problems.append(f"{label}: throughput {base['throughput_rps']:.1f} -> "
+                                f"{stats['throughput_rps']:.1f} req/s")
+            error_rate = stats['errors'] / stats['requests']
+            base_error_rate = base['errors'] / base['requests']
+            if error_rate > base_error_rate + tolerance * 0.1:
+                problems.append(f"{label}: error rate {base_error_rate:.1%} -> {error_rate:.1%}")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--url', help='Running API to target instead of starting one')
+    parser.add_argument('--port', type=int, default=5099, help='Port for the API started by this script')
+    parser.add_argument('--workers', type=int, default=int(os.environ.get('NEXORA_WORKERS', '2')))
+    parser.add_argument('--rates', type=float, nargs='+', default=[10, 25, 50], help='Arrival rates (req/s)')
+    parser.add_argument('--duration', type=float, default=15.0, help='Seconds per rate')
+    parser.add_argument('--mix', type=parse_mix, default=parse_mix('single=0.7,batch=0.2,invalid=0.1'))
+    parser.add_argument('--batch-size', type=int, default=50)
+    parser.add_argument('--arrivals', choices=['poisson', 'constant'], default='poisson')
+    parser.add_argument('--senders', type=int, default=64, help='Client threads sending requests')
+    parser.add_argument('--engine', help='Inference engine to request (default: server default)')
+    parser.add_argument('--use-cache', action='store_true', help='Allow prediction cache hits')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='Optional JSON file for the results')
+    parser.add_argument('--baseline', help='Earlier --output file to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='Allowed relative slowdown')
+    parser.add_argument('--min-delta-ms', type=float, default=5.0,
+                        help='Ignore latency increases smaller than this')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    process = None
+    url = args.url.rstrip('/') if args.url else None
+    if url is None:
+        process, url = start_server(args.port, args.workers)
+
+    results = []
+    try:
+        for rate in args.rates:
+            print(f"\n🚀 {rate:g} req/s for {args.duration:g}s ({args.arrivals} arrivals)")
+            run = run_rate(url, rate, args, rng)
+            results.append(run)
+            print(f"{'Kind':<8} | {'Reqs':>5} | {'Errors':>6} | {'req/s':>7} | "
+                  f"{'p50 ms':>7} | {'p95 ms':>7} | {'p99 ms':>7}")
+            print("-" * 62)
+            for kind, stats in run['kinds'].items():
+                print(f"{kind:<8} | {stats['requests']:>5} | {stats['errors']:>6} | {stats['throughput_rps']:>7.1f} | "
+                      f"{stats['p50_ms'] or 0:>7.1f} | {stats['p95_ms'] or 0:>7.1f} | {stats['p99_ms'] or 0:>7.1f}")
+            if run['dispatch_lag_max_ms'] > 50:
+                print(f"⚠️ Client fell {run['dispatch_lag_max_ms']:.0f} ms behind schedule; "
+                      f"results may understate the offered load")
+    finally:
+        if process is not None:
+            stop_server(process)
+
+    report = {
+        'url': url if args.url else 'local',
+        'workers': None if args.url else args.workers,
+        'cpu_count': os.cpu_count(),
+        'duration': args.duration,
+        'mix': args.mix,
+        'batch_size': args.batch_size,
+        'arrivals': args.arrivals,
+        'engine': args.engine,
+        'use_cache': args.use_cache,
+        'seed': args.seed,
+        'results': results
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n✅ Results saved: {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            problems = compare(results, json.load(f), args.tolerance, args.min_delta_ms)
+        if problems:
+            print(f"\n❌ Regressions against {args.baseline}:")
+            for problem in problems:
+                print(f"   {problem}")
+            return 1
+        print(f"\n✅ No regressions against {args.baseline} (tolerance {args.tolerance:.0%})")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,83 @@
+"""
+Benchmark: single-row predict_proba throughput across worker processes
+Compares the pickled n_jobs=-1 model against the online inference policy.
+
+Usage: python bench_parallelism.py --workers 1 2 4 8 --duration 5
+"""
+
+import argparse
+import json
+import multiprocessing as mp
+import time
+import warnings
+
+import joblib
+import pandas as pd
+
+from inference import apply_online_policy
+
+FEATURE_COLUMNS = ['salary', 'performanceRating', 'department_encoded', 'jobTitle_encoded']
+
+
+def _worker(use_policy, duration, start_event, results):
+    """One simulated gunicorn worker scoring single employees in a loop"""
+    warnings.filterwarnings('ignore')
+    model = joblib.load('nexora_attrition_model.pkl')
+    if use_policy:
+        apply_online_policy(model)
+    X = pd.DataFrame([[5000, 3, 2, 7]], columns=FEATURE_COLUMNS)
+    model.predict_proba(X)
+
+    start_event.wait()
+    count = 0
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        model.predict_proba(X)
+        count += 1
+    results.put(count)
+
+
+def run(n_workers, use_policy, duration):
+    """Total predictions/s for n_workers processes running concurrently"""
+    start_event = mp.Event()
+    results = mp.Queue()
+    procs = [
+        mp.Process(target=_worker, args=(use_policy, duration, start_event, results))
+        for _ in range(n_workers)
+    ]
+    for p in procs:
+        p.start()
+    # Give every worker time to load the model before starting the clock
+    time.sleep(2 + 0.2 * n_workers)
+    start_event.set()
+    total = sum(results.get() for _ in procs)
+    for p in procs:
+        p.join()
+    return total / duration
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--duration', type=float, default=5.0)
+    parser.add_argument('--output', help='Optional JSON file for the results')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print(f"{'Workers':>8} | {'n_jobs=-1 (req/s)':>18} | {'policy (req/s)':>15} | {'Speedup':>7}")
+    print("=" * 60)
+    rows = []
+    for n in args.workers:
+        baseline = run(n, use_policy=False, duration=args.duration)
+        policy = run(n, use_policy=True, duration=args.duration)
+        rows.append({'workers': n, 'pickled_rps': baseline, 'policy_rps': policy})
+        print(f"{n:>8} | {baseline:>18.1f} | {policy:>15.1f} | {policy / baseline:>6.2f}x")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'cpu_count': mp.cpu_count(), 'duration': args.duration, 'results': rows}, f, indent=2)
+        print(f"\n✅ Results saved: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""
+Benchmark: per-worker model startup time and memory, pickles vs bundle
+
+Starts N worker processes at once, the way gunicorn does, and has each one
+load the artifacts in the given mode, score a batch (to touch every tree
+page) and report load time plus RSS / PSS / private memory from
+/proc/self/smaps_rollup. PSS splits shared pages among the processes that
+map them, so it shows what the bundle saves per worker.
+
+Usage: python bench_startup.py --workers 4
+"""
+
+import argparse
+import json
+import multiprocessing as mp
+import time
+import warnings
+
+from metrics import process_memory_kb
+
+
+def _worker(mode, ready, done, results):
+    warnings.filterwarnings('ignore')
+    import numpy as np
+    baseline = process_memory_kb()
+
+    started = time.perf_counter()
+    if mode == 'bundle':
+        from model_bundle import load_bundle
+        from inference import build_bundle_engines
+        engines = build_bundle_engines(load_bundle())
+    else:
+        import json as json_module
+        import joblib
+        from inference import load_model, build_engines
+        model = load_model()
+        joblib.load('department_encoder.pkl')
+        joblib.load('job_encoder.pkl')
+        with open('model_config.json') as f:
+            json_module.load(f)
+        engines = build_engines(model)
+    load_seconds = time.perf_counter() - started
+
+    X = np.column_stack([
+        np.linspace(1000, 20000, 20000), np.full(20000, 3.0),
+        np.arange(20000) % 3, np.arange(20000) % 9
+    ])
+    engines['native'](X)
+
+    # Measure while every worker is alive so shared pages are split in PSS
+    ready.put(None)
+    done.wait()
+    memory = process_memory_kb()
+    results.put({
+        'load_ms': load_seconds * 1000,
+        'model_rss_kb': memory['rss_kb'] - baseline['rss_kb'],
+        **memory
+    })
+
+
+def run(mode, n_workers):
+    ctx = mp.get_context('spawn')
+    ready, results = ctx.Queue(), ctx.Queue()
+    done = ctx.Event()
+    procs = [ctx.Process(target=_worker, args=(mode, ready, done, results)) for _ in range(n_workers)]
+    for p in procs:
+        p.start()
+    for _ in procs:
+        ready.get()
+    done.set()
+    rows = [results.get() for _ in procs]
+    for p in procs:
+        p.join()
+
+    def avg(key):
+        return sum(r[key] for r in rows) / len(rows)
+
+    return {key: avg(key) for key in rows[0]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Per-worker startup time and memory')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--output', help='Optional JSON file for the results')
+    args = parser.parse_args()
+
+    print("=" * 78)
+    print(f"{'Mode':<8} | {'Load (ms)':>10} | {'Model RSS (MB)':>14} | {'RSS (MB)':>9} | {'PSS (MB)':>9} | {'Private (MB)':>12}")
+    print("=" * 78)
+    results = {}
+    for mode in ('pickle', 'bundle'):
+        r = run(mode, args.workers)
+        results[mode] = r
+        print(f"{mode:<8} | {r['load_ms']:>10.1f} | {r['model_rss_kb'] / 1024:>14.1f} | "
+              f"{r['rss_kb'] / 1024:>9.1f} | {r['pss_kb'] / 1024:>9.1f} | {r['private_kb'] / 1024:>12.1f}")
+    print(f"\nAverages per worker over {args.workers} concurrent workers")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'workers': args.workers, 'results': results}, f, indent=2)
+        print(f"✅ Results saved: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,130 @@
+"""
+Micro-batching request coalescer for concurrent single predictions
+
+Single-prediction requests that arrive within a short window are scored as
+one matrix by a background dispatcher thread and each caller gets back its
+own row. Only useful with threaded workers (gunicorn --threads N), where
+several requests are in flight in the same process.
+"""
+
+import os
+import queue
+import threading
+import time
+
+import numpy as np
+
+from metrics import Histogram, BATCH_SIZE_BUCKETS
+
+COALESCE_WINDOW_MS = float(os.environ.get('NEXORA_COALESCE_WINDOW_MS', '0'))
+COALESCE_MAX_BATCH = int(os.environ.get('NEXORA_COALESCE_MAX_BATCH', '64'))
+COALESCE_MAX_WAIT_MS = float(os.environ.get('NEXORA_COALESCE_MAX_WAIT_MS', '50'))
+
+
+class _Pending:
+    __slots__ = ('row', 'enqueued', 'event', 'result', 'error', 'abandoned')
+
+    def __init__(self, row):
+        self.row = row
+        self.enqueued = time.perf_counter()
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+        self.abandoned = False
+
+
+class RequestCoalescer:
+    """Collects single rows for up to `window_ms` or `max_batch` rows, then scores them together.
+
+    - A request never sits in the queue longer than `window_ms`, so at low
+      traffic the added latency is bounded by the window.
+    - `max_wait_ms` bounds how long a caller waits for its result when the
+      dispatcher is busy; past that it scores its own row inline.
+    """
+
+    def __init__(self, score, window_ms=COALESCE_WINDOW_MS, max_batch=COALESCE_MAX_BATCH,
+                 max_wait_ms=COALESCE_MAX_WAIT_MS):
+        self.score = score
+        self.window = window_ms / 1000.0
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max_wait_ms / 1000.0
+
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+
+        self.batch_sizes = Histogram(BATCH_SIZE_BUCKETS)
+        self.queue_wait_ms = Histogram()
+        self.batches = 0
+        self.timeouts = 0
+
+    def _ensure_dispatcher(self):
+        # Threads do not survive fork, so (re)start per process
+        with self._lock:
+            if self._thread is None or self._pid != os.getpid() or not self._thread.is_alive():
+                self._queue = queue.Queue()
+                self._pid = os.getpid()
+                self._thread = threading.Thread(target=self._run, name='nexora-coalescer', daemon=True)
+                self._thread.start()
+
+    def submit(self, row):
+        """Risk for one feature row, scored together with concurrent callers"""
+        self._ensure_dispatcher()
+        item = _Pending(row)
+        self._queue.put(item)
+        if not item.event.wait(self.max_wait):
+            item.abandoned = True
+            with self._lock:
+                self.timeouts += 1
+            return self.score(np.asarray([row], dtype=float))[0]
+        if item.error is not None:
+            raise item.error
+        return item.result
+
+    def _collect(self):
+        first = self._queue.get()
+        batch = [first]
+        deadline = first.enqueued + self.window
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return [item for item in batch if not item.abandoned]
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            if not batch:
+                continue
+
+            dispatched = time.perf_counter()
+            for item in batch:
+                self.queue_wait_ms.observe((dispatched - item.enqueued) * 1000)
+            self.batch_sizes.observe(len(batch))
+            self.batches += 1
+
+            try:
+                risks = self.score(np.asarray([item.row for item in batch], dtype=float))
+                for item, risk in zip(batch, risks):
+                    item.result = risk
+            except Exception as e:
+                for item in batch:
+                    item.error = e
+            for item in batch:
+                item.event.set()
+
+    def stats(self):
+        return {
+            'window_ms': self.window * 1000,
+            'max_batch': self.max_batch,
+            'max_wait_ms': self.max_wait * 1000,
+            'batches': self.batches,
+            'timeouts': self.timeouts,
+            'batch_size': self.batch_sizes.snapshot(),
+            'queue_wait_ms': self.queue_wait_ms.snapshot()
+        }
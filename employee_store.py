@@ -0,0 +1,251 @@
+"""
+Server-side employee profiles, so callers can score by employee_id
+
+Profiles (salary, performanceRating, department, jobTitle and an optional
+name) are bulk-loaded into a SQLite file keyed by employee_id. Department
+and job title codes are encoded once at load time and stored next to the
+names; the code tables come from the encoders' classes and are kept in
+memory, and stored codes are rebuilt when a new model brings different
+classes. Scoring the whole organization is then a single SELECT into a
+feature matrix, with no per-row validation or encoding.
+
+Rows with an unknown department or job title are rejected at load time.
+
+Usage: python employee_store.py employees.csv   (or .ndjson / .json)
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import time
+from contextlib import closing
+
+import numpy as np
+
+EMPLOYEES_DB_PATH = os.environ.get('NEXORA_EMPLOYEES_DB', os.path.join('employees', 'employees.db'))
+REQUIRED_FIELDS = ['salary', 'performanceRating', 'department', 'jobTitle']
+# Ids per SELECT ... IN (...) (SQLite's default variable limit is 999)
+LOOKUP_BATCH = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS employees (
+    employee_id TEXT PRIMARY KEY,
+    employee_name TEXT,
+    salary NUMERIC NOT NULL,
+    performance_rating NUMERIC NOT NULL,
+    department TEXT NOT NULL,
+    job_title TEXT NOT NULL,
+    department_code INTEGER,
+    job_code INTEGER,
+    updated_at REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS employees_department ON employees (department);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+def classes_hash(dept_classes, job_classes):
+    return hashlib.sha256(json.dumps([list(map(str, dept_classes)), list(map(str, job_classes))]).encode()).hexdigest()
+
+
+class EmployeeStore:
+    """employee_id -> profile and encoded features in one SQLite file"""
+
+    def __init__(self, dept_classes, job_classes, path=EMPLOYEES_DB_PATH):
+        self.path = path
+        # Encoding cache: LabelEncoder codes are the positions in classes_
+        self.dept_codes = {name: code for code, name in enumerate(dept_classes)}
+        self.job_codes = {name: code for code, name in enumerate(job_classes)}
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as db:
+            db.executescript(SCHEMA)
+        self._sync_codes(classes_hash(dept_classes, job_classes))
+
+    def _connect(self):
+        # One short-lived connection per call: safe across threads and forks
+        db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        db.execute('PRAGMA journal_mode=WAL')
+        db.execute('PRAGMA synchronous=NORMAL')
+        return closing(db)
+
+    def _sync_codes(self, encoding):
+        """Re-encode stored rows when the encoders' classes changed"""
+        with self._connect() as db:
+            db.execute('BEGIN IMMEDIATE')
+            try:
+                row = db.execute("SELECT value FROM meta WHERE key = 'encoding'").fetchone()
+                if row is None or row[0] != encoding:
+                    db.execute('UPDATE employees SET department_code = NULL, job_code = NULL')
+                    db.executemany('UPDATE employees SET department_code = ? WHERE department = ?',
+                                   [(code, name) for name, code in self.dept_codes.items()])
+                    db.executemany('UPDATE employees SET job_code = ? WHERE job_title = ?',
+                                   [(code, name) for name, code in self.job_codes.items()])
+                    db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('encoding', ?)", (encoding,))
+                db.execute('COMMIT')
+            except BaseException:
+                db.execute('ROLLBACK')
+                raise
+
+    def _validate(self, emp):
+        """(row tuple, None) for a loadable profile, else (None, error)"""
+        if not isinstance(emp, dict):
+            return None, 'Expected an object'
+        employee_id = emp.get('employee_id')
+        if employee_id is None or employee_id == '':
+            return None, 'Missing employee_id'
+        missing = [f for f in REQUIRED_FIELDS if emp.get(f) is None]
+        if missing:
+            return None, f'Missing fields: {", ".join(missing)}'
+        # Lists or objects in the JSON are unhashable: reject the row, not the load
+        if not isinstance(emp['department'], str) or emp['department'] not in self.dept_codes:
+            return None, f'Invalid department. Supported: {list(self.dept_codes)}'
+        if not isinstance(emp['jobTitle'], str) or emp['jobTitle'] not in self.job_codes:
+            return None, f'Invalid job title. Supported: {list(self.job_codes)}'
+        try:
+            salary = float(emp['salary'])
+            rating = float(emp['performanceRating'])
+        except (TypeError, ValueError):
+            return None, 'salary and performanceRating must be numeric'
+        if np.isnan(salary) or np.isnan(rating):
+            return None, 'salary and performanceRating must be numeric'
+        name = emp.get('employee_name')
+        return (str(employee_id), name if isinstance(name, str) else None, salary, rating,
+                emp['department'], emp['jobTitle'],
+                self.dept_codes[emp['department']], self.job_codes[emp['jobTitle']]), None
+
+    def load(self, employees):
+        """Insert or replace profiles in one transaction; returns (loaded, errors)"""
+        rows = []
+        errors = []
+        now = time.time()
+        for i, emp in enumerate(employees):
+            row, error = self._validate(emp)
+            if error:
+                errors.append({'row': i, 'employee_id': emp.get('employee_id') if isinstance(emp, dict) else None,
+                               'error': error})
+            else:
+                rows.append(row + (now,))
+        if rows:
+            with self._connect() as db:
+                db.execute('BEGIN IMMEDIATE')
+                try:
+                    db.executemany(
+                        'INSERT OR REPLACE INTO employees (employee_id, employee_name, salary, performance_rating, '
+                        'department, job_title, department_code, job_code, updated_at) '
+                        'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)', rows)
+                    db.execute('COMMIT')
+                except BaseException:
+                    db.execute('ROLLBACK')
+                    raise
+        return len(rows), errors
+
+    def profiles(self, employee_ids):
+        """{employee_id: employee dict in API field names} for the ids that are stored"""
+        ids = list(dict.fromkeys(str(i) for i in employee_ids))
+        found = {}
+        with self._connect() as db:
+            for start in range(0, len(ids), LOOKUP_BATCH):
+                batch = ids[start:start + LOOKUP_BATCH]
+                rows = db.execute(
+                    'SELECT employee_id, employee_name, salary, performance_rating, department, job_title '
+                    f"FROM employees WHERE employee_id IN ({','.join('?' * len(batch))})", batch)
+                for employee_id, name, salary, rating, department, job_title in rows:
+                    found[employee_id] = {
+                        'employee_id': employee_id,
+                        'salary': salary,
+                        'performanceRating': rating,
+                        'department': department,
+                        'jobTitle': job_title
+                    }
+                    if name is not None:
+                        found[employee_id]['employee_name'] = name
+        return found
+
+    def has_profiles(self):
+        with self._connect() as db:
+            return db.execute('SELECT 1 FROM employees LIMIT 1').fetchone() is not None
+
+    def delete(self, employee_id):
+        with self._connect() as db:
+            return db.execute('DELETE FROM employees WHERE employee_id = ?', (str(employee_id),)).rowcount
+
+    def features(self, department=None):
+        """(employee_ids, employee_names, X, encodable) for every stored employee, or one department
+
+        X is the (n, 4) float feature matrix; `encodable` is False for rows whose
+        department or job title the current encoders do not know.
+        """
+        query = ('SELECT employee_id, employee_name, salary, performance_rating, department_code, job_code '
+                 'FROM employees')
+        params = ()
+        if department is not None:
+            query += ' WHERE department = ?'
+            params = (department,)
+        with self._connect() as db:
+            rows = db.execute(query + ' ORDER BY employee_id', params).fetchall()
+        if not rows:
+            return [], [], np.empty((0, 4)), np.empty(0, dtype=bool)
+        ids, names, salary, rating, dept_code, job_code = zip(*rows)
+        X = np.column_stack([
+            np.array(salary, dtype=float),
+            np.array(rating, dtype=float),
+            # None (unknown code) becomes nan
+            np.array(dept_code, dtype=float),
+            np.array(job_code, dtype=float)
+        ])
+        encodable = ~np.isnan(X[:, 2:]).any(axis=1)
+        return list(ids), list(names), X, encodable
+
+    def stats(self):
+        with self._connect() as db:
+            total = db.execute('SELECT COUNT(*) FROM employees').fetchone()[0]
+            by_department = dict(db.execute(
+                'SELECT department, COUNT(*) FROM employees GROUP BY department ORDER BY department').fetchall())
+        return {'path': self.path, 'employees': total, 'by_department': by_department}
+
+
+def read_employee_file(path):
+    """Employee dicts from a CSV, NDJSON or {"employees": [...]} JSON file"""
+    if path.endswith('.csv'):
+        import pandas as pd
+        df = pd.read_csv(path, dtype={'employee_id': str, 'employee_name': str})
+        return df.astype(object).where(df.notna(), None).to_dict('records')
+    with open(path) as f:
+        if path.endswith(('.ndjson', '.jsonl')):
+            return [json.loads(line) for line in f if line.strip()]
+        data = json.load(f)
+    return data['employees'] if isinstance(data, dict) else data
+
+
+def main():
+    import argparse
+    import joblib
+
+    parser = argparse.ArgumentParser(description='Bulk-load employee profiles for scoring by ID')
+    parser.add_argument('path', help='CSV, NDJSON or JSON file of employees')
+    parser.add_argument('--db', default=EMPLOYEES_DB_PATH)
+    args = parser.parse_args()
+
+    dept_encoder = joblib.load('department_encoder.pkl')
+    job_encoder = joblib.load('job_encoder.pkl')
+    store = EmployeeStore(dept_encoder.classes_, job_encoder.classes_, path=args.db)
+    started = time.perf_counter()
+    loaded, errors = store.load(read_employee_file(args.path))
+    print(f"✅ Loaded {loaded:,} employees into {args.db} in {time.perf_counter() - started:.1f}s")
+    for error in errors[:10]:
+        print(f"❌ Row {error['row']} ({error['employee_id']}): {error['error']}")
+    if len(errors) > 10:
+        print(f"❌ ... and {len(errors) - 10:,} more rejected rows")
+    return 1 if errors and not loaded else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
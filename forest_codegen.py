@@ -0,0 +1,199 @@
+"""
+Compile the Nexora attrition forest into generated Python code
+
+Every tree of nexora_attrition_model.pkl becomes plain nested comparisons
+on the four features (salary, performanceRating, department_encoded,
+jobTitle_encoded) and is written to an importable module next to the other
+artifacts:
+
+- predict_one(...) scores one employee as straight-line if/else code, with
+  no NumPy or sklearn calls on the hot path
+- predict(X) scores a batch by splitting row-index arrays at every node
+  with vectorized NumPy comparisons, one generated function per tree
+  (small batches just loop over predict_one)
+
+Trees are summed in estimator order and divided by the tree count, exactly
+like sklearn, so the output is bit-for-bit identical to predict_proba.
+
+The module is a build artifact and is not committed: train_model.py writes
+it, and the API generates it on startup when the compiled engine is enabled
+and the module is missing or was built for another model.
+
+Generate (after train_model.py):  python forest_codegen.py
+"""
+
+import importlib.util
+import os
+import re
+
+from risk_index import file_sha256
+
+MODEL_PATH = 'nexora_attrition_model.pkl'
+COMPILED_PATH = 'nexora_forest_compiled.py'
+COMPILED_MODULE = 'nexora_forest_compiled'
+
+# Below this many rows a Python loop over predict_one beats splitting index
+# arrays, whose cost is dominated by a fixed few microseconds per tree node
+SCALAR_MAX_ROWS = 4096
+
+ARGS = ('salary', 'performanceRating', 'department_encoded', 'jobTitle_encoded')
+
+
+def leaf_values_are_counts():
+    """True if tree.value holds weighted class counts (sklearn < 1.4), not fractions"""
+    import sklearn
+    major, minor = re.match(r'(\d+)\.(\d+)', sklearn.__version__).groups()
+    return (int(major), int(minor)) < (1, 4)
+
+
+def _leaf_risk(tree, node, normalize):
+    """Positive-class fraction of a leaf, as returned by tree.predict_proba"""
+    # sklearn >= 1.4 returns the stored fractions as is, so renormalizing
+    # them would break bitwise parity; older versions divide counts by
+    # their sum, exactly like this
+    value = tree.value[node, 0]
+    if not normalize:
+        return float(value[1])
+    total = float(value.sum())
+    return float(value[1]) / (total or 1.0)
+
+
+def _scalar_tree(tree, lines, indent, normalize):
+    """Nested if/else adding this tree's leaf risk to `risk`"""
+    stack = [(0, indent, None)]
+    while stack:
+        node, depth, header = stack.pop()
+        pad = '    ' * depth
+        if header:
+            lines.append(pad[:-4] + header)
+        if tree.children_left[node] == -1:
+            lines.append(f"{pad}risk += {_leaf_risk(tree, node, normalize)!r}")
+            continue
+        condition = f"{ARGS[tree.feature[node]]} <= {float(tree.threshold[node])!r}"
+        # Pushed in reverse so the 'if' branch is emitted first
+        stack.append((tree.children_right[node], depth + 1, 'else:'))
+        stack.append((tree.children_left[node], depth + 1, f'if {condition}:'))
+
+
+def _batch_tree(tree, index, lines, normalize):
+    """Function adding this tree's leaf risk to out[rows] for every row"""
+    lines.append(f'def _tree_{index}(X, rows, out):')
+    counter = [0]
+
+    def emit(node, rows, depth):
+        pad = '    ' * depth
+        if tree.children_left[node] == -1:
+            lines.append(f"{pad}out[{rows}] += {_leaf_risk(tree, node, normalize)!r}")
+            return
+        counter[0] += 1
+        n = counter[0]
+        feature = int(tree.feature[node])
+        lines.append(f"{pad}m = X[{rows}, {feature}] <= {float(tree.threshold[node])!r}")
+        lines.append(f"{pad}l{n}, r{n} = {rows}[m], {rows}[~m]")
+        lines.append(f"{pad}if l{n}.size:")
+        emit(tree.children_left[node], f'l{n}', depth + 1)
+        lines.append(f"{pad}if r{n}.size:")
+        emit(tree.children_right[node], f'r{n}', depth + 1)
+
+    emit(0, 'rows', 1)
+    lines.append('')
+    lines.append('')
+
+
+def generate_source(model, model_sha256=None):
+    """Source of the compiled module for a fitted RandomForestClassifier"""
+    trees = [estimator.tree_ for estimator in model.estimators_]
+    n_trees = len(trees)
+    normalize = leaf_values_are_counts()
+
+    lines = [
+        '"""',
+        'Generated by forest_codegen.py from nexora_attrition_model.pkl - do not edit',
+        '',
+        'Regenerate with: python forest_codegen.py',
+        '"""',
+        '',
+        'import numpy as np',
+        '',
+        f'MODEL_SHA256 = {model_sha256!r}',
+        f'N_TREES = {n_trees}',
+        f'FEATURES = {list(ARGS)!r}',
+        f'SCALAR_MAX_ROWS = {SCALAR_MAX_ROWS}',
+        '',
+        '',
+    ]
+
+    for i, tree in enumerate(trees):
+        _batch_tree(tree, i, lines, normalize)
+    lines.append(f"_TREES = ({', '.join(f'_tree_{i}' for i in range(n_trees))},)")
+    lines.append('')
+    lines.append('')
+
+    lines.append(f"def predict_one({', '.join(ARGS)}):")
+    lines.append('    """Risk for one employee; inputs must already be float32-rounded"""')
+    lines.append('    risk = 0.0')
+    for tree in trees:
+        _scalar_tree(tree, lines, 1, normalize)
+    lines.append(f'    return risk / {n_trees}')
+    lines.append('')
+    lines.append('')
+
+    lines.extend([
+        'def predict(X):',
+        '    """Risk for every row of an (n_samples, 4) feature matrix"""',
+        '    # sklearn trees compare float32 inputs against float64 thresholds',
+        '    X = np.asarray(X, dtype=np.float64).astype(np.float32).astype(np.float64)',
+        '    if X.ndim == 1:',
+        '        X = X[None, :]',
+        '    if X.shape[0] <= SCALAR_MAX_ROWS:',
+        '        return np.array([predict_one(*row) for row in X.tolist()], dtype=np.float64)',
+        '    out = np.zeros(X.shape[0], dtype=np.float64)',
+        '    rows = np.arange(X.shape[0])',
+        '    for tree in _TREES:',
+        '        tree(X, rows, out)',
+        '    return out / N_TREES',
+        '',
+    ])
+    return '\n'.join(lines)
+
+
+def write_module(model, path=COMPILED_PATH, model_sha256=None):
+    """Write the compiled module atomically; returns its size in bytes"""
+    source = generate_source(model, model_sha256)
+    # Per-process temp name: several workers may generate at once
+    tmp = f'{path}.{os.getpid()}.tmp'
+    with open(tmp, 'w', encoding='utf-8', newline='\n') as f:
+        f.write(source)
+    os.replace(tmp, path)
+    return len(source)
+
+
+def build_compiled_module(model_path=MODEL_PATH, path=COMPILED_PATH):
+    """Regenerate the compiled module from the pickled model on disk"""
+    import joblib
+    return write_module(joblib.load(model_path), path=path, model_sha256=file_sha256(model_path))
+
+
+def compiled_sha256(path=COMPILED_PATH):
+    """MODEL_SHA256 of a generated module, read from its header without importing it; None if absent"""
+    try:
+        with open(path, encoding='utf-8') as f:
+            for _, line in zip(range(20), f):
+                if line.startswith('MODEL_SHA256 = '):
+                    return line.split('=', 1)[1].strip().strip("'")
+    except OSError:
+        pass
+    return None
+
+
+def import_compiled(path):
+    """Import a generated module from any path (e.g. one built into a temp directory)"""
+    spec = importlib.util.spec_from_file_location(COMPILED_MODULE, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+if __name__ == '__main__':
+    size = build_compiled_module()
+    print(f"✅ Compiled forest saved: {COMPILED_PATH} ({size / 1024:.0f} KB)")
@@ -0,0 +1,112 @@
+"""
+Array-backed Random Forest inference for the Nexora attrition model
+Flattens every tree of nexora_attrition_model.pkl into contiguous NumPy
+arrays and walks them directly, skipping sklearn's per-call overhead.
+"""
+
+import numpy as np
+
+MODEL_PATH = 'nexora_attrition_model.pkl'
+
+
+class ArrayForest:
+    """Random Forest flattened into contiguous node arrays.
+
+    All trees share one set of arrays (feature, threshold, left, right,
+    value); `roots` holds the offset of each tree's root node. Leaves point
+    to themselves with an infinite threshold, so every row can be walked for
+    a fixed `max_depth` steps without branching on leaf masks.
+    """
+
+    def __init__(self, feature, threshold, left, right, value, roots, max_depth):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        self.roots = roots
+        self.max_depth = max_depth
+        self.n_trees = len(roots)
+
+    @classmethod
+    def from_model(cls, model):
+        """Flatten a fitted RandomForestClassifier"""
+        features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+        offset = 0
+        max_depth = 0
+        for estimator in model.estimators_:
+            tree = estimator.tree_
+            n = tree.node_count
+            is_leaf = tree.children_left == -1
+            node_ids = np.arange(offset, offset + n)
+
+            feature = tree.feature.copy()
+            threshold = tree.threshold.copy()
+            left = np.where(is_leaf, node_ids, tree.children_left + offset)
+            right = np.where(is_leaf, node_ids, tree.children_right + offset)
+            feature[is_leaf] = 0
+            threshold[is_leaf] = np.inf
+
+            # Leaf class fractions, normalized the same way sklearn's trees do
+            value = tree.value[:, 0, :].astype(np.float64)
+            totals = value.sum(axis=1, keepdims=True)
+            totals[totals == 0] = 1.0
+
+            features.append(feature)
+            thresholds.append(threshold)
+            lefts.append(left)
+            rights.append(right)
+            values.append(value / totals)
+            roots.append(offset)
+            offset += n
+            max_depth = max(max_depth, tree.max_depth)
+
+        return cls(
+            np.ascontiguousarray(np.concatenate(features), dtype=np.intp),
+            np.ascontiguousarray(np.concatenate(thresholds), dtype=np.float64),
+            np.ascontiguousarray(np.concatenate(lefts), dtype=np.intp),
+            np.ascontiguousarray(np.concatenate(rights), dtype=np.intp),
+            np.ascontiguousarray(np.concatenate(values), dtype=np.float64),
+            np.asarray(roots, dtype=np.intp),
+            max_depth
+        )
+
+    @classmethod
+    def load(cls, path=MODEL_PATH):
+        """Load the pickled model once and flatten it"""
+        import joblib
+        return cls.from_model(joblib.load(path))
+
+    @staticmethod
+    def _as_float32(X):
+        # sklearn trees compare float32 inputs against float64 thresholds
+        return np.asarray(X, dtype=np.float64).astype(np.float32).astype(np.float64)
+
+    def _leaves(self, X):
+        """Leaf node index of every (tree, row) pair"""
+        rows = np.arange(X.shape[0])[None, :]
+        nodes = np.repeat(self.roots[:, None], X.shape[0], axis=1)
+        for _ in range(self.max_depth):
+            go_left = X[rows, self.feature[nodes]] <= self.threshold[nodes]
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+        return nodes
+
+    def predict_proba(self, X, chunk_size=8192):
+        """Class probabilities for an (n_samples, 4) matrix, like sklearn"""
+        X = self._as_float32(X)
+        if X.ndim == 1:
+            X = X[None, :]
+        proba = np.empty((X.shape[0], self.value.shape[1]), dtype=np.float64)
+        for start in range(0, X.shape[0], chunk_size):
+            chunk = X[start:start + chunk_size]
+            proba[start:start + chunk_size] = self.value[self._leaves(chunk)].mean(axis=0)
+        return proba
+
+    def predict_one(self, row):
+        """Positive-class probability for a single feature row"""
+        x = self._as_float32(row)
+        nodes = self.roots
+        for _ in range(self.max_depth):
+            nodes = np.where(x[self.feature[nodes]] <= self.threshold[nodes],
+                             self.left[nodes], self.right[nodes])
+        return self.value[nodes, 1].mean()
@@ -0,0 +1,329 @@
+"""
+Seeded synthetic employee generator for benchmarking the scoring paths
+
+Writes any number of employees in either schema:
+
+- nexora: employee_id, salary, performanceRating, department, jobTitle
+  (the 4 fields of the API and nexora_attrition_model.pkl)
+- full:   the 22 features of the original dashboard model
+  (get_required_features_from_model's fallback list in app.py)
+
+Rows follow the distributions of the IBM HR attrition CSV the models were
+trained on: job title frequencies, department given job title, salary per
+job title (log-normal), job level from salary, ordinal survey scores and
+tenure that never exceeds working life. The built-in profile was taken
+from that CSV; `--fit WA_Fn-UseC_-HR-Employee-Attrition.csv` re-derives it
+and `--save-profile` / `--profile` store and reuse one.
+
+Rows are generated and written in blocks of BLOCK_ROWS, so memory stays
+flat for any --rows, and each block has its own seeded stream: the same
+--seed always gives the same file, whatever the output format.
+
+Usage: python generate_employees.py --rows 1000000 --output employees.csv
+       python generate_employees.py --rows 5000000 --schema full --output employees.parquet
+       python generate_employees.py --rows 100000 --output employees.ndjson --seed 7
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+BLOCK_ROWS = 65536
+
+NEXORA_COLUMNS = ['employee_id', 'salary', 'performanceRating', 'department', 'jobTitle']
+FULL_FEATURES = [
+    'Age', 'DailyRate', 'DistanceFromHome', 'Education', 'EmployeeNumber',
+    'EnvironmentSatisfaction', 'JobInvolvement', 'JobLevel',
+    'JobSatisfaction', 'MonthlyIncome', 'OverTime', 'StockOptionLevel',
+    'TotalWorkingYears', 'TrainingTimesLastYear', 'WorkLifeBalance',
+    'YearsAtCompany', 'YearsInCurrentRole', 'YearsWithCurrManager',
+    'BusinessTravel_Travel_Frequently', 'BusinessTravel_Travel_Rarely',
+    'MaritalStatus_Married', 'MaritalStatus_Single'
+]
+ORDINAL_COLUMNS = ['Education', 'EnvironmentSatisfaction', 'JobInvolvement', 'JobSatisfaction',
+                   'StockOptionLevel', 'TrainingTimesLastYear', 'WorkLifeBalance']
+FORMATS = ('csv', 'parquet', 'ndjson')
+
+# Summary of WA_Fn-UseC_-HR-Employee-Attrition.csv (1470 employees)
+DEFAULT_PROFILE = {
+    'job_titles': {
+        'Sales Executive': 326, 'Research Scientist': 292, 'Laboratory Technician': 259,
+        'Manufacturing Director': 145, 'Healthcare Representative': 131, 'Manager': 102,
+        'Sales Representative': 83, 'Research Director': 80, 'Human Resources': 52
+    },
+    'department_by_job': {
+        'Sales Executive': {'Sales': 326},
+        'Research Scientist': {'Research & Development': 292},
+        'Laboratory Technician': {'Research & Development': 259},
+        'Manufacturing Director': {'Research & Development': 145},
+        'Healthcare Representative': {'Research & Development': 131},
+        'Manager': {'Research & Development': 54, 'Sales': 37, 'Human Resources': 11},
+        'Sales Representative': {'Sales': 83},
+        'Research Director': {'Research & Development': 80},
+        'Human Resources': {'Human Resources': 52}
+    },
+    # MonthlyIncome mean / std per job title
+    'salary_by_job': {
+        'Sales Executive': [6924, 2249], 'Research Scientist': [3240, 1105],
+        'Laboratory Technician': [3237, 1081], 'Manufacturing Director': [7295, 2670],
+        'Healthcare Representative': [7528, 2411], 'Manager': [17181, 2767],
+        'Sales Representative': [2626, 811], 'Research Director': [16033, 2828],
+        'Human Resources': [4236, 2451]
+    },
+    'salary_range': [1009, 19999],
+    'performance_rating': {'3': 1244, '4': 226},
+    # Median MonthlyIncome of job levels 1..5
+    'job_level_medians': [2670, 5340, 9980, 16150, 19230],
+    'age': {'mean': 36.92, 'std': 9.14, 'min': 18, 'max': 60},
+    'daily_rate': [102, 1499],
+    'distance_from_home': {'mean': 9.19, 'min': 1, 'max': 29},
+    'ordinal': {
+        'Education': {'1': 170, '2': 282, '3': 572, '4': 398, '5': 48},
+        'EnvironmentSatisfaction': {'1': 284, '2': 287, '3': 453, '4': 446},
+        'JobInvolvement': {'1': 83, '2': 375, '3': 868, '4': 144},
+        'JobSatisfaction': {'1': 289, '2': 280, '3': 442, '4': 459},
+        'StockOptionLevel': {'0': 631, '1': 596, '2': 158, '3': 85},
+        'TrainingTimesLastYear': {'0': 54, '1': 71, '2': 547, '3': 491, '4': 123, '5': 119, '6': 65},
+        'WorkLifeBalance': {'1': 80, '2': 344, '3': 893, '4': 153}
+    },
+    'overtime_share': 416 / 1470,
+    'business_travel': {'Non-Travel': 150, 'Travel_Rarely': 1043, 'Travel_Frequently': 277},
+    'marital_status': {'Divorced': 327, 'Married': 673, 'Single': 470},
+    # TotalWorkingYears mean / std; tenure ratios as beta(a, b) parameters
+    'total_working_years': [11.28, 7.78],
+    'years_at_company_ratio': [1.6, 0.9],
+    'years_in_role_ratio': [2.0, 1.3],
+    'years_with_manager_ratio': [2.0, 1.4]
+}
+
+
+def _probabilities(counts):
+    """(values, probabilities) from a {value: count} mapping"""
+    values = list(counts)
+    weights = np.asarray([counts[v] for v in values], dtype=float)
+    return values, weights / weights.sum()
+
+
+def _beta_moments(ratios):
+    """beta(a, b) with the mean and variance of ratios in (0, 1]"""
+    ratios = np.clip(ratios, 1e-3, 1 - 1e-3)
+    mean, var = ratios.mean(), ratios.var()
+    common = mean * (1 - mean) / max(var, 1e-6) - 1
+    return [round(float(mean * common), 3), round(float((1 - mean) * common), 3)]
+
+
+def fit_profile(csv_path):
+    """Profile of the IBM HR attrition CSV (same shape as DEFAULT_PROFILE)"""
+    import pandas as pd
+    df = pd.read_csv(csv_path)
+    counts = lambda s: {str(k): int(v) for k, v in s.value_counts().sort_index().items()}
+    levels = df.groupby('JobLevel')['MonthlyIncome'].median()
+    with_company = df[df['TotalWorkingYears'] > 0]
+    with_tenure = df[df['YearsAtCompany'] > 0]
+    return {
+        'job_titles': counts(df['JobRole']),
+        'department_by_job': {job: counts(group['Department']) for job, group in df.groupby('JobRole')},
+        'salary_by_job': {job: [round(float(s.mean()), 1), round(float(s.std()), 1)]
+                          for job, s in df.groupby('JobRole')['MonthlyIncome']},
+        'salary_range': [int(df['MonthlyIncome'].min()), int(df['MonthlyIncome'].max())],
+        'performance_rating': counts(df['PerformanceRating']),
+        'job_level_medians': [float(levels[level]) for level in sorted(levels.index)],
+        'age': {'mean': round(float(df['Age'].mean()), 2), 'std': round(float(df['Age'].std()), 2),
+                'min': int(df['Age'].min()), 'max': int(df['Age'].max())},
+        'daily_rate': [int(df['DailyRate'].min()), int(df['DailyRate'].max())],
+        'distance_from_home': {'mean': round(float(df['DistanceFromHome'].mean()), 2),
+                               'min': int(df['DistanceFromHome'].min()),
+                               'max': int(df['DistanceFromHome'].max())},
+        'ordinal': {column: counts(df[column]) for column in ORDINAL_COLUMNS},
+        'overtime_share': float((df['OverTime'] == 'Yes').mean()),
+        'business_travel': counts(df['BusinessTravel']),
+        'marital_status': counts(df['MaritalStatus']),
+        'total_working_years': [round(float(df['TotalWorkingYears'].mean()), 2),
+                                round(float(df['TotalWorkingYears'].std()), 2)],
+        'years_at_company_ratio': _beta_moments(
+            with_company['YearsAtCompany'] / with_company['TotalWorkingYears']),
+        'years_in_role_ratio': _beta_moments(with_tenure['YearsInCurrentRole'] / with_tenure['YearsAtCompany']),
+        'years_with_manager_ratio': _beta_moments(
+            with_tenure['YearsWithCurrManager'] / with_tenure['YearsAtCompany'])
+    }
+
+
+class EmployeeSampler:
+    """Vectorized draws from a profile; one call produces one block of rows"""
+
+    def __init__(self, profile=None):
+        profile = profile or DEFAULT_PROFILE
+        self.profile = profile
+        self.jobs, self.job_p = _probabilities(profile['job_titles'])
+        self.departments = sorted({d for by_job in profile['department_by_job'].values() for d in by_job})
+        # Row i: department probabilities given job title i
+        self.dept_given_job = np.zeros((len(self.jobs), len(self.departments)))
+        for i, job in enumerate(self.jobs):
+            values, p = _probabilities(profile['department_by_job'][job])
+            for value, share in zip(values, p):
+                self.dept_given_job[i, self.departments.index(value)] = share
+        self.dept_cdf = np.cumsum(self.dept_given_job, axis=1)
+        # Log-normal parameters matching each job title's salary mean and std
+        mean_std = np.asarray([profile['salary_by_job'][job] for job in self.jobs], dtype=float)
+        sigma2 = np.log1p((mean_std[:, 1] / mean_std[:, 0]) ** 2)
+        self.salary_mu = np.log(mean_std[:, 0]) - sigma2 / 2
+        self.salary_sigma = np.sqrt(sigma2)
+        self.ratings, self.rating_p = _probabilities(profile['performance_rating'])
+        medians = np.log(np.asarray(profile['job_level_medians'], dtype=float))
+        self.level_edges = np.exp((medians[:-1] + medians[1:]) / 2)
+
+    def _categorical(self, rng, counts, n):
+        values, p = _probabilities(counts)
+        return np.asarray(values)[rng.choice(len(values), size=n, p=p)]
+
+    def nexora(self, rng, n, first_id):
+        """Columns of the 4-field schema (plus employee_id)"""
+        job_idx = rng.choice(len(self.jobs), size=n, p=self.job_p)
+        # Inverse-CDF draw of the department, per row's job title
+        dept_idx = (rng.random(n)[:, None] > self.dept_cdf[job_idx]).sum(axis=1)
+        low, high = self.profile['salary_range']
+        salary = np.clip(np.rint(np.exp(rng.normal(self.salary_mu[job_idx], self.salary_sigma[job_idx]))), low, high)
+        return {
+            'employee_id': np.char.add('E', np.char.zfill(np.arange(first_id, first_id + n).astype(str), 8)),
+            'salary': salary.astype(np.int64),
+            'performanceRating': np.asarray(self.ratings, dtype=np.int64)[
+                rng.choice(len(self.ratings), size=n, p=self.rating_p)],
+            'department': np.asarray(self.departments)[np.minimum(dept_idx, len(self.departments) - 1)],
+            'jobTitle': np.asarray(self.jobs)[job_idx]
+        }
+
+    def full(self, rng, n, first_id):
+        """Columns of the 22-feature schema"""
+        profile = self.profile
+        base = self.nexora(rng, n, first_id)
+        income = base['salary']
+
+        age_p = profile['age']
+        age = np.clip(np.rint(rng.normal(age_p['mean'], age_p['std'], n)), age_p['min'], age_p['max']).astype(np.int64)
+        twy_mean, twy_std = profile['total_working_years']
+        shape, scale = (twy_mean / twy_std) ** 2, twy_std ** 2 / twy_mean
+        total_years = np.minimum(np.rint(rng.gamma(shape, scale, n)), age - 18).astype(np.int64)
+        at_company = np.rint(total_years * rng.beta(*profile['years_at_company_ratio'], n)).astype(np.int64)
+        in_role = np.rint(at_company * rng.beta(*profile['years_in_role_ratio'], n)).astype(np.int64)
+        with_manager = np.rint(at_company * rng.beta(*profile['years_with_manager_ratio'], n)).astype(np.int64)
+
+        distance = profile['distance_from_home']
+        travel = self._categorical(rng, profile['business_travel'], n)
+        marital = self._categorical(rng, profile['marital_status'], n)
+        columns = {
+            'Age': age,
+            'DailyRate': rng.integers(profile['daily_rate'][0], profile['daily_rate'][1] + 1, n),
+            'DistanceFromHome': np.clip(np.rint(distance['min'] + rng.exponential(distance['mean'] - distance['min'], n)),
+                                        distance['min'], distance['max']).astype(np.int64),
+            'EmployeeNumber': np.arange(first_id, first_id + n, dtype=np.int64),
+            'JobLevel': (np.searchsorted(self.level_edges, income) + 1).astype(np.int64),
+            'MonthlyIncome': income,
+            'OverTime': rng.random(n) < profile['overtime_share'],
+            'TotalWorkingYears': total_years,
+            'YearsAtCompany': at_company,
+            'YearsInCurrentRole': in_role,
+            'YearsWithCurrManager': with_manager,
+            'BusinessTravel_Travel_Frequently': travel == 'Travel_Frequently',
+            'BusinessTravel_Travel_Rarely': travel == 'Travel_Rarely',
+            'MaritalStatus_Married': marital == 'Married',
+            'MaritalStatus_Single': marital == 'Single'
+        }
+        for column in ORDINAL_COLUMNS:
+            columns[column] = self._categorical(rng, profile['ordinal'][column], n).astype(np.int64)
+        return {column: columns[column] for column in FULL_FEATURES}
+
+
+def iter_blocks(rows, schema='nexora', seed=42, profile=None):
+    """DataFrames of at most BLOCK_ROWS rows, `rows` in total"""
+    import pandas as pd
+    sampler = EmployeeSampler(profile)
+    draw = sampler.full if schema == 'full' else sampler.nexora
+    for block, first in enumerate(range(0, rows, BLOCK_ROWS)):
+        n = min(BLOCK_ROWS, rows - first)
+        # One independent stream per block: output does not depend on how it is consumed
+        rng = np.random.default_rng([seed, block])
+        yield pd.DataFrame(draw(rng, n, first + 1))
+
+
+def output_format(path, fmt=None):
+    if fmt:
+        return fmt
+    ext = os.path.splitext(path)[1].lower().lstrip('.')
+    return {'jsonl': 'ndjson', 'json': 'ndjson', 'pq': 'parquet'}.get(ext, ext if ext in FORMATS else 'csv')
+
+
+def write_blocks(blocks, path, fmt):
+    """Stream blocks to path; returns rows written"""
+    rows = 0
+    if fmt == 'parquet':
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        writer = None
+        try:
+            for df in blocks:
+                table = pa.Table.from_pandas(df, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(path, table.schema)
+                writer.write_table(table)
+                rows += len(df)
+        finally:
+            if writer is not None:
+                writer.close()
+        return rows
+
+    with open(path, 'w', newline='') as f:
+        for df in blocks:
+            if fmt == 'ndjson':
+                f.write(df.to_json(orient='records', lines=True))
+                if not df.empty:
+                    f.write('\n')
+            else:
+                df.to_csv(f, index=False, header=rows == 0)
+            rows += len(df)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--schema', choices=['nexora', 'full'], default='nexora')
+    parser.add_argument('--output', default='employees.csv')
+    parser.add_argument('--format', choices=FORMATS, help='Default: from the --output extension')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--fit', help='Derive the profile from the training CSV')
+    parser.add_argument('--profile', help='Load a profile saved with --save-profile')
+    parser.add_argument('--save-profile', help='Write the profile in use as JSON')
+    args = parser.parse_args()
+
+    profile = DEFAULT_PROFILE
+    if args.fit:
+        profile = fit_profile(args.fit)
+        print(f"✅ Profile fitted on {args.fit}")
+    elif args.profile:
+        with open(args.profile) as f:
+            profile = json.load(f)
+    if args.save_profile:
+        with open(args.save_profile, 'w') as f:
+            json.dump(profile, f, indent=2)
+        print(f"✅ Profile saved: {args.save_profile}")
+
+    fmt = output_format(args.output, args.format)
+    started = time.perf_counter()
+    try:
+        rows = write_blocks(iter_blocks(args.rows, args.schema, args.seed, profile), args.output, fmt)
+    except ImportError:
+        print("❌ Parquet output requires pyarrow")
+        return 1
+    elapsed = time.perf_counter() - started
+    size_mb = os.path.getsize(args.output) / 1024 / 1024
+    print(f"✅ {rows:,} employees ({args.schema} schema) written to {args.output} as {fmt}: "
+          f"{size_mb:.1f} MB in {elapsed:.1f}s ({rows / max(elapsed, 1e-9):,.0f} rows/s)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
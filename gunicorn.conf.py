@@ -0,0 +1,48 @@
+"""
+Gunicorn settings for the Nexora attrition API
+
+Loaded automatically by `gunicorn api:app` from the project directory (or
+explicitly with --config gunicorn.conf.py). With preload on, the master
+imports api.py - model, encoders, engines - once and the workers share those
+pages copy-on-write instead of each loading a private copy.
+"""
+
+import gc
+import os
+import tempfile
+
+from metrics import process_memory_kb
+from metrics_export import reset_directory
+
+bind = os.environ.get('NEXORA_BIND', f"0.0.0.0:{os.environ.get('PORT', '5000')}")
+workers = int(os.environ.get('NEXORA_WORKERS', '2'))
+threads = int(os.environ.get('NEXORA_THREADS', '1'))
+timeout = int(os.environ.get('NEXORA_TIMEOUT', '120'))
+preload_app = os.environ.get('NEXORA_PRELOAD', '1') != '0'
+accesslog = '-'
+errorlog = '-'
+
+# Shared directory where every worker mirrors its /metrics values; set before
+# the app is (pre)loaded so all processes agree on it. Cleared on each start
+if not (os.environ.get('NEXORA_METRICS_DIR') or os.environ.get('PROMETHEUS_MULTIPROC_DIR')):
+    os.environ['NEXORA_METRICS_DIR'] = tempfile.mkdtemp(prefix='nexora-metrics-')
+reset_directory(os.environ.get('NEXORA_METRICS_DIR') or os.environ['PROMETHEUS_MULTIPROC_DIR'])
+
+
+def when_ready(server):
+    # Move everything loaded so far out of the collector's reach; otherwise
+    # the first gc pass in each worker writes to every object header and
+    # un-shares the model pages
+    if preload_app:
+        gc.freeze()
+    memory = process_memory_kb()
+    server.log.info(f"ℹ️ Master ready: preload={preload_app}, workers={workers}, "
+                    f"threads={threads}, rss={memory.get('rss_kb', 0) / 1024:.1f} MB")
+
+
+def post_worker_init(worker):
+    memory = process_memory_kb()
+    if memory:
+        worker.log.info(f"ℹ️ Worker {worker.pid}: rss={memory['rss_kb'] / 1024:.1f} MB, "
+                        f"pss={memory['pss_kb'] / 1024:.1f} MB, "
+                        f"private={memory['private_kb'] / 1024:.1f} MB")
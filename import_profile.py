@@ -0,0 +1,100 @@
+"""
+Import-time profile of the Nexora serving path against a startup budget
+
+Runs `python -X importtime -c "import <module>"` in a fresh interpreter and
+reports the slowest top-level imports. For api.py the module-level model
+load is counted in api's own time, so the total is the cold start a new
+gunicorn worker (or container) pays before it can serve.
+
+Exits with status 1 when the total exceeds --budget-ms or when any module
+in --forbid (visualization libraries by default) is pulled in.
+
+Usage: python import_profile.py api --budget-ms 3000
+       NEXORA_MODEL_BUNDLE=nexora_model.bundle python import_profile.py api --budget-ms 1000
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+
+FORBIDDEN_ON_SERVING_PATH = ('streamlit', 'plotly', 'pydeck', 'faker', 'seaborn', 'matplotlib')
+
+
+def profile_imports(module):
+    """(name, depth, self_us, cumulative_us) for every import of module"""
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        stripped = name.lstrip()
+        depth = (len(name) - len(stripped) - 1) // 2
+        rows.append((stripped, depth, int(self_us), int(cumulative_us)))
+    return rows
+
+
+def summarize(module, rows, top):
+    total_us = next((cum for name, depth, _, cum in rows if name == module and depth == 0), 0)
+    direct = sorted(
+        ({'module': name, 'self_ms': s / 1000, 'cumulative_ms': c / 1000}
+         for name, depth, s, c in rows if depth <= 1),
+        key=lambda r: r['cumulative_ms'], reverse=True
+    )
+    return {
+        'module': module,
+        'total_ms': total_us / 1000,
+        'modules_imported': len(rows),
+        'slowest': direct[:top],
+        'loaded': sorted({name for name, _, _, _ in rows})
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Import-time profile against a startup budget')
+    parser.add_argument('module', nargs='?', default='api')
+    parser.add_argument('--budget-ms', type=float, help='Fail when the total import time exceeds this')
+    parser.add_argument('--forbid', nargs='*', default=list(FORBIDDEN_ON_SERVING_PATH),
+                        help='Modules that must not be imported')
+    parser.add_argument('--top', type=int, default=15)
+    parser.add_argument('--output', help='Optional JSON file for the report')
+    args = parser.parse_args()
+
+    report = summarize(args.module, profile_imports(args.module), args.top)
+    forbidden = [m for m in args.forbid if m in report['loaded']]
+
+    print("=" * 60)
+    print(f"{'Import':<36} | {'Self (ms)':>9} | {'Cum. (ms)':>9}")
+    print("=" * 60)
+    for row in report['slowest']:
+        print(f"{row['module'][:36]:<36} | {row['self_ms']:>9.1f} | {row['cumulative_ms']:>9.1f}")
+    print(f"\nimport {args.module}: {report['total_ms']:.1f} ms, {report['modules_imported']} modules")
+
+    failed = False
+    if forbidden:
+        print(f"❌ Forbidden modules imported: {', '.join(forbidden)}")
+        failed = True
+    if args.budget_ms is not None:
+        within = report['total_ms'] <= args.budget_ms
+        print(f"{'✅' if within else '❌'} Budget {args.budget_ms:.0f} ms: {'within' if within else 'exceeded'}")
+        failed = failed or not within
+
+    if args.output:
+        report['forbidden_loaded'] = forbidden
+        report['budget_ms'] = args.budget_ms
+        del report['loaded']
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"✅ Report saved: {args.output}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,290 @@
+"""
+Inference parallelism policy for the Nexora attrition model
+
+train_model.py fits the forest with n_jobs=-1 and that setting is pickled
+with it, so every predict_proba would fan out over all host cores. Online
+requests are already parallel across gunicorn workers, so the loader pins
+the model to NEXORA_ONLINE_N_JOBS (default 1) and only batches of at least
+NEXORA_PARALLEL_BATCH_MIN rows are split over a small shared thread pool of
+NEXORA_BATCH_N_JOBS threads.
+"""
+
+import importlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+
+import logging
+
+import numpy as np
+
+from forest_engine import ArrayForest
+from risk_index import RiskLookupIndex, INDEX_PATH, file_sha256
+from forest_codegen import COMPILED_MODULE, COMPILED_PATH, build_compiled_module, compiled_sha256
+
+logger = logging.getLogger(__name__)
+
+MODEL_PATH = 'nexora_attrition_model.pkl'
+
+ONLINE_N_JOBS = int(os.environ.get('NEXORA_ONLINE_N_JOBS', '1'))
+BATCH_N_JOBS = int(os.environ.get('NEXORA_BATCH_N_JOBS', '2'))
+PARALLEL_BATCH_MIN = int(os.environ.get('NEXORA_PARALLEL_BATCH_MIN', '20000'))
+
+# The generated compiled-engine module is megabytes of code, so it is only
+# imported where 'compiled' is the default engine or NEXORA_COMPILED=1
+COMPILED_ENABLED = os.environ.get('NEXORA_COMPILED', '0') == '1'
+
+# Boot-time warm-up (see warm_up): on/off and salaries per (dept, job, rating)
+WARMUP_ENABLED = os.environ.get('NEXORA_WARMUP', '1') != '0'
+WARMUP_SALARIES = int(os.environ.get('NEXORA_WARMUP_SALARIES', '8'))
+WARMUP_SALARY_RANGE = (1000.0, 20000.0)
+WARMUP_RATINGS = (1, 2, 3, 4)
+
+# Risk category cut-offs, shared by every scoring path
+LOW_RISK_MAX = 0.33
+MEDIUM_RISK_MAX = 0.66
+
+INPUT_COLUMNS = ['salary', 'performanceRating', 'department', 'jobTitle']
+FEATURE_COLUMNS = ['salary', 'performanceRating', 'department_encoded', 'jobTitle_encoded']
+
+
+def apply_online_policy(model, n_jobs=None):
+    """Override the pickled n_jobs so single predictions stay on one core"""
+    model.set_params(n_jobs=ONLINE_N_JOBS if n_jobs is None else n_jobs)
+    return model
+
+
+def load_model(path=MODEL_PATH):
+    """Load the forest with the online parallelism policy applied"""
+    import joblib
+    return apply_online_policy(joblib.load(path))
+
+
+def load_compiled(model_sha256, model_path=MODEL_PATH):
+    """Generated forest module (see forest_codegen.py), generated first if missing or stale"""
+    try:
+        if compiled_sha256() != model_sha256:
+            if not os.path.exists(model_path) or file_sha256(model_path) != model_sha256:
+                raise ValueError(f"{COMPILED_PATH} is missing or stale and {model_path} is not the loaded model, "
+                                 "run: python forest_codegen.py")
+            started = time.perf_counter()
+            build_compiled_module(model_path)
+            importlib.invalidate_caches()
+            logger.info(f"ℹ️ Generated {COMPILED_PATH} in {time.perf_counter() - started:.1f}s")
+        compiled = importlib.import_module(COMPILED_MODULE)
+        if compiled.MODEL_SHA256 != model_sha256:
+            raise ValueError(f"{COMPILED_MODULE}.py was generated for a different model, run: python forest_codegen.py")
+        logger.info(f"✅ Compiled engine ready ({compiled.N_TREES} trees)")
+        return compiled
+    except ImportError:
+        logger.info(f"ℹ️ {COMPILED_MODULE}.py not found, compiled engine disabled")
+    except Exception as e:
+        logger.error(f"❌ Error loading compiled engine: {str(e)}")
+    return None
+
+
+def compiled_wanted(default_engine):
+    """Whether to load the compiled engine for a process serving `default_engine`"""
+    return COMPILED_ENABLED or default_engine == 'compiled'
+
+
+def build_engines(model, model_path=MODEL_PATH, index_path=INDEX_PATH, compiled=COMPILED_ENABLED):
+    """Scoring functions (feature matrix -> risk probabilities) by engine name"""
+    import pandas as pd
+
+    def sklearn_engine(X):
+        return model.predict_proba(pd.DataFrame(X, columns=FEATURE_COLUMNS))[:, 1]
+
+    engines = {'sklearn': sklearn_engine}
+    try:
+        native_forest = ArrayForest.from_model(model)
+        engines['native'] = lambda X: native_forest.predict_proba(X)[:, 1]
+        logger.info(f"✅ Native engine ready ({native_forest.n_trees} trees)")
+    except Exception as e:
+        logger.error(f"❌ Error building native engine: {str(e)}")
+
+    model_sha256 = file_sha256(model_path)
+    compiled = load_compiled(model_sha256, model_path) if compiled else None
+    if compiled is not None:
+        engines['compiled'] = compiled.predict
+
+    try:
+        risk_index = RiskLookupIndex.load(index_path)
+        if risk_index.model_sha256 != model_sha256:
+            raise ValueError(f"{index_path} was built for a different model, run: python risk_index.py")
+        fallback_engine = engines.get('native', sklearn_engine)
+        engines['lookup'] = lambda X: risk_index.predict(X, fallback=fallback_engine)
+        logger.info(f"✅ Risk lookup index loaded ({len(risk_index.table)} combinations)")
+    except FileNotFoundError:
+        logger.info(f"ℹ️ {index_path} not found, lookup engine disabled")
+    except Exception as e:
+        logger.error(f"❌ Error loading risk index: {str(e)}")
+    return engines
+
+
+def build_bundle_engines(bundle, compiled=COMPILED_ENABLED):
+    """Engines served straight from a memory-mapped ModelBundle (no sklearn model)"""
+    engines = {'native': lambda X: bundle.forest.predict_proba(X)[:, 1]}
+    compiled = load_compiled(bundle.model_sha256) if compiled else None
+    if compiled is not None:
+        engines['compiled'] = compiled.predict
+    if bundle.risk_index is not None:
+        engines['lookup'] = lambda X: bundle.risk_index.predict(X, fallback=engines['native'])
+    return engines
+
+
+class BatchPolicy:
+    """Runs large batches over a bounded thread pool, small ones inline.
+
+    Tree traversal in sklearn and NumPy releases the GIL, so threads give
+    real parallelism without forking model copies. The pool is created on
+    first use and shared by every request in the process.
+    """
+
+    def __init__(self, n_jobs=BATCH_N_JOBS, min_rows=PARALLEL_BATCH_MIN):
+        self.n_jobs = max(1, n_jobs)
+        self.min_rows = min_rows
+        self._pool = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _get_pool(self):
+        # Threads do not survive fork, so a pool created before a preloading
+        # gunicorn master forks is replaced in each worker
+        with self._lock:
+            if self._pool is None or self._pid != os.getpid():
+                self._pool = ThreadPoolExecutor(max_workers=self.n_jobs,
+                                                thread_name_prefix='nexora-batch')
+                self._pid = os.getpid()
+            return self._pool
+
+    def is_parallel(self, n_rows):
+        return self.n_jobs > 1 and n_rows >= self.min_rows
+
+    def run(self, score, X):
+        """Apply `score` to X (array or DataFrame), chunked across the pool if large"""
+        n_rows = len(X)
+        if not self.is_parallel(n_rows):
+            return score(X)
+
+        bounds = np.linspace(0, n_rows, self.n_jobs + 1).astype(int)
+        chunks = [X[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+        return np.concatenate(list(self._get_pool().map(score, chunks)))
+
+    def describe(self):
+        return {
+            'online_n_jobs': ONLINE_N_JOBS,
+            'batch_n_jobs': self.n_jobs,
+            'parallel_batch_min': self.min_rows
+        }
+
+
+batch_policy = BatchPolicy()
+
+
+def warmup_matrix(n_departments, n_job_titles, n_salaries=WARMUP_SALARIES):
+    """Every department x job title x rating over a spread of salaries"""
+    salaries = np.linspace(*WARMUP_SALARY_RANGE, max(1, n_salaries))
+    grid = np.meshgrid(salaries, WARMUP_RATINGS, np.arange(n_departments), np.arange(n_job_titles),
+                       indexing='ij')
+    return np.column_stack([axis.ravel() for axis in grid]).astype(np.float64)
+
+
+def warm_up(engines, n_departments, n_job_titles, n_salaries=WARMUP_SALARIES):
+    """Run synthetic predictions through every engine before serving.
+
+    Each engine scores the whole grid as one batch (touching every tree
+    page) and then one single-row call per department x job title, so lazy
+    initialization on both code paths happens here instead of in the first
+    requests. Returns timing stats; raises if an engine fails.
+    """
+    X = warmup_matrix(n_departments, n_job_titles, n_salaries)
+    pairs = [(d, j) for d in range(n_departments) for j in range(n_job_titles)]
+    singles = np.array([(np.median(X[:, 0]), 3.0, d, j) for d, j in pairs], dtype=np.float64)
+
+    per_engine = {}
+    started = time.perf_counter()
+    for name, score in engines.items():
+        engine_started = time.perf_counter()
+        score(X)
+        for row in singles:
+            score(row[None, :])
+        per_engine[name] = round((time.perf_counter() - engine_started) * 1000, 1)
+
+    return {
+        'enabled': True,
+        'total_ms': round((time.perf_counter() - started) * 1000, 1),
+        'batch_rows': len(X),
+        'single_rows': len(singles),
+        'engines_ms': per_engine
+    }
+
+
+def risk_categories(risks):
+    """Vectorized risk category for an array of probabilities"""
+    risks = np.asarray(risks)
+    return np.where(risks < LOW_RISK_MAX, 'Low-risk',
+                    np.where(risks < MEDIUM_RISK_MAX, 'Medium-risk', 'High-risk'))
+
+
+def encode_frame(df, dept_encoder, job_encoder):
+    """Validate and encode a DataFrame with the four Nexora columns.
+
+    Returns (X, errors): the (n, 4) feature matrix for the valid rows and an
+    object array with an error message per row (None when the row is valid).
+    """
+    import pandas as pd
+    n = len(df)
+    errors = np.full(n, None, dtype=object)
+
+    salary = pd.to_numeric(df['salary'], errors='coerce').to_numpy(dtype=float)
+    rating = pd.to_numeric(df['performanceRating'], errors='coerce').to_numpy(dtype=float)
+    departments = df['department'].to_numpy(dtype=object)
+    job_titles = df['jobTitle'].to_numpy(dtype=object)
+
+    bad_job = ~np.isin(job_titles, job_encoder.classes_)
+    bad_dept = ~np.isin(departments, dept_encoder.classes_)
+    bad_number = np.isnan(salary) | np.isnan(rating)
+    # Same precedence as predict_single: department, then job title, then numbers
+    errors[bad_number] = 'salary and performanceRating must be numeric'
+    errors[bad_job] = f'Invalid job title. Supported: {list(job_encoder.classes_)}'
+    errors[bad_dept] = f'Invalid department. Supported: {list(dept_encoder.classes_)}'
+
+    valid = ~(bad_dept | bad_job | bad_number)
+    X = np.column_stack([
+        salary[valid],
+        rating[valid],
+        dept_encoder.transform(departments[valid]) if valid.any() else np.empty(0),
+        job_encoder.transform(job_titles[valid]) if valid.any() else np.empty(0)
+    ])
+    return X, errors
+
+
+def score_frame(df, score, dept_encoder, job_encoder, policy=None):
+    """Score a DataFrame in one vectorized pass.
+
+    Returns a DataFrame with employee_id/employee_name (when present),
+    risk_score, risk_percentage, risk_category and error, row-aligned with df.
+    """
+    import pandas as pd
+    missing = [c for c in INPUT_COLUMNS if c not in df.columns]
+    if missing:
+        raise ValueError(f'Missing columns: {", ".join(missing)}')
+
+    X, errors = encode_frame(df, dept_encoder, job_encoder)
+    valid = np.array([e is None for e in errors], dtype=bool)
+
+    risks = np.full(len(df), np.nan)
+    if valid.any():
+        risks[valid] = (policy or batch_policy).run(score, X)
+
+    result = pd.DataFrame(index=df.index)
+    for column in ('employee_id', 'employee_name'):
+        if column in df.columns:
+            result[column] = df[column]
+    result['risk_score'] = np.round(risks, 3)
+    result['risk_percentage'] = np.round(risks * 100, 1)
+    result['risk_category'] = np.where(valid, risk_categories(np.nan_to_num(risks)), None)
+    result['error'] = errors
+    return result
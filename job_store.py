@@ -0,0 +1,326 @@
+"""
+SQLite-backed queue of asynchronous batch-scoring jobs
+
+A job is split into chunks of NEXORA_JOB_CHUNK_SIZE employees when it is
+submitted. job_worker.py processes claim queued chunks one at a time,
+score them and store the NDJSON result lines, so progress, partial results
+and the queue itself survive API and worker restarts. Chunks held by a
+worker that died (or exceeded the lease) are put back in the queue.
+
+The database uses WAL mode so API workers can read progress while job
+workers write results.
+"""
+
+import json
+import os
+import sqlite3
+import time
+import uuid
+from contextlib import closing
+
+JOBS_DB_PATH = os.environ.get('NEXORA_JOBS_DB', os.path.join('jobs', 'jobs.db'))
+JOB_CHUNK_SIZE = int(os.environ.get('NEXORA_JOB_CHUNK_SIZE', '5000'))
+# Jobs queued or running at once; further submissions get a 429
+JOB_MAX_QUEUED = int(os.environ.get('NEXORA_JOB_MAX_QUEUED', '20'))
+JOB_MAX_ROWS = int(os.environ.get('NEXORA_JOB_MAX_ROWS', '2000000'))
+# Seconds a claimed chunk may run before another worker may take it over
+JOB_LEASE_SECONDS = float(os.environ.get('NEXORA_JOB_LEASE_SECONDS', '600'))
+JOB_MAX_ATTEMPTS = 3
+JOB_RETENTION_HOURS = float(os.environ.get('NEXORA_JOB_RETENTION_HOURS', '24'))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    engine TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    total_rows INTEGER NOT NULL,
+    done_rows INTEGER NOT NULL DEFAULT 0,
+    error_rows INTEGER NOT NULL DEFAULT 0,
+    n_chunks INTEGER NOT NULL,
+    done_chunks INTEGER NOT NULL DEFAULT 0,
+    high_risk INTEGER NOT NULL DEFAULT 0,
+    medium_risk INTEGER NOT NULL DEFAULT 0,
+    low_risk INTEGER NOT NULL DEFAULT 0,
+    score_sum REAL NOT NULL DEFAULT 0,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at);
+
+CREATE TABLE IF NOT EXISTS chunks (
+    job_id TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    first_row INTEGER NOT NULL,
+    n_rows INTEGER NOT NULL,
+    input TEXT,
+    output TEXT,
+    worker_pid INTEGER,
+    claimed_at REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (job_id, idx)
+);
+CREATE INDEX IF NOT EXISTS chunks_status ON chunks (status, job_id, idx);
+"""
+
+
+class JobQueueFull(Exception):
+    """Too many jobs queued or running"""
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class JobStore:
+    """Jobs, their chunks and results in one SQLite file"""
+
+    def __init__(self, path=JOBS_DB_PATH, chunk_size=JOB_CHUNK_SIZE, max_queued=JOB_MAX_QUEUED,
+                 max_rows=JOB_MAX_ROWS, lease_seconds=JOB_LEASE_SECONDS, max_attempts=JOB_MAX_ATTEMPTS):
+        self.path = path
+        self.chunk_size = max(1, chunk_size)
+        self.max_queued = max_queued
+        self.max_rows = max_rows
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as db:
+            db.executescript(SCHEMA)
+
+    def _connect(self):
+        # One short-lived connection per call: safe across threads and forks
+        db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        db.row_factory = sqlite3.Row
+        db.execute('PRAGMA journal_mode=WAL')
+        db.execute('PRAGMA synchronous=NORMAL')
+        return closing(db)
+
+    def submit(self, employees, engine=None):
+        """Store a new job; returns its id. Raises JobQueueFull or ValueError"""
+        if not employees:
+            raise ValueError('No employees provided')
+        if len(employees) > self.max_rows:
+            raise ValueError(f'Too many employees: {len(employees):,} (limit {self.max_rows:,})')
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        chunks = [
+            (job_id, i, 'queued', first, len(employees[first:first + self.chunk_size]),
+             json.dumps(employees[first:first + self.chunk_size]))
+            for i, first in enumerate(range(0, len(employees), self.chunk_size))
+        ]
+        self.purge_expired()
+        with self._connect() as db:
+            db.execute('BEGIN IMMEDIATE')
+            try:
+                depth = db.execute(
+                    "SELECT COUNT(*) FROM jobs WHERE status IN ('queued', 'running')").fetchone()[0]
+                if depth >= self.max_queued:
+                    raise JobQueueFull(f'{depth} jobs already queued or running (limit {self.max_queued})')
+                db.execute(
+                    'INSERT INTO jobs (id, status, engine, created_at, total_rows, n_chunks) VALUES (?, ?, ?, ?, ?, ?)',
+                    (job_id, 'queued', engine, now, len(employees), len(chunks)))
+                db.executemany(
+                    'INSERT INTO chunks (job_id, idx, status, first_row, n_rows, input) VALUES (?, ?, ?, ?, ?, ?)',
+                    chunks)
+                db.execute('COMMIT')
+            except BaseException:
+                db.execute('ROLLBACK')
+                raise
+        return job_id
+
+    def claim_chunk(self, pid):
+        """Oldest queued chunk as (job_id, idx, first_row, engine, employees), or None"""
+        with self._connect() as db:
+            db.execute('BEGIN IMMEDIATE')
+            try:
+                row = db.execute(
+                    "SELECT c.job_id, c.idx, c.first_row, c.input, j.engine FROM chunks c "
+                    "JOIN jobs j ON j.id = c.job_id "
+                    "WHERE c.status = 'queued' AND j.status IN ('queued', 'running') "
+                    "ORDER BY j.created_at, c.idx LIMIT 1").fetchone()
+                if row is None:
+                    db.execute('COMMIT')
+                    return None
+                now = time.time()
+                db.execute(
+                    "UPDATE chunks SET status = 'running', worker_pid = ?, claimed_at = ?, attempts = attempts + 1 "
+                    "WHERE job_id = ? AND idx = ?", (pid, now, row['job_id'], row['idx']))
+                db.execute(
+                    "UPDATE jobs SET status = 'running', started_at = COALESCE(started_at, ?) "
+                    "WHERE id = ? AND status = 'queued'", (now, row['job_id']))
+                db.execute('COMMIT')
+            except BaseException:
+                db.execute('ROLLBACK')
+                raise
+        return row['job_id'], row['idx'], row['first_row'], row['engine'], json.loads(row['input'])
+
+    def complete_chunk(self, job_id, idx, output, n_errors, counts, score_sum):
+        """Store a scored chunk (NDJSON text) and roll its counts into the job"""
+        with self._connect() as db:
+            db.execute('BEGIN IMMEDIATE')
+            try:
+                updated = db.execute(
+                    "UPDATE chunks SET status = 'done', output = ?, input = NULL "
+                    "WHERE job_id = ? AND idx = ? AND status = 'running'", (output, job_id, idx)).rowcount
+                if updated:
+                    db.execute(
+                        "UPDATE jobs SET done_chunks = done_chunks + 1, "
+                        "done_rows = done_rows + (SELECT n_rows FROM chunks WHERE job_id = ? AND idx = ?), "
+                        "error_rows = error_rows + ?, high_risk = high_risk + ?, medium_risk = medium_risk + ?, "
+                        "low_risk = low_risk + ?, score_sum = score_sum + ? WHERE id = ?",
+                        (job_id, idx, n_errors, counts.get('High-risk', 0), counts.get('Medium-risk', 0),
+                         counts.get('Low-risk', 0), score_sum, job_id))
+                    db.execute(
+                        "UPDATE jobs SET status = 'done', finished_at = ? "
+                        "WHERE id = ? AND status = 'running' AND done_chunks = n_chunks", (time.time(), job_id))
+                db.execute('COMMIT')
+            except BaseException:
+                db.execute('ROLLBACK')
+                raise
+
+    def fail_chunk(self, job_id, idx, error, retry=True):
+        """Requeue a chunk that raised, or fail the job after max_attempts (at once if not retry)"""
+        with self._connect() as db:
+            db.execute('BEGIN IMMEDIATE')
+            try:
+                row = db.execute('SELECT attempts FROM chunks WHERE job_id = ? AND idx = ?',
+                                 (job_id, idx)).fetchone()
+                if retry and row is not None and row['attempts'] < self.max_attempts:
+                    db.execute("UPDATE chunks SET status = 'queued', worker_pid = NULL "
+                               "WHERE job_id = ? AND idx = ? AND status = 'running'", (job_id, idx))
+                else:
+                    db.execute("UPDATE chunks SET status = 'failed' WHERE job_id = ? AND idx = ?", (job_id, idx))
+                    db.execute("UPDATE jobs SET status = 'failed', finished_at = ?, error = ? "
+                               "WHERE id = ? AND status IN ('queued', 'running')",
+                               (time.time(), f'Chunk {idx}: {error}', job_id))
+                db.execute('COMMIT')
+            except BaseException:
+                db.execute('ROLLBACK')
+                raise
+
+    def requeue_stale(self):
+        """Put chunks of dead workers (or past their lease) back in the queue; returns how many
+
+        A chunk that already took down (or outlived) max_attempts workers is
+        not requeued: it and its job are marked failed, so a row that crashes
+        the worker cannot loop forever.
+        """
+        now = time.time()
+        deadline = now - self.lease_seconds
+        with self._connect() as db:
+            db.execute('BEGIN IMMEDIATE')
+            try:
+                running = db.execute(
+                    "SELECT job_id, idx, worker_pid, claimed_at, attempts FROM chunks WHERE status = 'running'").fetchall()
+                stale = [r for r in running if r['claimed_at'] < deadline or not _pid_alive(r['worker_pid'])]
+                requeue = [(r['job_id'], r['idx']) for r in stale if r['attempts'] < self.max_attempts]
+                failed = [r for r in stale if r['attempts'] >= self.max_attempts]
+                db.executemany("UPDATE chunks SET status = 'queued', worker_pid = NULL "
+                               "WHERE job_id = ? AND idx = ? AND status = 'running'", requeue)
+                for r in failed:
+                    db.execute("UPDATE chunks SET status = 'failed', worker_pid = NULL WHERE job_id = ? AND idx = ?",
+                               (r['job_id'], r['idx']))
+                    db.execute("UPDATE jobs SET status = 'failed', finished_at = ?, error = ? "
+                               "WHERE id = ? AND status IN ('queued', 'running')",
+                               (now, f"Chunk {r['idx']}: worker died or timed out {r['attempts']} times", r['job_id']))
+                db.execute('COMMIT')
+            except BaseException:
+                db.execute('ROLLBACK')
+                raise
+        return len(requeue)
+
+    def cancel(self, job_id):
+        """Cancel a queued or running job; returns False when it is unknown or finished"""
+        with self._connect() as db:
+            db.execute('BEGIN IMMEDIATE')
+            try:
+                updated = db.execute(
+                    "UPDATE jobs SET status = 'cancelled', finished_at = ? "
+                    "WHERE id = ? AND status IN ('queued', 'running')", (time.time(), job_id)).rowcount
+                if updated:
+                    db.execute("UPDATE chunks SET status = 'cancelled', input = NULL "
+                               "WHERE job_id = ? AND status = 'queued'", (job_id,))
+                db.execute('COMMIT')
+            except BaseException:
+                db.execute('ROLLBACK')
+                raise
+        return bool(updated)
+
+    def get(self, job_id):
+        """Progress of a job as a dict, or None"""
+        with self._connect() as db:
+            row = db.execute('SELECT * FROM jobs WHERE id = ?', (job_id,)).fetchone()
+        return _job_dict(row) if row else None
+
+    def list(self, limit=50):
+        with self._connect() as db:
+            rows = db.execute('SELECT * FROM jobs ORDER BY created_at DESC LIMIT ?', (limit,)).fetchall()
+        return [_job_dict(row) for row in rows]
+
+    def results(self, job_id, after=0, max_chunks=20):
+        """(NDJSON texts, next chunk index) of consecutive finished chunks from `after`"""
+        with self._connect() as db:
+            rows = db.execute(
+                'SELECT idx, status, output FROM chunks WHERE job_id = ? AND idx >= ? ORDER BY idx LIMIT ?',
+                (job_id, after, max_chunks)).fetchall()
+        texts = []
+        next_idx = after
+        for row in rows:
+            if row['idx'] != next_idx or row['status'] != 'done':
+                break
+            texts.append(row['output'])
+            next_idx += 1
+        return texts, next_idx
+
+    def stats(self):
+        with self._connect() as db:
+            jobs = dict(db.execute('SELECT status, COUNT(*) FROM jobs GROUP BY status').fetchall())
+            chunks = dict(db.execute(
+                "SELECT status, COUNT(*) FROM chunks WHERE status IN ('queued', 'running') GROUP BY status").fetchall())
+        return {
+            'jobs': jobs,
+            'queued_chunks': chunks.get('queued', 0),
+            'running_chunks': chunks.get('running', 0),
+            'max_queued_jobs': self.max_queued,
+            'max_rows': self.max_rows,
+            'chunk_size': self.chunk_size
+        }
+
+    def purge_expired(self, retention_hours=JOB_RETENTION_HOURS):
+        """Delete finished jobs (and their results) older than the retention period"""
+        cutoff = time.time() - retention_hours * 3600
+        with self._connect() as db:
+            expired = [r[0] for r in db.execute(
+                "SELECT id FROM jobs WHERE status NOT IN ('queued', 'running') AND finished_at < ?",
+                (cutoff,)).fetchall()]
+            for job_id in expired:
+                db.execute('DELETE FROM chunks WHERE job_id = ?', (job_id,))
+                db.execute('DELETE FROM jobs WHERE id = ?', (job_id,))
+        return len(expired)
+
+
+def _job_dict(row):
+    job = dict(row)
+    total = job['total_rows']
+    scored = job['done_rows'] - job['error_rows']
+    job['progress'] = round(job['done_rows'] / total * 100, 1) if total else 0.0
+    job['summary'] = {
+        'high_risk': job.pop('high_risk'),
+        'medium_risk': job.pop('medium_risk'),
+        'low_risk': job.pop('low_risk'),
+        'average_risk_score': round(job.pop('score_sum') / scored, 3) if scored > 0 else 0
+    }
+    if job['started_at'] and job['status'] == 'running' and job['done_rows']:
+        rate = job['done_rows'] / max(time.time() - job['started_at'], 1e-9)
+        job['eta_seconds'] = round((total - job['done_rows']) / rate, 1)
+    return job
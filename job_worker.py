@@ -0,0 +1,156 @@
+"""
+Worker pool for asynchronous batch jobs (see job_store.py)
+
+Starts NEXORA_JOB_WORKERS processes. Each one loads the model and encoders
+once, then claims queued chunks from the job database, scores them with
+the same vectorized path as the bulk endpoint and stores the results. The
+parent requeues chunks of crashed workers and restarts them.
+
+API workers only accept and report on jobs, so a 200k-employee batch never
+holds a gunicorn worker (or hits its timeout).
+
+Usage: python job_worker.py --processes 2
+"""
+
+import argparse
+import json
+import multiprocessing as mp
+import os
+import signal
+import sys
+import time
+import warnings
+
+from job_store import JobStore, JOBS_DB_PATH
+
+JOB_WORKERS = int(os.environ.get('NEXORA_JOB_WORKERS', '2'))
+POLL_INTERVAL = 0.5
+REQUIRED_FIELDS = ['salary', 'performanceRating', 'department', 'jobTitle']
+
+
+def score_employees(employees, first_row, score, dept_encoder, job_encoder):
+    """(NDJSON text, error count, counts by category, score sum) for one chunk"""
+    import pandas as pd
+    from inference import BatchPolicy, score_frame
+
+    lines = []
+    counts = {'High-risk': 0, 'Medium-risk': 0, 'Low-risk': 0}
+    score_sum = 0.0
+    missing = [not isinstance(emp, dict) or any(f not in emp for f in REQUIRED_FIELDS) for emp in employees]
+    rows = [emp for emp, bad in zip(employees, missing) if not bad]
+    result = None
+    if rows:
+        df = pd.DataFrame(rows, columns=REQUIRED_FIELDS)
+        result = score_frame(df, score, dept_encoder, job_encoder, policy=BatchPolicy(n_jobs=1))
+        result = result.astype(object).where(result.notna(), None).to_dict('records')
+
+    n_errors = 0
+    scored = iter(result or ())
+    for offset, (emp, bad) in enumerate(zip(employees, missing)):
+        emp = emp if isinstance(emp, dict) else {}
+        row = {'row': first_row + offset,
+               'employee_id': emp.get('employee_id', 'Unknown'),
+               'employee_name': emp.get('employee_name', 'Unknown')}
+        scored_row = None if bad else next(scored)
+        error = 'Missing fields' if bad else scored_row['error']
+        if error:
+            n_errors += 1
+            lines.append(json.dumps({'type': 'error', **row, 'error': error}))
+            continue
+        counts[scored_row['risk_category']] += 1
+        score_sum += scored_row['risk_score']
+        lines.append(json.dumps({
+            'type': 'prediction', **row,
+            'risk_score': scored_row['risk_score'],
+            'risk_percentage': scored_row['risk_percentage'],
+            'risk_category': scored_row['risk_category']
+        }))
+    return '\n'.join(lines) + '\n', n_errors, counts, score_sum
+
+
+def process_chunk(store, claimed, engines, default_engine, dept_encoder, job_encoder):
+    """Score one claimed chunk and store its results, or fail it with the reason"""
+    job_id, idx, first_row, engine, employees = claimed
+    name = engine or default_engine
+    if name not in engines:
+        # Every worker builds the same engines, so retrying cannot help
+        error = f"Engine '{name}' not available in job workers. Available: {list(engines)}"
+        print(f"❌ Job {job_id} chunk {idx} failed: {error}", flush=True)
+        store.fail_chunk(job_id, idx, error, retry=False)
+        return
+    try:
+        output, n_errors, counts, score_sum = score_employees(
+            employees, first_row, engines[name], dept_encoder, job_encoder)
+        store.complete_chunk(job_id, idx, output, n_errors, counts, score_sum)
+    except Exception as e:
+        print(f"❌ Job {job_id} chunk {idx} failed: {e}", flush=True)
+        store.fail_chunk(job_id, idx, str(e))
+
+
+def _worker_main(db_path):
+    """One worker process: load the model once, then score chunks until stopped"""
+    import joblib
+    from inference import load_model, build_engines, compiled_wanted
+
+    warnings.filterwarnings('ignore')
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    store = JobStore(db_path)
+    default_engine = os.environ.get('NEXORA_ENGINE', 'sklearn')
+    engines = build_engines(load_model(), compiled=compiled_wanted(default_engine))
+    dept_encoder = joblib.load('department_encoder.pkl')
+    job_encoder = joblib.load('job_encoder.pkl')
+    pid = os.getpid()
+    print(f"✅ Job worker {pid} ready ({', '.join(engines)})", flush=True)
+
+    while True:
+        claimed = store.claim_chunk(pid)
+        if claimed is None:
+            time.sleep(POLL_INTERVAL)
+            continue
+        process_chunk(store, claimed, engines, default_engine, dept_encoder, job_encoder)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Worker pool for asynchronous batch jobs')
+    parser.add_argument('--processes', type=int, default=JOB_WORKERS)
+    parser.add_argument('--db', default=JOBS_DB_PATH)
+    args = parser.parse_args()
+
+    store = JobStore(args.db)
+    requeued = store.requeue_stale()
+    print(f"🚀 Starting {args.processes} job workers on {args.db}"
+          + (f" ({requeued} interrupted chunks requeued)" if requeued else ''), flush=True)
+
+    def request_shutdown(signum, frame):
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, request_shutdown)
+
+    ctx = mp.get_context('spawn')
+    workers = []
+    try:
+        while True:
+            alive = [p for p in workers if p.is_alive()]
+            for p in workers:
+                if p not in alive:
+                    print(f"⚠️ Job worker {p.pid} exited with code {p.exitcode}, restarting", flush=True)
+            while len(alive) < args.processes:
+                p = ctx.Process(target=_worker_main, args=(args.db,), daemon=True)
+                p.start()
+                alive.append(p)
+            workers = alive
+            # Chunks of a worker that just died go back to the queue
+            store.requeue_stale()
+            time.sleep(5)
+    except KeyboardInterrupt:
+        print("🛑 Stopping job workers", flush=True)
+    finally:
+        for p in workers:
+            p.terminate()
+        for p in workers:
+            p.join(timeout=10)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
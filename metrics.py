@@ -0,0 +1,109 @@
+"""
+Lightweight in-process metrics for the Nexora API
+"""
+
+import bisect
+import threading
+
+LATENCY_MS_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 4096, 16384, 65536)
+
+
+class Histogram:
+    """Fixed-bucket histogram; percentiles are reported as bucket upper bounds"""
+
+    def __init__(self, buckets=LATENCY_MS_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._count = 0
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[i] += 1
+            self._count += 1
+            self._sum += value
+
+    def _percentile(self, counts, total, q):
+        target = q * total
+        running = 0
+        for bound, n in zip(self.buckets + (float('inf'),), counts):
+            running += n
+            if running >= target:
+                return bound
+        return float('inf')
+
+    def snapshot(self):
+        with self._lock:
+            counts = list(self._counts)
+            total = self._count
+            value_sum = self._sum
+
+        cumulative = []
+        running = 0
+        for n in counts:
+            running += n
+            cumulative.append(running)
+        buckets = {str(b): c for b, c in zip(self.buckets, cumulative)}
+        buckets['+Inf'] = total
+
+        return {
+            'count': total,
+            'sum': round(value_sum, 3),
+            'mean': round(value_sum / total, 3) if total else 0,
+            'p50': self._percentile(counts, total, 0.50) if total else 0,
+            'p95': self._percentile(counts, total, 0.95) if total else 0,
+            'p99': self._percentile(counts, total, 0.99) if total else 0,
+            'buckets': buckets
+        }
+
+
+def process_memory_kb():
+    """RSS, PSS and private memory of this process in kB.
+
+    PSS splits pages shared with other processes (e.g. a preloaded model
+    inherited from the gunicorn master) between them. Linux only; other
+    platforms report an empty dict.
+    """
+    fields = {}
+    try:
+        with open('/proc/self/smaps_rollup') as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) >= 2 and parts[0].endswith(':') and parts[1].isdigit():
+                    fields[parts[0][:-1]] = int(parts[1])
+    except OSError:
+        return {}
+    return {
+        'rss_kb': fields.get('Rss', 0),
+        'pss_kb': fields.get('Pss', 0),
+        'shared_kb': fields.get('Shared_Clean', 0) + fields.get('Shared_Dirty', 0),
+        'private_kb': fields.get('Private_Clean', 0) + fields.get('Private_Dirty', 0)
+    }
+
+
+class StageTimings:
+    """Latency histograms (ms) per endpoint and request stage"""
+
+    def __init__(self, buckets=LATENCY_MS_BUCKETS):
+        self.buckets = buckets
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def observe(self, endpoint, stage, value):
+        key = (endpoint, stage)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(key, Histogram(self.buckets))
+        histogram.observe(value)
+
+    def snapshot(self):
+        with self._lock:
+            items = list(self._histograms.items())
+        result = {}
+        for (endpoint, stage), histogram in sorted(items):
+            result.setdefault(endpoint, {})[stage] = histogram.snapshot()
+        return result
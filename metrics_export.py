@@ -0,0 +1,258 @@
+"""
+Prometheus text-format metrics for the Nexora API, aggregated across workers
+
+Every process keeps its counters, histograms and gauges in memory and a
+background thread mirrors them to <NEXORA_METRICS_DIR>/<pid>.json every
+FLUSH_INTERVAL seconds while they change (and right before answering a
+scrape). /metrics merges the files of all workers, so the numbers do not
+depend on which gunicorn worker answers:
+
+- counters and histograms are summed; files of exited workers are kept,
+  so counters never go backwards
+- gauges (e.g. RSS) are reported per live process with a pid label
+
+gunicorn.conf.py points NEXORA_METRICS_DIR (or PROMETHEUS_MULTIPROC_DIR)
+at a fresh directory when the master starts; without it every process
+only reports itself.
+"""
+
+import glob
+import json
+import os
+import threading
+import time
+
+METRICS_ENABLED = os.environ.get('NEXORA_METRICS', '1') != '0'
+FLUSH_INTERVAL = 1.0
+
+SECONDS_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+ROWS_BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 50000, 100000)
+
+INF_LABEL = 'le="+Inf"'
+
+# name -> (type, help, label names, buckets)
+METRICS = {
+    'nexora_http_requests_total': (
+        'counter', 'HTTP requests by endpoint, method and status', ('endpoint', 'method', 'status'), None),
+    'nexora_http_request_duration_seconds': (
+        'histogram', 'Request latency by endpoint', ('endpoint',), SECONDS_BUCKETS),
+    'nexora_batch_size_rows': (
+        'histogram', 'Employees per batch, stream chunk or bulk request', ('endpoint',), ROWS_BUCKETS),
+    'nexora_inference_duration_seconds': (
+        'histogram', 'Model inference time per request', ('endpoint', 'engine'), SECONDS_BUCKETS),
+    'nexora_prediction_errors_total': (
+        'counter', 'Rejected employees by cause', ('cause',), None),
+    'nexora_admission_total': (
+        'counter', 'Prediction requests admitted or shed, by priority and outcome', ('priority', 'outcome'), None),
+    'nexora_process_resident_memory_bytes': (
+        'gauge', 'Resident set size per worker process', ('pid',), None),
+}
+
+
+def metrics_dir():
+    return os.environ.get('NEXORA_METRICS_DIR') or os.environ.get('PROMETHEUS_MULTIPROC_DIR') or ''
+
+
+def error_cause(message):
+    """Label value for an error message returned to a client"""
+    message = str(message)
+    if message.startswith('Missing'):
+        return 'missing_fields'
+    if message.startswith('Invalid department'):
+        return 'invalid_department'
+    if message.startswith('Invalid job title'):
+        return 'invalid_job_title'
+    if message.startswith('Invalid JSON'):
+        return 'invalid_json'
+    if message.startswith('Unknown employee_id'):
+        return 'unknown_employee'
+    if 'numeric' in message or 'could not convert' in message or 'float()' in message:
+        return 'invalid_number'
+    return 'other'
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _read_rss_bytes():
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class MetricsRegistry:
+    """Per-process metric values, flushed to a shared directory for /metrics"""
+
+    def __init__(self, directory=None):
+        self._directory = directory
+        self._lock = threading.Lock()
+        self._reset()
+
+    @property
+    def directory(self):
+        # Resolved on use: gunicorn.conf.py sets the variable after importing this module
+        return metrics_dir() if self._directory is None else self._directory
+
+    def _reset(self):
+        self._pid = os.getpid()
+        self._counters = {}
+        self._histograms = {}
+        self._dirty = False
+        self._flusher = None
+
+    def _check_fork(self):
+        # Values inherited from a preloading master belong to the master,
+        # and its flusher thread did not survive the fork
+        if self._pid != os.getpid():
+            self._reset()
+        self._dirty = True
+        if self._flusher is None and self.directory:
+            self._flusher = threading.Thread(target=self._flush_loop, name='nexora-metrics', daemon=True)
+            self._flusher.start()
+
+    def _flush_loop(self):
+        while True:
+            time.sleep(FLUSH_INTERVAL)
+            if self._pid != os.getpid():
+                return
+            if self._dirty:
+                self.flush()
+
+    def inc(self, name, labels, value=1):
+        key = (name, tuple(labels))
+        with self._lock:
+            self._check_fork()
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, labels, value):
+        buckets = METRICS[name][3]
+        key = (name, tuple(labels))
+        with self._lock:
+            self._check_fork()
+            entry = self._histograms.get(key)
+            if entry is None:
+                entry = self._histograms[key] = [[0] * len(buckets), 0.0, 0]
+            for i, bound in enumerate(buckets):
+                if value <= bound:
+                    entry[0][i] += 1
+                    break
+            entry[1] += value
+            entry[2] += 1
+
+    def _state(self):
+        with self._lock:
+            if self._pid != os.getpid():
+                self._reset()
+            self._dirty = False
+            return {
+                'pid': self._pid,
+                'counters': [[name, list(labels), value] for (name, labels), value in self._counters.items()],
+                'histograms': [[name, list(labels), list(counts), total, count]
+                               for (name, labels), (counts, total, count) in self._histograms.items()],
+                'gauges': [['nexora_process_resident_memory_bytes', [str(self._pid)], _read_rss_bytes()]]
+            }
+
+    def flush(self):
+        """Write this process's values to the shared directory"""
+        if not self.directory:
+            return
+        state = self._state()
+        path = os.path.join(self.directory, f"{state['pid']}.json")
+        tmp = f'{path}.{threading.get_ident()}.tmp'
+        try:
+            with open(tmp, 'w') as f:
+                json.dump(state, f)
+            os.replace(tmp, path)
+        except OSError:
+            pass
+
+    def _collect_states(self):
+        if not self.directory:
+            return [self._state()]
+        self.flush()
+        states = []
+        for path in glob.glob(os.path.join(self.directory, '*.json')):
+            try:
+                with open(path) as f:
+                    states.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+        return states
+
+    def collect(self):
+        """Merged {name: {labels: value}} over every process"""
+        counters, histograms, gauges = {}, {}, {}
+        for state in self._collect_states():
+            for name, labels, value in state['counters']:
+                key = (name, tuple(labels))
+                counters[key] = counters.get(key, 0) + value
+            for name, labels, counts, total, count in state['histograms']:
+                key = (name, tuple(labels))
+                merged = histograms.setdefault(key, [[0] * len(counts), 0.0, 0])
+                merged[0] = [a + b for a, b in zip(merged[0], counts)]
+                merged[1] += total
+                merged[2] += count
+            if _pid_alive(state['pid']):
+                for name, labels, value in state['gauges']:
+                    if value is not None:
+                        gauges[(name, tuple(labels))] = value
+        return counters, histograms, gauges
+
+    def render(self):
+        """Prometheus text exposition format (version 0.0.4)"""
+        counters, histograms, gauges = self.collect()
+        lines = []
+        for name, (kind, help_text, label_names, buckets) in METRICS.items():
+            values = {'counter': counters, 'histogram': histograms, 'gauge': gauges}[kind]
+            series = sorted((labels, value) for (n, labels), value in values.items() if n == name)
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+            for labels, value in series:
+                pairs = [f'{k}="{_escape(v)}"' for k, v in zip(label_names, labels)]
+                if kind != 'histogram':
+                    lines.append(f"{name}{_labels(pairs)} {_number(value)}")
+                    continue
+                counts, total, count = value
+                running = 0
+                for bound, n in zip(buckets, counts):
+                    running += n
+                    le = 'le="%s"' % _number(bound)
+                    lines.append(f"{name}_bucket{_labels(pairs + [le])} {running}")
+                lines.append(f"{name}_bucket{_labels(pairs + [INF_LABEL])} {count}")
+                lines.append(f"{name}_sum{_labels(pairs)} {_number(total)}")
+                lines.append(f"{name}_count{_labels(pairs)} {count}")
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(pairs):
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def reset_directory(directory):
+    """Create the shared directory and drop files from a previous run"""
+    os.makedirs(directory, exist_ok=True)
+    for path in glob.glob(os.path.join(directory, '*.json')):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+registry = MetricsRegistry()
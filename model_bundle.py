@@ -0,0 +1,186 @@
+"""
+Single-file, memory-mappable model bundle for the Nexora attrition API
+
+One file replaces nexora_attrition_model.pkl, department_encoder.pkl,
+job_encoder.pkl, model_config.json and risk_lookup_index.npz at serving
+time. The tree arrays (and the lookup index) are stored as raw, 64-byte
+aligned NumPy buffers behind a JSON header, so every worker maps the same
+file pages from the OS page cache instead of unpickling a private copy.
+
+Layout: b'NXBUNDLE' | uint64 header length | JSON header | aligned arrays
+
+Build from the current artifacts:  python model_bundle.py
+"""
+
+import json
+import os
+import struct
+
+import numpy as np
+
+from forest_engine import ArrayForest
+from risk_index import RiskLookupIndex, INDEX_PATH, file_sha256
+
+MAGIC = b'NXBUNDLE'
+BUNDLE_VERSION = 1
+BUNDLE_PATH = 'nexora_model.bundle'
+ALIGNMENT = 64
+
+FOREST_ARRAYS = ('feature', 'threshold', 'left', 'right', 'value', 'roots')
+INDEX_ARRAYS = ('keys', 'offsets', 'thresholds', 'risks')
+
+
+class BundleEncoder:
+    """Drop-in for a fitted LabelEncoder's classes_/transform"""
+
+    def __init__(self, classes):
+        self.classes_ = np.array(classes, dtype=object)
+        self._codes = {c: i for i, c in enumerate(classes)}
+
+    def transform(self, values):
+        try:
+            return np.array([self._codes[v] for v in values], dtype=np.int64)
+        except (KeyError, TypeError) as e:
+            raise ValueError(f'y contains previously unseen labels: {e}')
+
+
+class ModelBundle:
+    """Everything the API needs to score, loaded from one bundle file"""
+
+    def __init__(self, header, forest, dept_encoder, job_encoder, risk_index=None):
+        self.header = header
+        self.forest = forest
+        self.dept_encoder = dept_encoder
+        self.job_encoder = job_encoder
+        self.risk_index = risk_index
+
+    @property
+    def config(self):
+        return self.header['config']
+
+    @property
+    def model_sha256(self):
+        return self.header['model_sha256']
+
+
+def _align(n):
+    return (n + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def write_bundle(model, dept_encoder, job_encoder, config, path=BUNDLE_PATH,
+                 model_sha256=None, risk_index=None):
+    """Write a bundle; tree arrays come from ArrayForest.from_model(model)"""
+    forest = ArrayForest.from_model(model)
+    arrays = {name: getattr(forest, name) for name in FOREST_ARRAYS}
+
+    if risk_index is not None:
+        keys = sorted(risk_index.table)
+        arrays['keys'] = np.array(keys, dtype=np.int64)
+        arrays['offsets'] = np.cumsum([0] + [len(risk_index.table[k][0]) for k in keys])
+        arrays['thresholds'] = np.concatenate([risk_index.table[k][0] for k in keys])
+        arrays['risks'] = np.concatenate([risk_index.table[k][1] for k in keys])
+
+    header = {
+        'bundle_version': BUNDLE_VERSION,
+        'model_sha256': model_sha256,
+        'config': config,
+        'departments': [str(c) for c in dept_encoder.classes_],
+        'job_titles': [str(c) for c in job_encoder.classes_],
+        'max_depth': int(forest.max_depth),
+        'has_risk_index': risk_index is not None,
+        'arrays': {}
+    }
+
+    # Offsets are relative to the aligned start of the data section
+    offset = 0
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array)
+        arrays[name] = array
+        header['arrays'][name] = {'dtype': array.dtype.str, 'shape': list(array.shape), 'offset': offset}
+        offset = _align(offset + array.nbytes)
+
+    header_bytes = json.dumps(header).encode('utf-8')
+    data_start = _align(len(MAGIC) + 8 + len(header_bytes))
+
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack('<Q', len(header_bytes)))
+        f.write(header_bytes)
+        for name, array in arrays.items():
+            f.seek(data_start + header['arrays'][name]['offset'])
+            f.write(array.tobytes())
+    os.replace(tmp, path)
+    return header
+
+
+def load_bundle(path=BUNDLE_PATH, mmap=True):
+    """Open a bundle; with mmap=True the arrays are read-only views of the mapped file"""
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f'{path} is not a Nexora model bundle')
+        (header_len,) = struct.unpack('<Q', f.read(8))
+        header = json.loads(f.read(header_len).decode('utf-8'))
+    if header['bundle_version'] != BUNDLE_VERSION:
+        raise ValueError(f"Unsupported bundle version {header['bundle_version']} (expected {BUNDLE_VERSION})")
+
+    data_start = _align(len(MAGIC) + 8 + header_len)
+    if mmap:
+        buffer = np.memmap(path, dtype=np.uint8, mode='r')
+    else:
+        buffer = np.fromfile(path, dtype=np.uint8)
+
+    arrays = {}
+    for name, spec in header['arrays'].items():
+        dtype = np.dtype(spec['dtype'])
+        count = int(np.prod(spec['shape'])) if spec['shape'] else 1
+        arrays[name] = np.frombuffer(buffer, dtype=dtype, count=count,
+                                     offset=data_start + spec['offset']).reshape(spec['shape'])
+
+    forest = ArrayForest(*(arrays[name] for name in FOREST_ARRAYS[:-1]),
+                         roots=arrays['roots'], max_depth=header['max_depth'])
+    risk_index = None
+    if header['has_risk_index']:
+        risk_index = RiskLookupIndex.from_arrays(
+            *(arrays[name] for name in INDEX_ARRAYS), model_sha256=header['model_sha256'])
+
+    return ModelBundle(
+        header,
+        forest,
+        BundleEncoder(header['departments']),
+        BundleEncoder(header['job_titles']),
+        risk_index
+    )
+
+
+def build_bundle(model_path='nexora_attrition_model.pkl', dept_encoder_path='department_encoder.pkl',
+                 job_encoder_path='job_encoder.pkl', config_path='model_config.json',
+                 index_path=INDEX_PATH, path=BUNDLE_PATH):
+    """Write the bundle from the pickled artifacts on disk"""
+    import joblib
+    model_sha256 = file_sha256(model_path)
+    with open(config_path, 'r') as f:
+        config = json.load(f)
+
+    risk_index = None
+    if os.path.exists(index_path):
+        risk_index = RiskLookupIndex.load(index_path)
+        if risk_index.model_sha256 != model_sha256:
+            risk_index = None
+
+    return write_bundle(
+        joblib.load(model_path),
+        joblib.load(dept_encoder_path),
+        joblib.load(job_encoder_path),
+        config,
+        path=path,
+        model_sha256=model_sha256,
+        risk_index=risk_index
+    )
+
+
+if __name__ == '__main__':
+    header = build_bundle()
+    size = os.path.getsize(BUNDLE_PATH)
+    print(f"✅ Bundle saved: {BUNDLE_PATH} ({size / 1024:.0f} KB, version {header['bundle_version']})")
+    print(f"✅ Risk index included: {header['has_risk_index']}")
@@ -0,0 +1,123 @@
+"""
+Bounded LRU cache of attrition risk scores
+
+Keys are the normalized model inputs (salary, performanceRating, department,
+jobTitle) plus the engine name; values are risk probabilities, so cached
+responses are built exactly like fresh ones. The cache clears itself when
+the content hash of the model artifacts changes.
+"""
+
+from collections import OrderedDict
+import hashlib
+import os
+import threading
+import time
+
+from risk_index import file_sha256
+
+CACHE_SIZE = int(os.environ.get('NEXORA_CACHE_SIZE', '10000'))
+ARTIFACT_PATHS = ('nexora_attrition_model.pkl', 'department_encoder.pkl', 'job_encoder.pkl')
+# How often (seconds) the artifact files are stat()ed for changes
+ARTIFACT_CHECK_INTERVAL = 1.0
+
+
+def artifacts_sha256(paths=ARTIFACT_PATHS):
+    """Combined content hash of the model pickles"""
+    return hashlib.sha256(':'.join(file_sha256(p) for p in paths).encode()).hexdigest()
+
+
+def cache_key(salary, performance_rating, department, job_title, engine):
+    """Normalize inputs so 5000, 5000.0 and '5000' share one entry"""
+    return (float(salary), float(performance_rating), department, job_title, engine)
+
+
+class PredictionCache:
+    """Thread-safe LRU with hit/miss/eviction counters"""
+
+    def __init__(self, capacity=CACHE_SIZE, artifact_paths=ARTIFACT_PATHS):
+        self.capacity = capacity
+        self.artifact_paths = artifact_paths
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+        self._next_check = 0.0
+        self._stat_signature = self._artifact_signature()
+        self.artifact_hash = artifacts_sha256(artifact_paths)
+
+    @property
+    def enabled(self):
+        return self.capacity > 0
+
+    def _artifact_signature(self):
+        try:
+            return tuple((os.stat(p).st_mtime_ns, os.stat(p).st_size) for p in self.artifact_paths)
+        except OSError:
+            return None
+
+    def _check_artifacts(self):
+        """Clear the cache if the pickles on disk changed content"""
+        now = time.monotonic()
+        if now < self._next_check:
+            return
+        self._next_check = now + ARTIFACT_CHECK_INTERVAL
+
+        signature = self._artifact_signature()
+        if signature == self._stat_signature:
+            return
+        self._stat_signature = signature
+        try:
+            new_hash = artifacts_sha256(self.artifact_paths)
+        except OSError:
+            return
+        if new_hash != self.artifact_hash:
+            with self._lock:
+                self._entries.clear()
+                self.artifact_hash = new_hash
+                self.invalidations += 1
+
+    def get(self, key):
+        """Cached risk for key, or None"""
+        if not self.enabled:
+            return None
+        self._check_artifacts()
+        with self._lock:
+            risk = self._entries.get(key)
+            if risk is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return risk
+
+    def put(self, key, risk):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[key] = risk
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'enabled': self.enabled,
+                'capacity': self.capacity,
+                'size': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0,
+                'artifact_hash': self.artifact_hash[:16]
+            }
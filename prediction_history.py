@@ -0,0 +1,267 @@
+"""
+Append-only history of predictions in SQLite (NEXORA_HISTORY=1)
+
+Requests only put finished predictions on a bounded queue; a background
+writer thread per worker inserts them in batches of up to
+HISTORY_BATCH_ROWS rows per transaction, so request latency does not
+depend on the database. When the queue is full predictions are dropped
+from the history (and counted) rather than blocking. A batch that fails
+to write is logged, counted in write_errors and dropped; the writer keeps
+running.
+
+Rows are indexed by (employee_id, ts), (department, ts),
+(risk_category, ts) and ts. The writer also keeps a daily rollup per
+department, so department time series read one row per department and day
+no matter how many predictions the history holds, and an employee's
+trajectory is an index range scan capped at HISTORY_MAX_POINTS.
+"""
+
+import atexit
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from datetime import datetime, timezone
+
+logger = logging.getLogger(__name__)
+
+HISTORY_ENABLED = os.environ.get('NEXORA_HISTORY', '0') == '1'
+HISTORY_DB_PATH = os.environ.get('NEXORA_HISTORY_DB', os.path.join('history', 'predictions.db'))
+HISTORY_QUEUE_SIZE = int(os.environ.get('NEXORA_HISTORY_QUEUE', '100000'))
+HISTORY_BATCH_ROWS = 5000
+HISTORY_MAX_POINTS = 1000
+# Longest department time series range (days) served at once
+HISTORY_MAX_DAYS = 3660
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS predictions (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    employee_id TEXT,
+    department TEXT NOT NULL,
+    job_title TEXT NOT NULL,
+    salary REAL,
+    performance_rating REAL,
+    risk_score REAL NOT NULL,
+    risk_category TEXT NOT NULL,
+    engine TEXT,
+    source TEXT
+);
+CREATE INDEX IF NOT EXISTS predictions_employee ON predictions (employee_id, ts);
+CREATE INDEX IF NOT EXISTS predictions_department ON predictions (department, ts);
+CREATE INDEX IF NOT EXISTS predictions_category ON predictions (risk_category, ts);
+CREATE INDEX IF NOT EXISTS predictions_ts ON predictions (ts);
+
+CREATE TABLE IF NOT EXISTS department_daily (
+    department TEXT NOT NULL,
+    day TEXT NOT NULL,
+    n INTEGER NOT NULL,
+    score_sum REAL NOT NULL,
+    high_risk INTEGER NOT NULL,
+    medium_risk INTEGER NOT NULL,
+    low_risk INTEGER NOT NULL,
+    PRIMARY KEY (department, day)
+) WITHOUT ROWID;
+"""
+
+# Period label of a YYYY-MM-DD day for each series interval
+INTERVALS = {
+    'day': 'day',
+    'week': "date(day, '-6 days', 'weekday 1')",
+    'month': 'substr(day, 1, 7)',
+}
+
+
+def utc_day(ts):
+    return datetime.fromtimestamp(ts, timezone.utc).strftime('%Y-%m-%d')
+
+
+def parse_time(value, default=None):
+    """Epoch seconds from epoch seconds or an ISO date / datetime string (UTC if naive)"""
+    if value is None or value == '':
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        raise ValueError(f'Invalid time: {value} (use epoch seconds or ISO 8601)')
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+class PredictionHistory:
+    """Queued, batched writes and indexed queries over the prediction history"""
+
+    def __init__(self, path=HISTORY_DB_PATH, enabled=HISTORY_ENABLED, queue_size=HISTORY_QUEUE_SIZE):
+        self.path = path
+        self.enabled = enabled
+        self.queue_size = queue_size
+
+        self._lock = threading.Lock()
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._thread = None
+        self._pid = None
+        self._schema_ready = False
+
+        self.queued = 0
+        self.written = 0
+        self.dropped = 0
+        self.write_errors = 0
+        if enabled:
+            atexit.register(self.flush)
+
+    def _connect(self):
+        # One short-lived connection per call: safe across threads and forks
+        if not self._schema_ready:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+        db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        db.row_factory = sqlite3.Row
+        db.execute('PRAGMA journal_mode=WAL')
+        db.execute('PRAGMA synchronous=NORMAL')
+        if not self._schema_ready:
+            db.executescript(SCHEMA)
+            self._schema_ready = True
+        return closing(db)
+
+    def _ensure_writer(self):
+        # Threads do not survive fork, so (re)start per process
+        with self._lock:
+            if self._thread is None or self._pid != os.getpid() or not self._thread.is_alive():
+                self._queue = queue.Queue(maxsize=self.queue_size)
+                self._pid = os.getpid()
+                self._thread = threading.Thread(target=self._run, name='nexora-history', daemon=True)
+                self._thread.start()
+
+    def record(self, rows):
+        """Queue (employee_id, department, job_title, salary, performance_rating,
+        risk_score, risk_category, engine, source) tuples; never blocks"""
+        if not self.enabled or not rows:
+            return
+        self._ensure_writer()
+        ts = time.time()
+        queued = dropped = 0
+        for row in rows:
+            try:
+                self._queue.put_nowait((ts, *row))
+                queued += 1
+            except queue.Full:
+                dropped += 1
+        with self._lock:
+            self.queued += queued
+            self.dropped += dropped
+
+    def _run(self):
+        while True:
+            rows = [self._queue.get()]
+            # Drain whatever else is waiting so one transaction covers it
+            while len(rows) < HISTORY_BATCH_ROWS:
+                try:
+                    rows.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._write(rows)
+                with self._lock:
+                    self.written += len(rows)
+            except Exception as e:
+                # Any exception would end the thread and strand the queue
+                logger.error(f"❌ Prediction history write failed, {len(rows)} rows dropped: {e}")
+                with self._lock:
+                    self.write_errors += 1
+            finally:
+                for _ in rows:
+                    self._queue.task_done()
+
+    def _write(self, rows):
+        daily = {}
+        for row in rows:
+            key = (row[2], utc_day(row[0]))
+            n, score_sum, high, medium, low = daily.get(key, (0, 0.0, 0, 0, 0))
+            daily[key] = (n + 1, score_sum + row[6],
+                          high + (row[7] == 'High-risk'), medium + (row[7] == 'Medium-risk'),
+                          low + (row[7] == 'Low-risk'))
+        with self._connect() as db:
+            db.execute('BEGIN IMMEDIATE')
+            try:
+                db.executemany(
+                    'INSERT INTO predictions (ts, employee_id, department, job_title, salary, performance_rating, '
+                    'risk_score, risk_category, engine, source) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', rows)
+                db.executemany(
+                    'INSERT INTO department_daily (department, day, n, score_sum, high_risk, medium_risk, low_risk) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT (department, day) DO UPDATE SET '
+                    'n = n + excluded.n, score_sum = score_sum + excluded.score_sum, '
+                    'high_risk = high_risk + excluded.high_risk, medium_risk = medium_risk + excluded.medium_risk, '
+                    'low_risk = low_risk + excluded.low_risk',
+                    [(department, day, *totals) for (department, day), totals in daily.items()])
+                db.execute('COMMIT')
+            except BaseException:
+                db.execute('ROLLBACK')
+                raise
+
+    def flush(self, timeout=5.0):
+        """Wait until queued predictions are written (for tests and shutdown)"""
+        if self._pid != os.getpid():
+            return
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def employee_trajectory(self, employee_id, since=None, until=None, limit=HISTORY_MAX_POINTS):
+        """Predictions of one employee in time order; (points, truncated)
+
+        Reads the newest `limit` points in range, so the cost is bounded by
+        the limit and not by the size of the history.
+        """
+        limit = max(1, min(limit, HISTORY_MAX_POINTS))
+        with self._connect() as db:
+            rows = db.execute(
+                'SELECT ts, department, job_title, salary, performance_rating, risk_score, risk_category, '
+                'engine, source FROM predictions WHERE employee_id = ? AND ts >= ? AND ts <= ? '
+                'ORDER BY ts DESC LIMIT ?',
+                (employee_id, since or 0.0, until or time.time(), limit + 1)).fetchall()
+        truncated = len(rows) > limit
+        points = [dict(row) for row in reversed(rows[:limit])]
+        return points, truncated
+
+    def department_series(self, department, since, until, interval='day'):
+        """Predictions, average score and category counts per period from the daily rollup"""
+        if interval not in INTERVALS:
+            raise ValueError(f"Invalid interval: {interval} (use {', '.join(INTERVALS)})")
+        if until - since > HISTORY_MAX_DAYS * 86400:
+            raise ValueError(f'Range too long: at most {HISTORY_MAX_DAYS} days')
+        with self._connect() as db:
+            rows = db.execute(
+                f'SELECT {INTERVALS[interval]} AS period, SUM(n) AS n, SUM(score_sum) AS score_sum, '
+                'SUM(high_risk) AS high_risk, SUM(medium_risk) AS medium_risk, SUM(low_risk) AS low_risk '
+                'FROM department_daily WHERE department = ? AND day >= ? AND day <= ? '
+                'GROUP BY period ORDER BY period',
+                (department, utc_day(since), utc_day(until))).fetchall()
+        return [{
+            'period': row['period'],
+            'predictions': row['n'],
+            'average_risk_score': round(row['score_sum'] / row['n'], 4),
+            'high_risk': row['high_risk'],
+            'medium_risk': row['medium_risk'],
+            'low_risk': row['low_risk']
+        } for row in rows]
+
+    def stats(self):
+        with self._lock:
+            return {
+                'enabled': self.enabled,
+                'path': self.path,
+                'queued': self.queued,
+                'written': self.written,
+                'dropped_queue_full': self.dropped,
+                'write_errors': self.write_errors,
+                'queue_depth': self._queue.qsize()
+            }
@@ -0,0 +1,161 @@
+"""
+Replay captured prediction requests against any Nexora API instance
+
+Reads the JSONL log written by request_capture.py (the current file plus
+its rotated backups, oldest first) and re-sends every request with its
+original body, content type and query string. Requests go out on the
+captured schedule, compressed or stretched by --speed (2 = twice as fast,
+0 = as fast as --senders allows), independent of how fast the target
+answers, so production load shapes can be reproduced locally.
+
+Reports latency percentiles and status codes per endpoint; --output saves
+them as JSON in the same shape for comparing engines or model versions.
+
+Usage: python replay.py --url http://localhost:5000
+       python replay.py captures/requests.jsonl --speed 4 --engine compiled --output replay.json
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qsl
+
+import requests
+
+from bench_load import latency_stats, REQUEST_TIMEOUT
+from request_capture import CAPTURE_PATH, entry_body, rotated_paths
+
+
+def load_entries(paths, limit=None):
+    """Captured entries from all files, ordered by arrival time"""
+    entries = []
+    for path in paths:
+        with open(path) as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    continue
+    entries.sort(key=lambda e: e['ts'])
+    return entries[:limit] if limit else entries
+
+
+def replay(url, entries, speed, senders, engine=None):
+    """Send every entry on its (scaled) schedule; one record per request"""
+    local = threading.local()
+    records = []
+    records_lock = threading.Lock()
+
+    def send(scheduled, entry):
+        session = getattr(local, 'session', None)
+        if session is None:
+            session = local.session = requests.Session()
+        params = dict(parse_qsl(entry.get('query') or ''))
+        if engine:
+            params['engine'] = engine
+        headers = {'Content-Type': entry['content_type']} if entry.get('content_type') else {}
+        sent = time.perf_counter()
+        try:
+            response = session.request(entry.get('method', 'POST'), url + entry['path'], params=params,
+                                       data=entry_body(entry), headers=headers, timeout=REQUEST_TIMEOUT)
+            # Streaming responses only count once fully read
+            response.content
+            status = response.status_code
+        except requests.RequestException:
+            status = 0
+        done = time.perf_counter()
+        with records_lock:
+            records.append((entry['path'], status, (done - (scheduled or sent)) * 1000))
+
+    first_ts = entries[0]['ts']
+    max_lag = 0.0
+    with ThreadPoolExecutor(max_workers=senders) as pool:
+        start = time.perf_counter()
+        for entry in entries:
+            scheduled = None
+            if speed > 0:
+                scheduled = start + (entry['ts'] - first_ts) / speed
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    max_lag = max(max_lag, -delay)
+            pool.submit(send, scheduled, entry)
+    elapsed = time.perf_counter() - start
+    return records, elapsed, max_lag
+
+
+def summarize(records, entries, elapsed, max_lag, speed):
+    captured_span = entries[-1]['ts'] - entries[0]['ts']
+    result = {
+        'requests': len(records),
+        'speed': speed,
+        'captured_span_s': round(captured_span, 2),
+        'elapsed_s': round(elapsed, 2),
+        'achieved_rps': round(len(records) / elapsed, 2) if elapsed > 0 else 0.0,
+        'dispatch_lag_max_ms': round(max_lag * 1000, 2),
+        'endpoints': {}
+    }
+    for path in sorted({r[0] for r in records}):
+        rows = [r for r in records if r[0] == path]
+        statuses = {}
+        for r in rows:
+            statuses[str(r[1])] = statuses.get(str(r[1]), 0) + 1
+        result['endpoints'][path] = {
+            'requests': len(rows),
+            'status_codes': statuses,
+            **latency_stats([r[2] for r in rows if r[1] != 0])
+        }
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('paths', nargs='*', help=f'Capture files (default: {CAPTURE_PATH} and its rotations)')
+    parser.add_argument('--url', default='http://localhost:5000')
+    parser.add_argument('--speed', type=float, default=1.0,
+                        help='Replay speed factor (1 = original timing, 0 = as fast as possible)')
+    parser.add_argument('--senders', type=int, default=64, help='Client threads sending requests')
+    parser.add_argument('--engine', help='Override the inference engine of every request')
+    parser.add_argument('--limit', type=int, help='Replay only the first N requests')
+    parser.add_argument('--output', help='Optional JSON file for the results')
+    args = parser.parse_args()
+
+    paths = args.paths or rotated_paths(CAPTURE_PATH)
+    entries = load_entries(paths, args.limit)
+    if not entries:
+        print(f"❌ No captured requests in {', '.join(paths) or CAPTURE_PATH}")
+        return 1
+
+    print(f"🚀 Replaying {len(entries)} requests from {len(paths)} file(s) against {args.url} "
+          f"at {'max' if args.speed <= 0 else f'{args.speed:g}x'} speed")
+    records, elapsed, max_lag = replay(args.url.rstrip('/'), entries, args.speed, args.senders, args.engine)
+    result = summarize(records, entries, elapsed, max_lag, args.speed)
+
+    print("=" * 78)
+    print(f"{'Endpoint':<30} | {'Reqs':>5} | {'p50 ms':>7} | {'p95 ms':>7} | {'p99 ms':>7} | Status")
+    print("=" * 78)
+    for path, stats in result['endpoints'].items():
+        codes = ' '.join(f'{code}:{n}' for code, n in sorted(stats['status_codes'].items()))
+        print(f"{path[:30]:<30} | {stats['requests']:>5} | {stats['p50_ms'] or 0:>7.1f} | "
+              f"{stats['p95_ms'] or 0:>7.1f} | {stats['p99_ms'] or 0:>7.1f} | {codes}")
+    print(f"\n{result['requests']} requests in {result['elapsed_s']:.1f}s ({result['achieved_rps']:.1f} req/s); "
+          f"captured over {result['captured_span_s']:.1f}s")
+    if args.speed > 0 and result['dispatch_lag_max_ms'] > 50:
+        print(f"⚠️ Client fell {result['dispatch_lag_max_ms']:.0f} ms behind schedule; try more --senders")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'url': args.url, 'files': paths, 'engine': args.engine, **result}, f, indent=2)
+        print(f"✅ Results saved: {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
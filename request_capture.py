@@ -0,0 +1,186 @@
+"""
+Sampled capture of prediction requests to a rotating JSONL log
+
+A sampled fraction of prediction requests is put on a bounded queue and
+appended to NEXORA_CAPTURE_PATH by a background writer thread, so the
+request itself only pays for a random draw and a put_nowait; encoding and
+file I/O happen on the writer. When the queue is full the request is
+dropped from the capture (and counted) rather than blocking.
+
+Each line records when the request arrived, the endpoint, query string,
+content type and body: JSON bodies as `json`, anything else (NDJSON,
+CSV, Parquet) base64-encoded as `body_b64`. Workers append to the same
+file under a lock file; it rotates to .1 .. .N past NEXORA_CAPTURE_MAX_MB.
+
+Play a capture back with replay.py.
+"""
+
+import base64
+import fcntl
+import json
+import os
+import queue
+import random
+import threading
+import time
+
+CAPTURE_SAMPLE_RATE = float(os.environ.get('NEXORA_CAPTURE_SAMPLE', '0'))
+CAPTURE_PATH = os.environ.get('NEXORA_CAPTURE_PATH', os.path.join('captures', 'requests.jsonl'))
+CAPTURE_MAX_MB = float(os.environ.get('NEXORA_CAPTURE_MAX_MB', '50'))
+CAPTURE_BACKUPS = int(os.environ.get('NEXORA_CAPTURE_BACKUPS', '5'))
+CAPTURE_QUEUE_SIZE = int(os.environ.get('NEXORA_CAPTURE_QUEUE', '10000'))
+# Larger bodies (and chunked uploads of unknown size) are not captured, so a
+# huge streaming upload is never buffered just to log it
+CAPTURE_MAX_BODY_BYTES = int(os.environ.get('NEXORA_CAPTURE_MAX_BODY_KB', '1024')) * 1024
+
+
+def capture_entry(arrived, method, path, query, content_type, body):
+    """One JSONL record for a request body (bytes)"""
+    entry = {
+        'ts': arrived,
+        'method': method,
+        'path': path,
+        'query': query,
+        'content_type': content_type
+    }
+    if content_type and content_type.split(';')[0].strip() == 'application/json':
+        try:
+            entry['json'] = json.loads(body)
+            return entry
+        except ValueError:
+            pass
+    entry['body_b64'] = base64.b64encode(body).decode('ascii')
+    return entry
+
+
+def entry_body(entry):
+    """Request body bytes of a captured entry"""
+    if 'json' in entry:
+        return json.dumps(entry['json']).encode('utf-8')
+    return base64.b64decode(entry.get('body_b64', ''))
+
+
+def rotated_paths(path, backups=CAPTURE_BACKUPS):
+    """Existing capture files, oldest first"""
+    candidates = [f'{path}.{i}' for i in range(backups, 0, -1)] + [path]
+    return [p for p in candidates if os.path.exists(p)]
+
+
+class RequestCapture:
+    """Sampled, non-blocking request log written by a background thread"""
+
+    def __init__(self, path=CAPTURE_PATH, sample_rate=CAPTURE_SAMPLE_RATE, max_mb=CAPTURE_MAX_MB,
+                 backups=CAPTURE_BACKUPS, queue_size=CAPTURE_QUEUE_SIZE, max_body_bytes=CAPTURE_MAX_BODY_BYTES):
+        self.path = path
+        self.sample_rate = max(0.0, min(1.0, sample_rate))
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.backups = max(0, backups)
+        self.queue_size = queue_size
+        self.max_body_bytes = max_body_bytes
+
+        self._lock = threading.Lock()
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._thread = None
+        self._pid = None
+
+        self.sampled = 0
+        self.written = 0
+        self.dropped = 0
+        self.skipped_large = 0
+        self.rotations = 0
+        self.write_errors = 0
+
+    @property
+    def enabled(self):
+        return self.sample_rate > 0
+
+    def should_sample(self, content_length):
+        """Sampling decision for a request; counts bodies too large to capture"""
+        if not self.enabled or random.random() >= self.sample_rate:
+            return False
+        if content_length is None or content_length > self.max_body_bytes:
+            self.skipped_large += 1
+            return False
+        return True
+
+    def _ensure_writer(self):
+        # Threads do not survive fork, so (re)start per process
+        with self._lock:
+            if self._thread is None or self._pid != os.getpid() or not self._thread.is_alive():
+                self._queue = queue.Queue(maxsize=self.queue_size)
+                self._pid = os.getpid()
+                self._thread = threading.Thread(target=self._run, name='nexora-capture', daemon=True)
+                self._thread.start()
+
+    def submit(self, method, path, query, content_type, body):
+        """Queue a request for writing; never blocks"""
+        self._ensure_writer()
+        try:
+            self._queue.put_nowait((time.time(), method, path, query, content_type, body))
+            self.sampled += 1
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self):
+        while True:
+            lines = [json.dumps(capture_entry(*self._queue.get()))]
+            # Drain whatever else is waiting so one lock + write covers it
+            while len(lines) < 1000:
+                try:
+                    lines.append(json.dumps(capture_entry(*self._queue.get_nowait())))
+                except queue.Empty:
+                    break
+            try:
+                self._write(lines)
+                self.written += len(lines)
+            except OSError:
+                self.write_errors += 1
+            for _ in lines:
+                self._queue.task_done()
+
+    def _write(self, lines):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        data = ('\n'.join(lines) + '\n').encode('utf-8')
+        # Workers share the log; the lock file serializes appends and rotation
+        with open(self.path + '.lock', 'a') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                size = os.path.getsize(self.path)
+            except OSError:
+                size = 0
+            if self.max_bytes and size and size + len(data) > self.max_bytes:
+                self._rotate()
+            with open(self.path, 'ab') as f:
+                f.write(data)
+
+    def _rotate(self):
+        if self.backups == 0:
+            os.remove(self.path)
+        else:
+            for i in range(self.backups - 1, 0, -1):
+                if os.path.exists(f'{self.path}.{i}'):
+                    os.replace(f'{self.path}.{i}', f'{self.path}.{i + 1}')
+            os.replace(self.path, f'{self.path}.1')
+        self.rotations += 1
+
+    def flush(self, timeout=5.0):
+        """Wait until queued entries are written (for tests and shutdown)"""
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def stats(self):
+        return {
+            'enabled': self.enabled,
+            'path': self.path,
+            'sample_rate': self.sample_rate,
+            'sampled': self.sampled,
+            'written': self.written,
+            'dropped_queue_full': self.dropped,
+            'skipped_large': self.skipped_large,
+            'rotations': self.rotations,
+            'write_errors': self.write_errors,
+            'queue_depth': self._queue.qsize()
+        }
@@ -0,0 +1,214 @@
+"""
+Exact precomputed risk lookup index for the Nexora attrition model
+
+For a fixed (department, jobTitle, performanceRating) the forest output is a
+step function of salary, with steps at the trees' salary split thresholds.
+The index stores, per combination, the sorted thresholds where the risk
+changes and the risk of each salary interval, so a prediction is one dict
+lookup plus one binary search.
+
+Build (after train_model.py):  python risk_index.py
+"""
+
+import hashlib
+
+import numpy as np
+
+MODEL_PATH = 'nexora_attrition_model.pkl'
+DEPT_ENCODER_PATH = 'department_encoder.pkl'
+JOB_ENCODER_PATH = 'job_encoder.pkl'
+INDEX_PATH = 'risk_lookup_index.npz'
+
+FEATURE_COLUMNS = ['salary', 'performanceRating', 'department_encoded', 'jobTitle_encoded']
+SALARY_FEATURE = 0
+RATINGS = (1, 2, 3, 4)
+
+
+def file_sha256(path):
+    """Content hash of a model artifact"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def salary_thresholds(model):
+    """Sorted union of every salary split threshold in the forest"""
+    thresholds = [
+        est.tree_.threshold[est.tree_.feature == SALARY_FEATURE]
+        for est in model.estimators_
+    ]
+    return np.unique(np.concatenate(thresholds))
+
+
+def interval_salaries(thresholds):
+    """One float32-exact salary inside each interval (-inf, t0], (t0, t1], ..., (tk, inf)"""
+    reps = thresholds.astype(np.float32)
+    # Trees compare float32(salary) <= threshold, so never round above it
+    above = reps.astype(np.float64) > thresholds
+    reps[above] = np.nextafter(reps[above], np.float32(-np.inf))
+    last = np.nextafter(np.float32(thresholds[-1]), np.float32(np.inf))
+    return np.append(reps, last).astype(np.float64)
+
+
+def _as_float32(values):
+    return np.asarray(values, dtype=np.float64).astype(np.float32).astype(np.float64)
+
+
+class RiskLookupIndex:
+    """(department_encoded, jobTitle_encoded, rating) -> (thresholds, risks)"""
+
+    def __init__(self, table, model_sha256=None):
+        self.table = table
+        self.model_sha256 = model_sha256
+
+    @classmethod
+    def build(cls, model, n_departments, n_job_titles, ratings=RATINGS, model_sha256=None):
+        """Enumerate every categorical combination and tabulate its salary steps"""
+        thresholds = salary_thresholds(model)
+        salaries = interval_salaries(thresholds)
+        combos = [
+            (dept, job, rating)
+            for dept in range(n_departments)
+            for job in range(n_job_titles)
+            for rating in ratings
+        ]
+
+        # One predict_proba call over every (combination, salary interval) pair
+        n = len(salaries)
+        X = np.empty((len(combos) * n, 4), dtype=np.float64)
+        X[:, 0] = np.tile(salaries, len(combos))
+        X[:, 1:] = np.repeat(np.array([(r, d, j) for d, j, r in combos], dtype=np.float64), n, axis=0)
+        import pandas as pd
+        risks = model.predict_proba(pd.DataFrame(X, columns=FEATURE_COLUMNS))[:, 1].reshape(len(combos), n)
+
+        table = {}
+        for combo, combo_risks in zip(combos, risks):
+            # Keep only the thresholds where the risk actually changes
+            changes = np.flatnonzero(combo_risks[:-1] != combo_risks[1:])
+            table[combo] = (thresholds[changes].copy(), np.append(combo_risks[changes], combo_risks[-1]))
+        return cls(table, model_sha256)
+
+    def lookup(self, salary, performance_rating, dept_enc, job_enc):
+        """Risk for one employee, or None if the combination is not indexed"""
+        entry = self.table.get((int(dept_enc), int(job_enc), performance_rating))
+        if entry is None:
+            return None
+        thresholds, risks = entry
+        return risks[np.searchsorted(thresholds, float(np.float32(salary)), side='left')]
+
+    def predict(self, X, fallback=None):
+        """Risk for an (n, 4) feature matrix; unindexed rows go to `fallback`"""
+        X = np.asarray(X, dtype=np.float64)
+        if X.shape[0] == 1:
+            risk = self.lookup(X[0, 0], X[0, 1], X[0, 2], X[0, 3])
+            if risk is not None:
+                return np.array([risk])
+
+        risks = np.full(X.shape[0], np.nan)
+        salaries = _as_float32(X[:, 0])
+        keys, inverse = np.unique(X[:, 1:], axis=0, return_inverse=True)
+        inverse = inverse.ravel()
+        for k, (rating, dept, job) in enumerate(keys):
+            entry = self.table.get((int(dept), int(job), rating))
+            if entry is None:
+                continue
+            rows = np.flatnonzero(inverse == k)
+            thresholds, combo_risks = entry
+            risks[rows] = combo_risks[np.searchsorted(thresholds, salaries[rows], side='left')]
+
+        missing = np.isnan(risks)
+        if missing.any():
+            if fallback is None:
+                raise KeyError(f'{int(missing.sum())} rows fall outside the risk index')
+            risks[missing] = fallback(X[missing])
+        return risks
+
+    def save(self, path=INDEX_PATH):
+        """Write the index as flat arrays in one .npz file"""
+        keys = sorted(self.table)
+        thresholds = [self.table[k][0] for k in keys]
+        risks = [self.table[k][1] for k in keys]
+        offsets = np.cumsum([0] + [len(t) for t in thresholds])
+        np.savez_compressed(
+            path,
+            keys=np.array(keys, dtype=np.int64),
+            offsets=offsets,
+            thresholds=np.concatenate(thresholds),
+            risks=np.concatenate(risks),
+            model_sha256=np.array(self.model_sha256 or '')
+        )
+
+    @classmethod
+    def load(cls, path=INDEX_PATH):
+        """Read an index written by save()"""
+        with np.load(path) as data:
+            return cls.from_arrays(
+                data['keys'],
+                data['offsets'],
+                data['thresholds'],
+                data['risks'],
+                model_sha256=str(data['model_sha256']) or None
+            )
+
+    @classmethod
+    def from_arrays(cls, keys, offsets, thresholds, risks, model_sha256=None):
+        """Rebuild the table from the flat arrays written by save()"""
+        table = {}
+        for i, key in enumerate(keys):
+            start, end = offsets[i], offsets[i + 1]
+            # Each combination has one more risk than thresholds
+            table[tuple(int(v) for v in key)] = (thresholds[start:end], risks[start + i:end + i + 1])
+        return cls(table, model_sha256)
+
+    def verify(self, model, n_random=20000, seed=42):
+        """Compare against model.predict_proba; returns the number of mismatches"""
+        rng = np.random.default_rng(seed)
+        keys = np.array(sorted(self.table), dtype=np.float64)
+        thresholds = salary_thresholds(model)
+
+        # Every interval representative, the thresholds themselves and random salaries
+        salaries = np.concatenate([
+            interval_salaries(thresholds),
+            thresholds,
+            rng.uniform(thresholds[0] - 1000, thresholds[-1] + 1000, n_random).round()
+        ])
+        combo = keys[rng.integers(0, len(keys), len(salaries))]
+        X = np.column_stack([salaries, combo[:, 2], combo[:, 0], combo[:, 1]])
+
+        import pandas as pd
+        expected = model.predict_proba(pd.DataFrame(X, columns=FEATURE_COLUMNS))[:, 1]
+        return int(np.count_nonzero(self.predict(X) != expected))
+
+
+def build_index(model_path=MODEL_PATH, dept_encoder_path=DEPT_ENCODER_PATH,
+                job_encoder_path=JOB_ENCODER_PATH, index_path=INDEX_PATH):
+    """Build, verify and save the index for the artifacts on disk"""
+    import joblib
+    model = joblib.load(model_path)
+    # Sequential trees keep predict_proba's summation order deterministic
+    model.set_params(n_jobs=1)
+    dept_encoder = joblib.load(dept_encoder_path)
+    job_encoder = joblib.load(job_encoder_path)
+
+    index = RiskLookupIndex.build(
+        model,
+        len(dept_encoder.classes_),
+        len(job_encoder.classes_),
+        model_sha256=file_sha256(model_path)
+    )
+    mismatches = index.verify(model)
+    if mismatches:
+        raise RuntimeError(f'Risk index disagrees with predict_proba on {mismatches} rows')
+
+    index.save(index_path)
+    return index
+
+
+if __name__ == '__main__':
+    index = build_index()
+    n_steps = sum(len(t) for t, _ in index.table.values())
+    print(f"✅ Risk index saved: {INDEX_PATH}")
+    print(f"✅ Combinations: {len(index.table)} | Salary steps: {n_steps}")
+    print("✅ Verified: exact agreement with model.predict_proba")
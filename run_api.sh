@@ -5,12 +5,10 @@ PORT=${PORT:-5000}
 
 echo "🚀 Starting Attrition API on port $PORT"
 
+# Workers, threads, timeout and preload come from gunicorn.conf.py
 gunicorn \
+  --config gunicorn.conf.py \
   --bind 0.0.0.0:$PORT \
-  --workers 2 \
-  --timeout 120 \
-  --access-logfile - \
-  --error-logfile - \
   --log-level debug \
   api:app
 
@@ -0,0 +1,167 @@
+"""
+Offline bulk scoring of large employee CSVs (no HTTP)
+
+Reads the input in chunks, scores them on a pool of worker processes (one
+model copy per worker) and writes results in input order. Memory is bounded
+by the number of chunks in flight. Progress is checkpointed after every
+chunk, so an interrupted run can continue with --resume.
+
+Usage: python score_csv.py snapshot.csv scored.csv --chunksize 50000 --workers 4
+"""
+
+import argparse
+from collections import deque
+import json
+import multiprocessing as mp
+import os
+import sys
+import time
+import warnings
+
+import joblib
+import pandas as pd
+
+from inference import load_model, build_engines, score_frame, BatchPolicy, INPUT_COLUMNS
+
+ID_DTYPES = {'employee_id': str, 'employee_name': str}
+
+# Per-worker state, set by _init_worker
+_score = None
+_dept_encoder = None
+_job_encoder = None
+_policy = BatchPolicy(n_jobs=1)
+
+
+def _init_worker(engine):
+    """Load the same artifacts as api.py once per worker process"""
+    global _score, _dept_encoder, _job_encoder
+    warnings.filterwarnings('ignore')
+    model = load_model()
+    engines = build_engines(model, compiled=engine == 'compiled')
+    if engine not in engines:
+        raise ValueError(f"Unknown engine '{engine}'. Available: {list(engines)}")
+    _score = engines[engine]
+    _dept_encoder = joblib.load('department_encoder.pkl')
+    _job_encoder = joblib.load('job_encoder.pkl')
+
+
+def _score_chunk(chunk):
+    """Scored CSV text (no header), its columns and error count for one chunk"""
+    result = score_frame(chunk, _score, _dept_encoder, _job_encoder, policy=_policy)
+    return result.to_csv(index=False, header=False), list(result.columns), int(result['error'].notna().sum())
+
+
+def _checkpoint_path(output):
+    return output + '.progress'
+
+
+def _load_checkpoint(args):
+    path = _checkpoint_path(args.output)
+    if not (args.resume and os.path.exists(path) and os.path.exists(args.output)):
+        return {'rows_done': 0, 'output_bytes': 0, 'errors': 0}
+    with open(path) as f:
+        checkpoint = json.load(f)
+    if checkpoint.get('input') != os.path.abspath(args.input):
+        raise SystemExit(f"❌ {path} belongs to a different input: {checkpoint.get('input')}")
+    return checkpoint
+
+
+def _save_checkpoint(args, rows_done, output_bytes, errors):
+    path = _checkpoint_path(args.output)
+    tmp = path + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump({
+            'input': os.path.abspath(args.input),
+            'rows_done': rows_done,
+            'output_bytes': output_bytes,
+            'errors': errors
+        }, f)
+    os.replace(tmp, path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Offline bulk attrition scoring')
+    parser.add_argument('input', help='Employee CSV with salary, performanceRating, department, jobTitle')
+    parser.add_argument('output', help='Scored CSV to write')
+    parser.add_argument('--chunksize', type=int, default=50000)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--engine', default=os.environ.get('NEXORA_ENGINE', 'sklearn'))
+    parser.add_argument('--resume', action='store_true', help='Continue an interrupted run')
+    args = parser.parse_args()
+
+    checkpoint = _load_checkpoint(args)
+    rows_done = checkpoint['rows_done']
+    errors = checkpoint['errors']
+    if rows_done:
+        print(f"⏩ Resuming after {rows_done:,} rows")
+
+    # Check the engine here: a pool initializer that raises makes
+    # multiprocessing respawn workers forever instead of failing
+    engines = build_engines(load_model(), compiled=args.engine == 'compiled')
+    if args.engine not in engines:
+        raise SystemExit(f"❌ Unknown engine '{args.engine}'. Available: {list(engines)}")
+    del engines
+
+    header = pd.read_csv(args.input, nrows=0).columns
+    missing = [c for c in INPUT_COLUMNS if c not in header]
+    if missing:
+        raise SystemExit(f"❌ Missing columns: {', '.join(missing)}")
+
+    # A callable instead of range(): pandas turns a range into a set of every
+    # skipped row, so resume memory would grow with progress. Bound to the
+    # checkpoint value because rows_done keeps advancing while reading
+    skip = rows_done
+    reader = pd.read_csv(
+        args.input,
+        chunksize=args.chunksize,
+        dtype={c: t for c, t in ID_DTYPES.items() if c in header},
+        skiprows=(lambda i: 0 < i <= skip) if skip else None
+    )
+
+    # Drop anything written after the last checkpoint
+    with open(args.output, 'a'):
+        pass
+    with open(args.output, 'r+') as f:
+        f.truncate(checkpoint['output_bytes'])
+
+    print(f"🚀 Scoring {args.input} with {args.workers} workers ({args.engine} engine)")
+    started = time.perf_counter()
+    scored = 0
+    max_in_flight = 2 * args.workers
+
+    with mp.Pool(args.workers, initializer=_init_worker, initargs=(args.engine,)) as pool, \
+            open(args.output, 'a', newline='') as out:
+        pending = deque()
+
+        def write_next():
+            nonlocal rows_done, errors, scored
+            task, n_rows = pending.popleft()
+            text, columns, chunk_errors = task.get()
+            if out.tell() == 0:
+                out.write(','.join(columns) + '\n')
+            out.write(text)
+            out.flush()
+            rows_done += n_rows
+            errors += chunk_errors
+            scored += n_rows
+            _save_checkpoint(args, rows_done, out.tell(), errors)
+
+            elapsed = time.perf_counter() - started
+            print(f"  {rows_done:,} rows | {scored / elapsed:,.0f} rows/s | {errors:,} errors", flush=True)
+
+        for chunk in reader:
+            pending.append((pool.apply_async(_score_chunk, (chunk,)), len(chunk)))
+            if len(pending) >= max_in_flight:
+                write_next()
+        while pending:
+            write_next()
+
+    elapsed = time.perf_counter() - started
+    os.remove(_checkpoint_path(args.output))
+    print(f"✅ Scored {scored:,} rows in {elapsed:.1f}s ({scored / max(elapsed, 1e-9):,.0f} rows/s)")
+    print(f"✅ Output saved: {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,112 @@
+"""
+Last risk score per employee, for incremental batch rescoring
+
+Maps employee_id -> (input fingerprint, model version, risk score) in a
+SQLite file. A batch sent with ?incremental=1 reuses the stored score of
+every employee whose salary, rating, department, job title and model
+version are unchanged, and only scores (and stores) the rest. Scores are
+stored rather than whole responses, so reused predictions are built exactly
+like fresh ones.
+
+The model version combines the hash of the model the worker actually loaded
+and the engine, so a new model or engine rescores everyone once.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+
+SCORES_DB_PATH = os.environ.get('NEXORA_SCORES_DB', os.path.join('scores', 'scores.db'))
+# Ids per SELECT ... IN (...) (SQLite's default variable limit is 999)
+LOOKUP_BATCH = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS employee_scores (
+    employee_id TEXT PRIMARY KEY,
+    fingerprint TEXT NOT NULL,
+    model_version TEXT NOT NULL,
+    risk REAL NOT NULL,
+    updated_at REAL NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+def input_fingerprint(salary, performance_rating, department, job_title):
+    """Short hash of the normalized model inputs (5000, 5000.0 and '5000' match)"""
+    text = f'{float(salary)!r}|{float(performance_rating)!r}|{department}|{job_title}'
+    return hashlib.blake2b(text.encode(), digest_size=8).hexdigest()
+
+
+class ScoreStore:
+    """employee_id -> last fingerprint, model version and risk in one SQLite file"""
+
+    def __init__(self, path=SCORES_DB_PATH):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as db:
+            db.executescript(SCHEMA)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.reused = 0
+        self.rescored = 0
+
+    def _connect(self):
+        # One short-lived connection per call: safe across threads and forks
+        db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        db.execute('PRAGMA journal_mode=WAL')
+        db.execute('PRAGMA synchronous=NORMAL')
+        return closing(db)
+
+    def lookup(self, employee_ids):
+        """{employee_id: (fingerprint, model_version, risk)} for the ids that are stored"""
+        ids = list(dict.fromkeys(employee_ids))
+        found = {}
+        with self._connect() as db:
+            for start in range(0, len(ids), LOOKUP_BATCH):
+                batch = ids[start:start + LOOKUP_BATCH]
+                rows = db.execute(
+                    'SELECT employee_id, fingerprint, model_version, risk FROM employee_scores '
+                    f"WHERE employee_id IN ({','.join('?' * len(batch))})", batch)
+                for employee_id, fingerprint, model_version, risk in rows:
+                    found[employee_id] = (fingerprint, model_version, risk)
+        return found
+
+    def save(self, entries):
+        """Store (employee_id, fingerprint, model_version, risk) tuples in one transaction"""
+        if not entries:
+            return
+        now = time.time()
+        with self._connect() as db:
+            db.execute('BEGIN IMMEDIATE')
+            try:
+                db.executemany(
+                    'INSERT OR REPLACE INTO employee_scores (employee_id, fingerprint, model_version, risk, updated_at) '
+                    'VALUES (?, ?, ?, ?, ?)',
+                    [(employee_id, fingerprint, model_version, float(risk), now)
+                     for employee_id, fingerprint, model_version, risk in entries])
+                db.execute('COMMIT')
+            except BaseException:
+                db.execute('ROLLBACK')
+                raise
+
+    def record(self, reused, rescored):
+        with self._lock:
+            self.requests += 1
+            self.reused += reused
+            self.rescored += rescored
+
+    def stats(self):
+        with self._lock:
+            total = self.reused + self.rescored
+            return {
+                'path': self.path,
+                'requests': self.requests,
+                'reused': self.reused,
+                'rescored': self.rescored,
+                'reuse_rate': round(self.reused / total, 4) if total else 0.0
+            }
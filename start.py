@@ -1,81 +1,209 @@
 #!/usr/bin/env python3
 """
 Combined startup script for Streamlit + Flask API
-Runs both applications simultaneously
+Starts both applications in parallel, waits until each one reports ready
+and restarts either one if it crashes
 """
 
+import json
 import os
-import sys
+import signal
 import subprocess
-import threading
+import sys
 import time
+import urllib.error
+import urllib.request
 
-def run_flask_api():
-    """Run Flask API on port 5000"""
-    print("🚀 Starting Flask API on port 5000")
-    try:
-        # Use gunicorn for production
-        cmd = [
-            'gunicorn',
-            '--bind', '0.0.0.0:5000',
-            '--workers', '2',
-            '--timeout', '120',
-            '--access-logfile', '-',
-            '--error-logfile', '-',
-            'api:app'
-        ]
-        print(f"📋 Flask Command: {' '.join(cmd)}")
-        subprocess.run(cmd, check=True)
-    except subprocess.CalledProcessError as e:
-        print(f"❌ Flask API error: {e}")
-    except Exception as e:
-        print(f"❌ Flask startup error: {e}")
-
-def run_streamlit():
-    """Run Streamlit app on main PORT"""
-    # Get PORT from environment, default to 8501
-    port = os.environ.get('PORT', '8501')
-    
-    print(f"🚀 Starting Streamlit app on port {port}")
-    
-    # Build the streamlit command
-    cmd = [
+API_PORT = '5000'
+# Seconds a child may take to become ready before a warning is printed
+READY_TIMEOUT = float(os.environ.get('NEXORA_READY_TIMEOUT', '180'))
+# Consecutive crashes (without becoming ready in between) before giving up
+MAX_RESTARTS = int(os.environ.get('NEXORA_MAX_RESTARTS', '5'))
+# Seconds a child without a readiness URL must stay up to count as healthy
+MIN_UPTIME = float(os.environ.get('NEXORA_MIN_UPTIME', '30'))
+POLL_INTERVAL = 0.25
+# Processes scoring asynchronous batch jobs (/api/jobs); 0 runs none here
+JOB_WORKERS = os.environ.get('NEXORA_JOB_WORKERS', '2')
+
+
+def flask_api_command():
+    """Gunicorn command for the Flask API on port 5000"""
+    # Workers, threads, timeout and preload come from gunicorn.conf.py
+    # (NEXORA_WORKERS, NEXORA_THREADS, ...)
+    print(f"⚙️ Workers: {os.environ.get('NEXORA_WORKERS', '2')}, "
+          f"threads: {os.environ.get('NEXORA_THREADS', '1')}, "
+          f"preload: {os.environ.get('NEXORA_PRELOAD', '1') != '0'}")
+    return [
+        'gunicorn',
+        '--config', 'gunicorn.conf.py',
+        '--bind', f'0.0.0.0:{API_PORT}',
+        'api:app'
+    ]
+
+
+def streamlit_command(port):
+    """Streamlit command for the dashboard on the main PORT"""
+    return [
         'streamlit', 'run', 'app.py',
         '--server.port', port,
         '--server.address', '0.0.0.0',
         '--server.headless', 'true',
         '--server.enableCORS', 'true'
     ]
-    
-    print(f"📋 Streamlit Command: {' '.join(cmd)}")
-    
+
+
+def job_worker_command():
+    """Worker pool for /api/jobs batches (see job_worker.py)"""
+    return [sys.executable, 'job_worker.py', '--processes', JOB_WORKERS]
+
+
+def probe(url):
+    """(ready, JSON body or None) for a readiness URL"""
     try:
-        subprocess.run(cmd, check=True)
-    except subprocess.CalledProcessError as e:
-        print(f"❌ Streamlit error: {e}")
-    except Exception as e:
-        print(f"❌ Streamlit startup error: {e}")
+        with urllib.request.urlopen(url, timeout=2) as response:
+            body = response.read()
+            try:
+                return response.status == 200, json.loads(body)
+            except ValueError:
+                return response.status == 200, None
+    except (urllib.error.URLError, OSError, ValueError):
+        return False, None
+
+
+class Child:
+    """A supervised process with its readiness URL and restart bookkeeping"""
+
+    def __init__(self, name, command, ready_url):
+        self.name = name
+        self.command = command
+        self.ready_url = ready_url
+        self.process = None
+        self.started_at = None
+        self.ready_at = None
+        self.restart_at = None
+        self.restarts = 0
+        self.timeout_reported = False
+
+    def start(self):
+        print(f"🚀 Starting {self.name}")
+        print(f"📋 {self.name} Command: {' '.join(self.command)}")
+        self.started_at = time.monotonic()
+        self.ready_at = None
+        self.restart_at = None
+        self.timeout_reported = False
+        try:
+            # Own process group, so orphaned workers can be cleaned up with it
+            self.process = subprocess.Popen(self.command, start_new_session=True)
+        except OSError as e:
+            print(f"❌ {self.name} startup error: {e}")
+            self.process = None
+
+    def exit_code(self):
+        """Exit code if the process is gone, else None"""
+        if self.process is None:
+            return -1
+        return self.process.poll()
+
+    def kill_group(self):
+        """Kill anything left in the process group (e.g. workers of a crashed master)"""
+        if self.process is not None:
+            try:
+                os.killpg(self.process.pid, signal.SIGKILL)
+            except OSError:
+                pass
+
+    def stop(self):
+        if self.process is not None and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+        self.kill_group()
+
 
 def main():
     print("=" * 60)
     print("🚀 STARTING ATTRITION-NEXORA APPLICATION")
     print("=" * 60)
-    
-    # Start Flask API in a background thread
-    flask_thread = threading.Thread(target=run_flask_api, daemon=True)
-    flask_thread.start()
-    
-    # Give Flask API time to start
-    print("⏳ Waiting for Flask API to initialize...")
-    time.sleep(3)
-    
-    # Run Streamlit in main thread
-    print("\n" + "=" * 60)
+
+    port = os.environ.get('PORT', '8501')
+    children = [
+        Child('Flask API', flask_api_command(), f'http://127.0.0.1:{API_PORT}/api/ready'),
+        Child('Streamlit', streamlit_command(port), f'http://127.0.0.1:{port}/_stcore/health')
+    ]
+    if int(JOB_WORKERS) > 0:
+        # No readiness URL: counted as ready once started, and as healthy
+        # (crash counter reset) once it has stayed up for MIN_UPTIME
+        children.append(Child('Job workers', job_worker_command(), None))
+
+    def request_shutdown(signum, frame):
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, request_shutdown)
+
+    boot_started = time.monotonic()
+    for child in children:
+        child.start()
+    print(f"⏱️ Processes spawned in {time.monotonic() - boot_started:.2f}s")
+    print("⏳ Waiting for readiness...")
+
+    all_ready_reported = False
     try:
-        run_streamlit()
+        while True:
+            now = time.monotonic()
+            for child in children:
+                if child.restart_at is not None:
+                    if now >= child.restart_at:
+                        child.start()
+                    continue
+
+                code = child.exit_code()
+                if code is not None:
+                    child.kill_group()
+                    if child.restarts >= MAX_RESTARTS:
+                        print(f"❌ {child.name} crashed {child.restarts + 1} times in a row, giving up")
+                        return 1
+                    delay = min(2 ** child.restarts, 30)
+                    child.restarts += 1
+                    child.restart_at = now + delay
+                    print(f"⚠️ {child.name} exited with code {code}, restarting in {delay}s "
+                          f"(attempt {child.restarts}/{MAX_RESTARTS})")
+                    continue
+
+                if child.restarts and not child.ready_url and now - child.started_at >= MIN_UPTIME:
+                    child.restarts = 0
+
+                if child.ready_at is None:
+                    ready, body = probe(child.ready_url) if child.ready_url else (True, None)
+                    if ready:
+                        child.ready_at = now
+                        if child.ready_url:
+                            child.restarts = 0
+                        detail = ''
+                        if body and 'startup_seconds' in body:
+                            detail = f" (model load + warm-up {body['startup_seconds']:.2f}s)"
+                        print(f"✅ {child.name} ready in {now - child.started_at:.2f}s{detail}")
+                    elif not child.timeout_reported and now - child.started_at > READY_TIMEOUT:
+                        child.timeout_reported = True
+                        print(f"⚠️ {child.name} not ready after {READY_TIMEOUT:.0f}s, still waiting")
+
+            if not all_ready_reported and all(c.ready_at is not None for c in children):
+                all_ready_reported = True
+                print("\n" + "=" * 60)
+                print(f"✅ All services ready in {time.monotonic() - boot_started:.2f}s")
+                for child in children:
+                    print(f"   {child.name:<12} {child.ready_at - child.started_at:>6.2f}s")
+                print("=" * 60)
+
+            time.sleep(POLL_INTERVAL)
     except KeyboardInterrupt:
         print("\n🛑 Shutdown requested")
-        sys.exit(0)
+        return 0
+    finally:
+        for child in children:
+            child.stop()
+
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
@@ -0,0 +1,162 @@
+"""
+Test admission control and load shedding (admission.py)
+Runs with pytest or directly: python test_admission.py
+"""
+
+import tempfile
+import warnings
+
+from admission import AdmissionController, BulkSlots, queue_ms, SINGLE, BULK
+
+warnings.filterwarnings('ignore', category=UserWarning)
+
+
+def controller(max_bulk_workers=1, **kwargs):
+    admission = AdmissionController(max_bulk_workers=max_bulk_workers, **kwargs)
+    admission.bulk_slots = BulkSlots(max_bulk_workers, tempfile.mkdtemp(prefix='nexora-admission-'))
+    return admission
+
+
+def test_queue_ms_formats():
+    """X-Request-Start in seconds, milliseconds and microseconds, with or without t="""
+    now = 1_700_000_000.0
+    assert queue_ms(None) is None
+    assert queue_ms('garbage') is None
+    assert round(queue_ms('t=1699999999.5', now)) == 500
+    assert round(queue_ms('1699999999750', now)) == 250
+    assert round(queue_ms('t=1699999999900000', now)) == 100
+    # Clock skew never gives negative queue time
+    assert queue_ms(str(now + 5), now) == 0.0
+
+
+def test_bulk_slots_shared_across_instances():
+    """Slots are flock()ed files: a second process (here: instance) sees them taken"""
+    directory = tempfile.mkdtemp(prefix='nexora-admission-')
+    worker_a = BulkSlots(2, directory)
+    worker_b = BulkSlots(2, directory)
+    first = worker_a.acquire()
+    second = worker_b.acquire()
+    assert first is not None and second is not None
+    assert worker_a.acquire() is None
+    assert worker_b.acquire() is None
+    worker_a.release(first)
+    third = worker_b.acquire()
+    assert third is not None
+    worker_b.release(second)
+    worker_b.release(third)
+
+
+def test_bulk_slots_without_directory():
+    """Without a shared directory the limit falls back to a per-process counter"""
+    slots = BulkSlots(1, directory='')
+    token = slots.acquire()
+    assert token is True
+    assert slots.acquire() is None
+    slots.release(token)
+    assert slots.acquire() is True
+
+
+def test_limits_off_by_default():
+    """Out of the box nothing is shed, however many batches run at once"""
+    admission = AdmissionController()
+    tickets = [admission.admit(BULK) for _ in range(20)] + [admission.admit(SINGLE) for _ in range(20)]
+    assert all(rejection is None for _, rejection in tickets)
+    for ticket, _ in tickets:
+        admission.release(ticket)
+    assert admission.stats()['shed'] == {}
+
+
+def test_bulk_shed_while_singles_admitted():
+    """Batches beyond the bulk slots get 429; single predictions still go through"""
+    admission = controller(max_bulk_workers=1)
+    bulk, rejection = admission.admit(BULK)
+    assert bulk is not None and rejection is None
+    assert admission.admit(BULK) == (None, (429, 'bulk_workers_full'))
+
+    single, rejection = admission.admit(SINGLE)
+    assert single is not None and rejection is None
+    admission.release(single)
+
+    admission.release(bulk)
+    again, rejection = admission.admit(BULK)
+    assert again is not None and rejection is None
+    admission.release(again)
+
+
+def test_inflight_limits():
+    """Per-worker cap: 503 for singles and 429 for batches; separate bulk cap"""
+    admission = controller(max_bulk_workers=0, max_inflight=2, max_inflight_bulk=1)
+    bulk, _ = admission.admit(BULK)
+    assert admission.admit(BULK) == (None, (429, 'worker_bulk_full'))
+    single, _ = admission.admit(SINGLE)
+    assert admission.admit(SINGLE) == (None, (503, 'worker_full'))
+    admission.release(bulk)
+    assert admission.admit(SINGLE)[1] is None
+    assert admission.admit(BULK) == (None, (429, 'worker_full'))
+
+
+def test_queue_timeout():
+    """Requests that waited too long behind the proxy get 503"""
+    admission = controller(max_queue_ms=100)
+    assert admission.admit(SINGLE, queued_ms=500) == (None, (503, 'queue_timeout'))
+    ticket, rejection = admission.admit(SINGLE, queued_ms=50)
+    assert rejection is None
+    admission.release(ticket)
+
+
+def test_stats():
+    """Admitted and shed counts per priority and reason, shed rate, in-flight"""
+    admission = controller(max_bulk_workers=1)
+    bulk, _ = admission.admit(BULK)
+    admission.admit(BULK)
+    single, _ = admission.admit(SINGLE)
+    stats = admission.stats()
+    assert stats['admitted'] == {SINGLE: 1, BULK: 1}
+    assert stats['shed'] == {'bulk:bulk_workers_full': 1}
+    assert stats['shed_rate'] == round(1 / 3, 4)
+    assert stats['in_flight'] == {SINGLE: 1, BULK: 1}
+    admission.release(bulk)
+    admission.release(single)
+    assert admission.stats()['in_flight'] == {SINGLE: 0, BULK: 0}
+
+
+def test_api_returns_429_with_retry_after():
+    """A shed batch gets 429 + Retry-After from the API and releases nothing it did not take"""
+    import api
+    original = api.admission
+    api.admission = controller(max_bulk_workers=1)
+    try:
+        client = api.app.test_client()
+        employee = {'salary': 5000, 'performanceRating': 3, 'department': 'Sales', 'jobTitle': 'Sales Executive'}
+        held, _ = api.admission.admit(BULK)
+
+        response = client.post('/api/predict-attrition-batch', json={'employees': [employee]})
+        assert response.status_code == 429
+        assert response.headers['Retry-After'] == str(api.RETRY_AFTER_SECONDS)
+        assert response.get_json()['reason'] == 'bulk_workers_full'
+
+        assert client.post('/api/predict-attrition', json=employee).status_code == 200
+        assert api.admission.stats()['in_flight'] == {SINGLE: 0, BULK: 1}
+
+        api.admission.release(held)
+        assert client.post('/api/predict-attrition-batch', json={'employees': [employee]}).status_code == 200
+        assert api.admission.stats()['in_flight'] == {SINGLE: 0, BULK: 0}
+    finally:
+        api.admission = original
+
+
+if __name__ == "__main__":
+    tests = [
+        test_queue_ms_formats,
+        test_bulk_slots_shared_across_instances,
+        test_bulk_slots_without_directory,
+        test_limits_off_by_default,
+        test_bulk_shed_while_singles_admitted,
+        test_inflight_limits,
+        test_queue_timeout,
+        test_stats,
+        test_api_returns_429_with_retry_after
+    ]
+    for test in tests:
+        test()
+        print(f"✅ {test.__name__}")
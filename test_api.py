@@ -133,6 +133,75 @@ def test_batch_prediction():
             if pred['factors']:
                 print(f"   Factors: {', '.join(pred['factors'])}")
 
+def test_stream_prediction():
+    """Test streaming NDJSON batch predictions"""
+    print_header("TEST 5: Streaming Batch Predictions (NDJSON)")
+    
+    employees = [
+        {"salary": 2500, "performanceRating": 2, "department": "Sales", "jobTitle": "Sales Executive", "employee_id": "E001"},
+        {"salary": 8000, "performanceRating": 4, "department": "Research & Development", "jobTitle": "Manager", "employee_id": "E002"},
+        {"salary": 5000, "performanceRating": 3, "department": "Research & Development", "jobTitle": "Research Scientist", "employee_id": "E003"}
+    ]
+    body = "\n".join(json.dumps(emp) for emp in employees)
+    
+    response = requests.post(
+        f"{API_BASE_URL}/api/predict-attrition-stream",
+        data=body,
+        headers={"Content-Type": "application/x-ndjson"},
+        stream=True
+    )
+    for line in response.iter_lines():
+        record = json.loads(line)
+        if record['type'] == 'prediction':
+            print(f"  {record['employee_id']}: {record['risk_category']} ({record['risk_percentage']}%)")
+        elif record['type'] == 'error':
+            print(f"  ❌ {record['employee_id']}: {record['error']}")
+        else:
+            summary = record['summary']
+            print(f"\n✅ Streamed {record['total_employees']} predictions")
+            print(f"  📈 Average Risk Score: {summary['average_risk_score']}")
+
+def test_stream_invalid_lines():
+    """Bad NDJSON lines give one error each; the rest of the stream is still scored"""
+    print_header("TEST 6: Streaming With Invalid Lines")
+    
+    good = {"salary": 5000, "performanceRating": 3, "department": "Research & Development", "jobTitle": "Research Scientist"}
+    lines = [
+        json.dumps({**good, "employee_id": "E001"}),
+        "5",
+        "null",
+        "true",
+        "[1, 2]",
+        "{not json",
+        json.dumps({"employee_id": "E002", "salary": 4000}),
+        json.dumps({**good, "employee_id": "E003"})
+    ]
+    
+    response = requests.post(
+        f"{API_BASE_URL}/api/predict-attrition-stream",
+        data="\n".join(lines),
+        headers={"Content-Type": "application/x-ndjson"}
+    )
+    records = [json.loads(line) for line in response.text.splitlines() if line.strip()]
+    predictions = [r['employee_id'] for r in records if r['type'] == 'prediction']
+    errors = {r['employee_id']: r['error'] for r in records if r['type'] == 'error'}
+    summary = records[-1]
+    
+    assert response.status_code == 200
+    assert sorted(predictions) == ['E001', 'E003']
+    assert errors == {
+        'line 2': 'Expected a JSON object',
+        'line 3': 'Expected a JSON object',
+        'line 4': 'Expected a JSON object',
+        'line 5': 'Expected a JSON object',
+        'line 6': 'Invalid JSON',
+        'E002': 'Missing fields'
+    }
+    assert summary['type'] == 'summary'
+    assert summary['total_employees'] == 2
+    assert summary['total_errors'] == 6
+    print(f"✅ {len(predictions)} predictions and {len(errors)} errors, summary intact")
+
 if __name__ == "__main__":
     print("\n" + "🚀" * 35)
     print("NEXORA ATTRITION API - ML MODEL TEST SUITE")
@@ -143,6 +212,8 @@ if __name__ == "__main__":
         test_config()
         test_single_prediction()
         test_batch_prediction()
+        test_stream_prediction()
+        test_stream_invalid_lines()
         
         print("\n" + "="*70)
         print("✅ ALL TESTS PASSED! API is working perfectly")
@@ -0,0 +1,109 @@
+"""
+Test the micro-batching request coalescer (coalescer.py)
+Runs with pytest or directly: python test_coalescer.py
+"""
+
+import threading
+import time
+
+import numpy as np
+
+from coalescer import RequestCoalescer
+
+
+class RecordingScore:
+    """Score function that returns salary * 2 and records every batch it sees"""
+
+    def __init__(self, delay=0.0, fail=False):
+        self.delay = delay
+        self.fail = fail
+        self.batches = []
+        self._lock = threading.Lock()
+
+    def __call__(self, X):
+        with self._lock:
+            self.batches.append((threading.current_thread().name, len(X)))
+        if self.delay and threading.current_thread().name == 'nexora-coalescer':
+            time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError('model exploded')
+        return X[:, 0] * 2
+
+
+def submit_concurrently(coalescer, n):
+    """Submit n distinct rows from n threads at once; {i: result or exception}"""
+    barrier = threading.Barrier(n)
+    results = {}
+
+    def caller(i):
+        barrier.wait()
+        try:
+            results[i] = coalescer.submit([float(i), 3.0, 1.0, 2.0])
+        except Exception as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=caller, args=(i,)) for i in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results
+
+
+def test_each_caller_gets_its_own_result():
+    """Concurrent callers are scored together and each gets back its own row's risk"""
+    score = RecordingScore()
+    coalescer = RequestCoalescer(score, window_ms=50, max_batch=64, max_wait_ms=5000)
+    results = submit_concurrently(coalescer, 40)
+    assert results == {i: i * 2.0 for i in range(40)}
+    sizes = [size for _, size in score.batches]
+    assert sum(sizes) == 40
+    assert max(sizes) > 1
+    assert coalescer.batches == len(sizes) < 40
+    assert coalescer.timeouts == 0
+
+
+def test_max_batch_splits_batches():
+    """No batch is larger than max_batch"""
+    score = RecordingScore()
+    coalescer = RequestCoalescer(score, window_ms=50, max_batch=8, max_wait_ms=5000)
+    results = submit_concurrently(coalescer, 30)
+    assert results == {i: i * 2.0 for i in range(30)}
+    assert max(size for _, size in score.batches) <= 8
+
+
+def test_errors_reach_every_caller():
+    """A failing batch raises the scoring error in each caller of that batch"""
+    coalescer = RequestCoalescer(RecordingScore(fail=True), window_ms=50, max_wait_ms=5000)
+    results = submit_concurrently(coalescer, 10)
+    assert all(isinstance(r, RuntimeError) and str(r) == 'model exploded' for r in results.values())
+
+
+def test_busy_dispatcher_falls_back_inline():
+    """Past max_wait_ms a caller scores its own row; the late batch result is discarded"""
+    score = RecordingScore(delay=0.3)
+    coalescer = RequestCoalescer(score, window_ms=1, max_wait_ms=20)
+    assert coalescer.submit([21.0, 3.0, 1.0, 2.0]) == 42.0
+    assert coalescer.timeouts == 1
+    assert ('MainThread', 1) in score.batches
+
+
+def test_sequential_submits():
+    """At low traffic each request is its own batch and results stay correct"""
+    coalescer = RequestCoalescer(RecordingScore(), window_ms=1, max_wait_ms=5000)
+    for i in range(5):
+        assert coalescer.submit(np.array([i, 3, 1, 2])) == i * 2
+    assert coalescer.batches == 5
+
+
+if __name__ == "__main__":
+    tests = [
+        test_each_caller_gets_its_own_result,
+        test_max_batch_splits_batches,
+        test_errors_reach_every_caller,
+        test_busy_dispatcher_falls_back_inline,
+        test_sequential_submits
+    ]
+    for test in tests:
+        test()
+        print(f"✅ {test.__name__}")
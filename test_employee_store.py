@@ -0,0 +1,260 @@
+"""
+Test employee profiles (employee_store.py) and scoring by employee_id on a temporary database
+Runs with pytest or directly: python test_employee_store.py
+"""
+
+import os
+import tempfile
+import warnings
+
+import numpy as np
+
+from employee_store import EmployeeStore
+
+warnings.filterwarnings('ignore', category=UserWarning)
+
+DEPARTMENTS = ['Human Resources', 'Research & Development', 'Sales']
+JOBS = ['Manager', 'Research Scientist', 'Sales Executive']
+
+
+def temp_path():
+    return os.path.join(tempfile.mkdtemp(prefix='nexora-employees-'), 'employees.db')
+
+
+def profile(employee_id, salary=5000, rating=3, department='Sales', job_title='Sales Executive', **extra):
+    return {'employee_id': employee_id, 'salary': salary, 'performanceRating': rating,
+            'department': department, 'jobTitle': job_title, **extra}
+
+
+def test_load_validation():
+    """Invalid rows are rejected with their index; valid rows load in the same call"""
+    store = EmployeeStore(DEPARTMENTS, JOBS, path=temp_path())
+    rows = [
+        profile('E1'),
+        {'salary': 5000, 'performanceRating': 3, 'department': 'Sales', 'jobTitle': 'Sales Executive'},
+        {'employee_id': 'E3', 'salary': 5000},
+        profile('E4', department='Marketing'),
+        profile('E5', job_title='Astronaut'),
+        profile('E6', salary='lots'),
+        profile('E7', rating=float('nan')),
+        ['not', 'an', 'object'],
+        profile('E9', employee_name='Dana'),
+        profile('E10', department=['Sales']),
+        profile('E11', job_title={'name': 'Manager'}),
+    ]
+    loaded, errors = store.load(rows)
+    assert loaded == 2
+    assert [(e['row'], e['employee_id']) for e in errors] == [
+        (1, None), (2, 'E3'), (3, 'E4'), (4, 'E5'), (5, 'E6'), (6, 'E7'), (7, None), (9, 'E10'), (10, 'E11')]
+    assert errors[0]['error'] == 'Missing employee_id'
+    assert errors[1]['error'] == 'Missing fields: performanceRating, department, jobTitle'
+    assert errors[2]['error'].startswith('Invalid department')
+    assert errors[3]['error'].startswith('Invalid job title')
+    assert errors[4]['error'] == errors[5]['error'] == 'salary and performanceRating must be numeric'
+    assert errors[6]['error'] == 'Expected an object'
+    assert errors[7]['error'].startswith('Invalid department')
+    assert errors[8]['error'].startswith('Invalid job title')
+    assert store.stats()['employees'] == 2
+
+
+def test_profiles_roundtrip():
+    """Stored profiles come back in API field names; integers stay integers"""
+    store = EmployeeStore(DEPARTMENTS, JOBS, path=temp_path())
+    store.load([profile(1, salary=4000, rating=4), profile('E2', salary=5500.5, employee_name='Dana')])
+    found = store.profiles([1, 'E2', 'missing', 'E2'])
+    assert found == {
+        '1': profile('1', salary=4000, rating=4),
+        'E2': profile('E2', salary=5500.5, employee_name='Dana')
+    }
+    assert isinstance(found['1']['salary'], int)
+
+    # Loading again replaces the profile
+    store.load([profile('E2', salary=6000)])
+    assert store.profiles(['E2'])['E2']['salary'] == 6000
+    assert 'employee_name' not in store.profiles(['E2'])['E2']
+
+    assert store.delete('E2') == 1
+    assert store.delete('E2') == 0
+    assert store.profiles(['E2']) == {}
+
+
+def test_profiles_many_ids():
+    """Lookups larger than one SELECT ... IN batch"""
+    store = EmployeeStore(DEPARTMENTS, JOBS, path=temp_path())
+    store.load([profile(f'E{i:04d}', salary=1000 + i) for i in range(1200)])
+    found = store.profiles(f'E{i:04d}' for i in range(0, 1300, 1))
+    assert len(found) == 1200
+    assert found['E1199']['salary'] == 2199
+
+
+def test_features():
+    """Feature matrix in employee_id order with encoder codes; department filter"""
+    store = EmployeeStore(DEPARTMENTS, JOBS, path=temp_path())
+    store.load([profile('E2', salary=6000, rating=2, department='Research & Development', job_title='Manager'),
+                profile('E1', employee_name='Dana'),
+                profile('E3', salary=7000, rating=4)])
+    ids, names, X, encodable = store.features()
+    assert ids == ['E1', 'E2', 'E3']
+    assert names == ['Dana', None, None]
+    assert X.tolist() == [[5000, 3, 2, 2], [6000, 2, 1, 0], [7000, 4, 2, 2]]
+    assert encodable.all()
+
+    ids, _, X, _ = store.features('Sales')
+    assert ids == ['E1', 'E3']
+    ids, names, X, encodable = store.features('Nobody')
+    assert (ids, names, X.shape, encodable.shape) == ([], [], (0, 4), (0,))
+
+
+def test_reencoding_when_classes_change():
+    """A model with different encoder classes re-encodes stored rows; unknown names become unencodable"""
+    path = temp_path()
+    EmployeeStore(DEPARTMENTS, JOBS, path=path).load([
+        profile('E1'), profile('E2', department='Human Resources', job_title='Manager')])
+
+    reordered = EmployeeStore(['Sales', 'Human Resources', 'Research & Development'], ['Sales Executive', 'Manager'],
+                              path=path)
+    _, _, X, encodable = reordered.features()
+    assert X[:, 2:].tolist() == [[0, 0], [1, 1]]
+    assert encodable.all()
+
+    without_hr = EmployeeStore(['Research & Development', 'Sales'], JOBS, path=path)
+    _, _, X, encodable = without_hr.features()
+    assert encodable.tolist() == [True, False]
+    assert X[0, 2:].tolist() == [1, 2]
+    assert np.isnan(X[1, 2])
+
+
+def with_api_store(test):
+    """Run test(api, client) with scoring by ID backed by a temporary employee store"""
+    import api
+    original = api._employee_store
+    api._employee_store = EmployeeStore(api.dept_encoder.classes_, api.job_encoder.classes_, path=temp_path())
+    try:
+        test(api, api.app.test_client())
+    finally:
+        api._employee_store = original
+
+
+def test_score_single_by_id():
+    """POST {"employee_id"} scores the stored profile exactly like sending the fields"""
+    def run(api, client):
+        api._employee_store.load([profile('E1', salary=4200, rating=2)])
+        by_id = client.post('/api/predict-attrition?cache=0', json={'employee_id': 'E1'})
+        full = client.post('/api/predict-attrition?cache=0', json=profile('E1', salary=4200, rating=2))
+        assert by_id.status_code == full.status_code == 200
+        assert by_id.get_json() == full.get_json()
+
+        # Fields sent in the request override the stored profile
+        override = client.post('/api/predict-attrition?cache=0', json={'employee_id': 'E1', 'salary': 9000})
+        expected = client.post('/api/predict-attrition?cache=0', json=profile('E1', salary=9000, rating=2))
+        assert override.get_json() == expected.get_json()
+
+        unknown = client.post('/api/predict-attrition', json={'employee_id': 'E404'})
+        assert unknown.status_code == 404
+        assert unknown.get_json()['error'] == 'Unknown employee_id: E404'
+
+        missing = client.post('/api/predict-attrition', json={'salary': 5000})
+        assert missing.status_code == 400
+        assert missing.get_json()['error'].startswith('Missing fields')
+    with_api_store(run)
+
+
+def test_score_batch_by_id():
+    """employee_ids and mixed batches: unknown IDs and rows with missing fields are reported, the rest scored"""
+    def run(api, client):
+        api._employee_store.load([profile('E1'), profile('E2', salary=3000, rating=1)])
+        response = client.post('/api/predict-attrition-batch?cache=0', json={'employee_ids': ['E1', 'E404', 'E2']})
+        body = response.get_json()
+        assert response.status_code == 200
+        assert [p['employee_id'] for p in body['predictions']] == ['E1', 'E2']
+        assert body['errors'] == [{'employee_id': 'E404', 'error': 'Unknown employee_id'}]
+
+        # Errors follow input order, whichever step rejected the row
+        mixed = [{'employee_id': 'E405', 'salary': 5000}, {'employee_id': 'E2'},
+                 {'salary': 5000, 'department': 'Sales'}, profile('E9', salary=8000),
+                 {'employee_id': 'E406'}, profile('E10', department='Marketing')]
+        body = client.post('/api/predict-attrition-batch?cache=0', json={'employees': mixed}).get_json()
+        assert [p['employee_id'] for p in body['predictions']] == ['E2', 'E9']
+        assert [(e['employee_id'], e['error'].split('.')[0]) for e in body['errors']] == [
+            ('E405', 'Unknown employee_id'),
+            ('Unknown', 'Missing fields'),
+            ('E406', 'Unknown employee_id'),
+            ('E10', 'Invalid department')
+        ]
+
+        # Same risk as scoring with the fields inline
+        inline = client.post('/api/predict-attrition-batch?cache=0',
+                             json={'employees': [profile('E2', salary=3000, rating=1)]}).get_json()
+        assert body['predictions'][0] == inline['predictions'][0]
+    with_api_store(run)
+
+
+def test_read_only_calls_do_not_enable_scoring_by_id():
+    """GET endpoints never create the database; rows missing fields keep their error until profiles exist"""
+    import api
+    original = (api._employee_store, api.EMPLOYEES_DB_PATH)
+    api._employee_store = None
+    api.EMPLOYEES_DB_PATH = temp_path()
+    try:
+        client = api.app.test_client()
+        batch = {'employees': [{'employee_id': 'E1', 'salary': 5000}]}
+        before = client.post('/api/predict-attrition-batch', json=batch).get_json()
+        assert before['errors'] == [{'employee_id': 'E1', 'error': 'Missing fields'}]
+
+        assert client.get('/api/employees').get_json()['employees'] == 0
+        assert client.get('/api/employees/E1').status_code == 404
+        assert client.delete('/api/employees/E1').status_code == 404
+        assert client.post('/api/employees/score').get_json()['total_employees'] == 0
+        assert not os.path.exists(api.EMPLOYEES_DB_PATH)
+        assert client.post('/api/predict-attrition-batch', json=batch).get_json() == before
+
+        # An empty database (e.g. every profile deleted) does not switch it on either
+        api.get_employee_store()
+        assert client.post('/api/predict-attrition-batch', json=batch).get_json() == before
+
+        api._employee_store.load([profile('E2')])
+        after = client.post('/api/predict-attrition-batch', json=batch).get_json()
+        assert after['errors'] == [{'employee_id': 'E1', 'error': 'Unknown employee_id'}]
+    finally:
+        api._employee_store, api.EMPLOYEES_DB_PATH = original
+
+
+def test_score_all_stored():
+    """/api/employees/score scores every stored employee; unencodable rows count as errors"""
+    def run(api, client):
+        classes = list(api.dept_encoder.classes_)
+        api._employee_store.load([profile('E1'), profile('E2', salary=3000, rating=1)])
+        # A row stored under a model that knew one more department
+        EmployeeStore(classes + ['Marketing'], api.job_encoder.classes_, path=api._employee_store.path).load(
+            [profile('E3', department='Marketing')])
+        api._employee_store = EmployeeStore(api.dept_encoder.classes_, api.job_encoder.classes_,
+                                            path=api._employee_store.path)
+
+        body = client.post('/api/employees/score?cache=0').get_json()
+        assert (body['total_employees'], body['total_errors']) == (2, 1)
+        assert body['columns']['employee_id'] == ['E1', 'E2', 'E3']
+        assert body['columns']['risk_score'][2] is None and body['columns']['risk_category'][2] is None
+
+        single = client.post('/api/predict-attrition?cache=0', json=profile('E2', salary=3000, rating=1)).get_json()
+        assert body['columns']['risk_score'][1] == single['prediction']['risk_score']
+
+        department = client.post('/api/employees/score?department=Marketing').get_json()
+        assert (department['total_employees'], department['total_errors']) == (0, 1)
+    with_api_store(run)
+
+
+if __name__ == "__main__":
+    tests = [
+        test_load_validation,
+        test_profiles_roundtrip,
+        test_profiles_many_ids,
+        test_features,
+        test_reencoding_when_classes_change,
+        test_score_single_by_id,
+        test_score_batch_by_id,
+        test_read_only_calls_do_not_enable_scoring_by_id,
+        test_score_all_stored
+    ]
+    for test in tests:
+        test()
+        print(f"✅ {test.__name__}")
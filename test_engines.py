@@ -0,0 +1,223 @@
+"""
+Test Nexora Inference Engines - Parity with sklearn
+Runs with pytest or directly: python test_engines.py
+"""
+
+import os
+import tempfile
+import warnings
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from forest_engine import ArrayForest
+from risk_index import RiskLookupIndex, INDEX_PATH, file_sha256
+from model_bundle import load_bundle, BUNDLE_PATH
+from forest_codegen import build_compiled_module, import_compiled
+
+warnings.filterwarnings('ignore', category=UserWarning)
+
+DATA_PATH = 'WA_Fn-UseC_-HR-Employee-Attrition.csv'
+FEATURE_COLUMNS = ['salary', 'performanceRating', 'department_encoded', 'jobTitle_encoded']
+
+model = joblib.load('nexora_attrition_model.pkl')
+# Sequential trees keep predict_proba bit-for-bit deterministic
+model.set_params(n_jobs=1)
+dept_encoder = joblib.load('department_encoder.pkl')
+job_encoder = joblib.load('job_encoder.pkl')
+
+
+def load_feature_matrix():
+    """Training features if the HR dataset is present, else a dense grid"""
+    if os.path.exists(DATA_PATH):
+        df = pd.read_csv(DATA_PATH)
+        return np.column_stack([
+            df['MonthlyIncome'],
+            df['PerformanceRating'],
+            dept_encoder.transform(df['Department']),
+            job_encoder.transform(df['JobRole'])
+        ]).astype(float)
+
+    rng = np.random.default_rng(42)
+    n = 5000
+    return np.column_stack([
+        rng.integers(1000, 20000, n),
+        rng.integers(1, 5, n),
+        rng.integers(0, len(dept_encoder.classes_), n),
+        rng.integers(0, len(job_encoder.classes_), n)
+    ]).astype(float)
+
+
+_compiled = None
+
+
+def compiled_module():
+    """Compiled forest generated into a temp directory from the current model"""
+    global _compiled
+    if _compiled is None:
+        path = os.path.join(tempfile.mkdtemp(prefix='nexora-compiled-'), 'nexora_forest_compiled.py')
+        build_compiled_module(path=path)
+        _compiled = import_compiled(path)
+    return _compiled
+
+
+def sklearn_proba(X):
+    return model.predict_proba(pd.DataFrame(X, columns=FEATURE_COLUMNS))
+
+
+def test_native_batch_parity():
+    """ArrayForest.predict_proba matches sklearn on the feature matrix"""
+    forest = ArrayForest.from_model(model)
+    X = load_feature_matrix()
+    np.testing.assert_allclose(forest.predict_proba(X), sklearn_proba(X), rtol=0, atol=1e-12)
+
+
+def test_native_single_row_parity():
+    """ArrayForest.predict_one matches sklearn row by row"""
+    forest = ArrayForest.from_model(model)
+    X = load_feature_matrix()[:200]
+    expected = sklearn_proba(X)[:, 1]
+    actual = np.array([forest.predict_one(row) for row in X])
+    np.testing.assert_allclose(actual, expected, rtol=0, atol=1e-12)
+
+
+def test_lookup_index_exact():
+    """RiskLookupIndex on disk matches sklearn exactly"""
+    index = RiskLookupIndex.load(INDEX_PATH)
+    assert index.model_sha256 == file_sha256('nexora_attrition_model.pkl')
+    X = load_feature_matrix()
+    X[:, 1] = np.clip(X[:, 1], 1, 4)
+    assert np.array_equal(index.predict(X), sklearn_proba(X)[:, 1])
+    assert index.verify(model) == 0
+
+
+def test_lookup_single_row_exact():
+    """RiskLookupIndex.lookup matches sklearn row by row"""
+    index = RiskLookupIndex.load(INDEX_PATH)
+    X = load_feature_matrix()[:200]
+    expected = sklearn_proba(X)[:, 1]
+    actual = np.array([index.lookup(row[0], row[1], row[2], row[3]) for row in X])
+    assert np.array_equal(actual, expected)
+
+
+def test_bundle_parity():
+    """Memory-mapped bundle scores exactly like the pickled artifacts"""
+    bundle = load_bundle(BUNDLE_PATH)
+    assert bundle.model_sha256 == file_sha256('nexora_attrition_model.pkl')
+    assert list(bundle.dept_encoder.classes_) == list(dept_encoder.classes_)
+    assert list(bundle.job_encoder.classes_) == list(job_encoder.classes_)
+    X = load_feature_matrix()
+    X[:, 1] = np.clip(X[:, 1], 1, 4)
+    assert np.array_equal(bundle.forest.predict_proba(X), ArrayForest.from_model(model).predict_proba(X))
+    assert np.array_equal(bundle.risk_index.predict(X), sklearn_proba(X)[:, 1])
+
+
+def test_compiled_exact():
+    """Generated forest module matches sklearn exactly, batch and single row"""
+    compiled = compiled_module()
+    assert compiled.MODEL_SHA256 == file_sha256('nexora_attrition_model.pkl')
+    X = load_feature_matrix()
+    expected = sklearn_proba(X)[:, 1]
+    assert np.array_equal(compiled.predict(X), expected)
+    actual = np.array([compiled.predict(row)[0] for row in X[:200]])
+    assert np.array_equal(actual, expected[:200])
+
+
+def test_compiled_leaf_counts():
+    """Leaf values stored as weighted counts (sklearn < 1.4) give the same risks as fractions"""
+    from forest_codegen import _leaf_risk
+    tree = model.estimators_[0].tree_
+    leaves = np.flatnonzero(tree.children_left == -1)
+
+    class CountsTree:
+        value = tree.value * tree.weighted_n_node_samples[:, None, None]
+
+    fractions = np.array([_leaf_risk(tree, node, False) for node in leaves])
+    counts = np.array([_leaf_risk(CountsTree, node, True) for node in leaves])
+    np.testing.assert_allclose(counts, fractions, rtol=0, atol=1e-12)
+
+
+def test_compiled_engine_opt_in():
+    """The compiled module is only loaded when asked for, and generated if missing"""
+    from inference import build_engines, build_bundle_engines
+    assert 'compiled' not in build_engines(model, compiled=False)
+    assert 'compiled' in build_engines(model, compiled=True)
+    bundle = load_bundle(BUNDLE_PATH)
+    assert 'compiled' not in build_bundle_engines(bundle, compiled=False)
+    assert 'compiled' in build_bundle_engines(bundle, compiled=True)
+
+
+def mixed_employees(n=300, seed=1):
+    """Valid rows mixed with missing fields, unknown categories and bad numbers"""
+    rng = np.random.default_rng(seed)
+    departments = list(dept_encoder.classes_) + ['Bogus']
+    job_titles = list(job_encoder.classes_) + ['Astronaut']
+    employees = []
+    for i in range(n):
+        emp = {
+            'salary': int(rng.integers(1000, 20000)),
+            'performanceRating': int(rng.integers(1, 5)),
+            'department': departments[rng.integers(len(departments))],
+            'jobTitle': job_titles[rng.integers(len(job_titles))],
+            'employee_id': f'E{i}'
+        }
+        if i % 37 == 0:
+            del emp['salary']
+        if i % 41 == 0:
+            emp['salary'] = 'abc'
+        if i % 53 == 0:
+            emp['employee_name'] = f'Employee {i}'
+        employees.append(emp)
+    return employees
+
+
+def test_batch_matches_single():
+    """Vectorized predict_batch returns what predict_single row by row did:
+    same predictions, same error entries and messages, same order"""
+    import api
+    employees = mixed_employees()
+    
+    expected_predictions, expected_errors = [], []
+    for emp in employees:
+        if not all(k in emp for k in api.REQUIRED_FIELDS):
+            expected_errors.append({'employee_id': emp.get('employee_id', 'Unknown'), 'error': 'Missing fields'})
+            continue
+        result = api.predict_single(emp['salary'], emp['performanceRating'], emp['department'], emp['jobTitle'],
+                                    use_cache=False)
+        if 'error' in result:
+            expected_errors.append({'employee_id': emp['employee_id'], 'error': result['error']})
+            continue
+        result['employee_id'] = emp.get('employee_id', 'N/A')
+        result['employee_name'] = emp.get('employee_name', 'N/A')
+        expected_predictions.append(result)
+    
+    with api.app.test_request_context():
+        predictions, errors = api.predict_batch(employees, use_cache=False)
+    
+    assert expected_predictions and expected_errors
+    assert predictions == expected_predictions
+    assert errors == expected_errors
+    # Every error kind is covered
+    messages = {e['error'] for e in errors}
+    assert 'Missing fields' in messages
+    assert any(m.startswith('Invalid department') for m in messages)
+    assert any(m.startswith('Invalid job title') for m in messages)
+    assert any('abc' in m for m in messages)
+
+
+if __name__ == "__main__":
+    tests = [
+        test_native_batch_parity,
+        test_native_single_row_parity,
+        test_lookup_index_exact,
+        test_lookup_single_row_exact,
+        test_bundle_parity,
+        test_compiled_exact,
+        test_compiled_leaf_counts,
+        test_compiled_engine_opt_in,
+        test_batch_matches_single
+    ]
+    for test in tests:
+        test()
+        print(f"✅ {test.__name__}")
@@ -0,0 +1,181 @@
+"""
+Test the asynchronous batch job queue (job_store.py) on a temporary database
+Runs with pytest or directly: python test_job_store.py
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from job_store import JobStore, JobQueueFull
+
+
+def make_store(**kwargs):
+    kwargs.setdefault('chunk_size', 2)
+    return JobStore(os.path.join(tempfile.mkdtemp(prefix='nexora-jobs-'), 'jobs.db'), **kwargs)
+
+
+def employees(n):
+    return [{'employee_id': f'E{i}', 'salary': 5000, 'performanceRating': 3,
+             'department': 'Sales', 'jobTitle': 'Sales Executive'} for i in range(n)]
+
+
+def dead_pid():
+    """Pid of a process that has already exited"""
+    process = subprocess.Popen([sys.executable, '-c', 'pass'])
+    process.wait()
+    return process.pid
+
+
+def finish(store, claimed, text=None):
+    job_id, idx, first_row, engine, chunk = claimed
+    store.complete_chunk(job_id, idx, text or f'chunk {idx}\n', 0, {'Low-risk': len(chunk)}, 0.1 * len(chunk))
+
+
+def test_submit_and_claim_in_order():
+    """Jobs are split into chunks and claimed oldest job first, chunk by chunk"""
+    store = make_store()
+    first = store.submit(employees(5), engine='native')
+    second = store.submit(employees(1))
+    job = store.get(first)
+    assert (job['status'], job['total_rows'], job['n_chunks']) == ('queued', 5, 3)
+
+    claimed = [store.claim_chunk(os.getpid()) for _ in range(4)]
+    assert [(c[0], c[1], c[2]) for c in claimed] == [(first, 0, 0), (first, 1, 2), (first, 2, 4), (second, 0, 0)]
+    assert claimed[0][3] == 'native'
+    assert [e['employee_id'] for e in claimed[1][4]] == ['E2', 'E3']
+    assert store.claim_chunk(os.getpid()) is None
+    assert store.get(first)['status'] == 'running'
+
+    for c in claimed[:3]:
+        finish(store, c)
+    job = store.get(first)
+    assert (job['status'], job['done_rows'], job['done_chunks']) == ('done', 5, 3)
+    assert job['summary']['low_risk'] == 5
+
+
+def test_result_paging():
+    """results() returns consecutive finished chunks only, from `after`, at most max_chunks"""
+    store = make_store()
+    job_id = store.submit(employees(8))
+    claimed = [store.claim_chunk(os.getpid()) for _ in range(4)]
+    # Chunk 1 finishes last: paging must stop at the gap
+    for c in (claimed[0], claimed[2], claimed[3]):
+        finish(store, c)
+    assert store.results(job_id) == (['chunk 0\n'], 1)
+    assert store.results(job_id, after=1) == ([], 1)
+
+    finish(store, claimed[1])
+    assert store.results(job_id, after=1, max_chunks=2) == (['chunk 1\n', 'chunk 2\n'], 3)
+    assert store.results(job_id, after=3) == (['chunk 3\n'], 4)
+    assert store.results(job_id, after=4) == ([], 4)
+
+
+def test_requeue_after_lease_or_dead_worker():
+    """Chunks past their lease or held by a dead worker go back to the queue"""
+    store = make_store(lease_seconds=3600)
+    job_id = store.submit(employees(4))
+    alive = store.claim_chunk(os.getpid())
+    dead = store.claim_chunk(dead_pid())
+    assert store.requeue_stale() == 1
+    again = store.claim_chunk(os.getpid())
+    assert (again[0], again[1]) == (dead[0], dead[1])
+
+    store.lease_seconds = 0
+    time.sleep(0.01)
+    assert store.requeue_stale() == 2
+    assert store.claim_chunk(os.getpid())[1] == alive[1]
+    assert store.get(job_id)['status'] == 'running'
+
+
+def test_crashing_chunk_fails_after_max_attempts():
+    """A chunk that keeps killing its worker fails the job instead of looping forever"""
+    store = make_store(max_attempts=2)
+    job_id = store.submit(employees(4))
+    assert store.claim_chunk(dead_pid())[1] == 0
+    assert store.requeue_stale() == 1
+    assert store.claim_chunk(dead_pid())[1] == 0
+    assert store.requeue_stale() == 0
+
+    job = store.get(job_id)
+    assert job['status'] == 'failed'
+    assert 'Chunk 0' in job['error']
+    # Remaining chunks of a failed job are never handed out
+    assert store.claim_chunk(os.getpid()) is None
+
+
+def test_failed_chunk_retried_then_fails_job():
+    """fail_chunk requeues until max_attempts, then fails the job"""
+    store = make_store(max_attempts=2)
+    job_id = store.submit(employees(2))
+    store.fail_chunk(job_id, store.claim_chunk(os.getpid())[1], 'boom')
+    assert store.get(job_id)['status'] == 'running'
+    store.fail_chunk(job_id, store.claim_chunk(os.getpid())[1], 'boom')
+    job = store.get(job_id)
+    assert (job['status'], job['error']) == ('failed', 'Chunk 0: boom')
+
+
+def test_missing_engine_fails_job():
+    """A chunk for an engine the workers lack fails the job at once, naming the engine"""
+    from job_worker import process_chunk
+    store = make_store(max_attempts=3)
+    job_id = store.submit(employees(2), engine='compiled')
+
+    def score(X):
+        raise AssertionError('must not score with another engine')
+
+    process_chunk(store, store.claim_chunk(os.getpid()), {'sklearn': score}, 'sklearn', None, None)
+    job = store.get(job_id)
+    assert job['status'] == 'failed'
+    assert "Engine 'compiled' not available" in job['error']
+    assert store.claim_chunk(os.getpid()) is None
+
+
+def test_cancel():
+    """Cancelling drops queued chunks; finished or unknown jobs cannot be cancelled"""
+    store = make_store()
+    job_id = store.submit(employees(6))
+    running = store.claim_chunk(os.getpid())
+    assert store.cancel(job_id) is True
+    assert store.get(job_id)['status'] == 'cancelled'
+    assert store.claim_chunk(os.getpid()) is None
+    # The chunk already running may still finish; the job stays cancelled
+    finish(store, running)
+    assert store.get(job_id)['status'] == 'cancelled'
+    assert store.cancel(job_id) is False
+    assert store.cancel('no-such-job') is False
+
+
+def test_limits():
+    """Queue depth and job size limits"""
+    store = make_store(max_queued=1, max_rows=3)
+    store.submit(employees(1))
+    try:
+        store.submit(employees(1))
+        assert False, 'expected JobQueueFull'
+    except JobQueueFull:
+        pass
+    for bad in ([], employees(4)):
+        try:
+            store.submit(bad)
+            assert False, 'expected ValueError'
+        except ValueError:
+            pass
+
+
+if __name__ == "__main__":
+    tests = [
+        test_submit_and_claim_in_order,
+        test_result_paging,
+        test_requeue_after_lease_or_dead_worker,
+        test_crashing_chunk_fails_after_max_attempts,
+        test_failed_chunk_retried_then_fails_job,
+        test_missing_engine_fails_job,
+        test_cancel,
+        test_limits
+    ]
+    for test in tests:
+        test()
+        print(f"✅ {test.__name__}")
@@ -0,0 +1,129 @@
+"""
+Test the LRU prediction cache (prediction_cache.py)
+Runs with pytest or directly: python test_prediction_cache.py
+"""
+
+import os
+import tempfile
+import warnings
+
+from prediction_cache import PredictionCache, artifacts_sha256, cache_key
+
+warnings.filterwarnings('ignore', category=UserWarning)
+
+
+def artifact_files(*contents):
+    directory = tempfile.mkdtemp(prefix='nexora-cache-')
+    paths = []
+    for i, content in enumerate(contents):
+        path = os.path.join(directory, f'artifact_{i}.pkl')
+        with open(path, 'wb') as f:
+            f.write(content)
+        paths.append(path)
+    return tuple(paths)
+
+
+def rewrite(path, content):
+    with open(path, 'wb') as f:
+        f.write(content)
+    # Make the change visible to the stat() pre-check even on coarse clocks
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_cache_key_normalization():
+    """5000, 5000.0 and '5000' share one entry; the engine is part of the key"""
+    key = cache_key(5000, 3, 'Sales', 'Sales Executive', 'native')
+    assert cache_key(5000.0, 3.0, 'Sales', 'Sales Executive', 'native') == key
+    assert cache_key('5000', '3', 'Sales', 'Sales Executive', 'native') == key
+    assert cache_key(5000, 3, 'Sales', 'Sales Executive', 'sklearn') != key
+
+
+def test_lru_eviction():
+    """The least recently used entry is evicted first; get() refreshes recency"""
+    cache = PredictionCache(capacity=2, artifact_paths=artifact_files(b'model'))
+    cache.put('a', 0.1)
+    cache.put('b', 0.2)
+    assert cache.get('a') == 0.1
+    cache.put('c', 0.3)
+    assert cache.get('b') is None
+    assert cache.get('a') == 0.1
+    assert cache.get('c') == 0.3
+    # Re-putting an existing key refreshes it without evicting
+    cache.put('a', 0.15)
+    cache.put('d', 0.4)
+    assert cache.get('c') is None
+    assert cache.get('a') == 0.15
+
+    stats = cache.stats()
+    assert (stats['size'], stats['hits'], stats['misses'], stats['evictions']) == (2, 4, 2, 2)
+    assert stats['hit_rate'] == round(4 / 6, 4)
+
+
+def test_zero_risk_is_a_hit():
+    """A cached risk of 0.0 is a hit, not a miss"""
+    cache = PredictionCache(capacity=1, artifact_paths=artifact_files(b'model'))
+    cache.put('a', 0.0)
+    assert cache.get('a') == 0.0
+    assert cache.stats()['hits'] == 1
+
+
+def test_disabled_cache():
+    """capacity=0 stores nothing and counts nothing"""
+    cache = PredictionCache(capacity=0, artifact_paths=())
+    cache.put('a', 0.1)
+    assert cache.get('a') is None
+    stats = cache.stats()
+    assert (stats['enabled'], stats['size'], stats['misses']) == (False, 0, 0)
+
+
+def test_invalidation_when_artifacts_change():
+    """New artifact content clears the cache; a touch with the same content does not"""
+    paths = artifact_files(b'model v1', b'encoder')
+    cache = PredictionCache(capacity=10, artifact_paths=paths)
+    assert cache.artifact_hash == artifacts_sha256(paths)
+    cache.put('a', 0.1)
+
+    # Same bytes, new mtime: the content hash decides
+    rewrite(paths[0], b'model v1')
+    cache._next_check = 0.0
+    assert cache.get('a') == 0.1
+    assert cache.stats()['invalidations'] == 0
+
+    rewrite(paths[1], b'encoder v2')
+    cache._next_check = 0.0
+    assert cache.get('a') is None
+    stats = cache.stats()
+    assert (stats['invalidations'], stats['size']) == (1, 0)
+    assert cache.artifact_hash == artifacts_sha256(paths)
+
+    # The cache keeps working against the new artifacts
+    cache.put('a', 0.2)
+    assert cache.get('a') == 0.2
+
+
+def test_artifact_checks_are_rate_limited():
+    """Artifacts are checked at most once per ARTIFACT_CHECK_INTERVAL"""
+    paths = artifact_files(b'model v1')
+    cache = PredictionCache(capacity=10, artifact_paths=paths)
+    cache.put('a', 0.1)
+    assert cache.get('a') == 0.1
+    rewrite(paths[0], b'model v2')
+    # Within the interval the change is not seen yet
+    assert cache.get('a') == 0.1
+    cache._next_check = 0.0
+    assert cache.get('a') is None
+
+
+if __name__ == "__main__":
+    tests = [
+        test_cache_key_normalization,
+        test_lru_eviction,
+        test_zero_risk_is_a_hit,
+        test_disabled_cache,
+        test_invalidation_when_artifacts_change,
+        test_artifact_checks_are_rate_limited
+    ]
+    for test in tests:
+        test()
+        print(f"✅ {test.__name__}")
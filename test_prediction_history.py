@@ -0,0 +1,196 @@
+"""
+Test the prediction history (prediction_history.py) on a temporary database
+Runs with pytest or directly: python test_prediction_history.py
+"""
+
+import os
+import sqlite3
+import tempfile
+import time
+from contextlib import closing
+from datetime import datetime, timezone
+
+import prediction_history
+from prediction_history import PredictionHistory, parse_time, utc_day
+
+
+def make_history(**kwargs):
+    return PredictionHistory(os.path.join(tempfile.mkdtemp(prefix='nexora-history-'), 'predictions.db'),
+                             enabled=True, **kwargs)
+
+
+def row(employee_id='E1', department='Sales', risk_score=0.5, risk_category='Medium-risk'):
+    return (employee_id, department, 'Sales Executive', 5000.0, 3.0, risk_score, risk_category, 'native', 'single')
+
+
+def ts(iso):
+    return datetime.fromisoformat(iso).replace(tzinfo=timezone.utc).timestamp()
+
+
+def write_at(history, when, rows):
+    """Write rows with a fixed timestamp, the way the writer thread does"""
+    history._write([(when, *r) for r in rows])
+
+
+def test_record_and_flush():
+    """Queued rows are written in batches by the writer thread"""
+    history = make_history()
+    history.record([row(f'E{i}') for i in range(250)])
+    history.record([row('E0')])
+    history.flush()
+    stats = history.stats()
+    assert (stats['queued'], stats['written'], stats['dropped_queue_full'], stats['write_errors']) == (251, 251, 0, 0)
+    assert stats['queue_depth'] == 0
+    points, truncated = history.employee_trajectory('E0')
+    assert len(points) == 2 and not truncated
+
+
+def test_disabled_history_records_nothing():
+    history = PredictionHistory(os.path.join(tempfile.mkdtemp(prefix='nexora-history-'), 'predictions.db'),
+                                enabled=False)
+    history.record([row()])
+    assert history.stats()['queued'] == 0
+    assert history._thread is None
+
+
+def test_queue_full_drops():
+    """A full queue drops rows instead of blocking the request"""
+    history = make_history(queue_size=2)
+    write_at(history, 0.0, [row()])
+    # Hold the write lock so the writer thread blocks on its first batch
+    with closing(sqlite3.connect(history.path, isolation_level=None)) as db:
+        db.execute('BEGIN IMMEDIATE')
+        history.record([row('E1')])
+        deadline = time.monotonic() + 5
+        while history._queue.qsize() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        history.record([row(f'E{i}') for i in range(10)])
+        db.execute('COMMIT')
+    history.flush()
+    stats = history.stats()
+    assert (stats['queued'], stats['dropped_queue_full'], stats['written']) == (3, 8, 3)
+
+
+def test_failed_batch_keeps_writer_alive():
+    """A batch that raises is counted and dropped; the same thread writes later rows"""
+    history = make_history()
+    history.record([row('E1', risk_score=None)])
+    history.flush()
+    thread = history._thread
+    history.record([row('E2')])
+    history.flush()
+    stats = history.stats()
+    assert (stats['queued'], stats['written'], stats['write_errors'], stats['queue_depth']) == (2, 1, 1, 0)
+    assert history._thread is thread and thread.is_alive()
+    points, _ = history.employee_trajectory('E2')
+    assert len(points) == 1
+
+
+def test_trajectory_order_limit_and_range():
+    """Oldest first, newest `limit` points in [since, until], truncated flag"""
+    history = make_history()
+    base = ts('2024-01-01T00:00:00')
+    for day in range(10):
+        write_at(history, base + day * 86400, [row('E1', risk_score=day / 10)])
+    write_at(history, base, [row('E2')])
+
+    points, truncated = history.employee_trajectory('E1', until=base + 30 * 86400)
+    assert [p['risk_score'] for p in points] == [day / 10 for day in range(10)]
+    assert not truncated
+    assert points[0]['source'] == 'single' and points[0]['department'] == 'Sales'
+
+    points, truncated = history.employee_trajectory('E1', until=base + 30 * 86400, limit=3)
+    assert [p['risk_score'] for p in points] == [0.7, 0.8, 0.9]
+    assert truncated
+
+    points, _ = history.employee_trajectory('E1', since=base + 2 * 86400, until=base + 4 * 86400)
+    assert [p['risk_score'] for p in points] == [0.2, 0.3, 0.4]
+    assert history.employee_trajectory('nobody') == ([], False)
+
+
+def test_department_series_rollups():
+    """Daily rollup rows add up per day, ISO week and month"""
+    history = make_history()
+    # 2024-01-31 is a Wednesday, 2024-02-01 Thursday, 2024-02-05 Monday
+    write_at(history, ts('2024-01-31T10:00:00'), [row(risk_score=0.9, risk_category='High-risk'),
+                                                  row(risk_score=0.1, risk_category='Low-risk')])
+    # A second transaction on the same day merges into the same rollup row
+    write_at(history, ts('2024-01-31T23:00:00'), [row(risk_score=0.5)])
+    write_at(history, ts('2024-02-01T08:00:00'), [row(risk_score=0.2, risk_category='Low-risk')])
+    write_at(history, ts('2024-02-05T08:00:00'), [row(risk_score=0.8, risk_category='High-risk')])
+    write_at(history, ts('2024-02-01T08:00:00'), [row(department='Finance')])
+
+    since, until = ts('2024-01-01T00:00:00'), ts('2024-03-01T00:00:00')
+    days = history.department_series('Sales', since, until, 'day')
+    assert [(d['period'], d['predictions']) for d in days] == [('2024-01-31', 3), ('2024-02-01', 1), ('2024-02-05', 1)]
+    assert days[0]['average_risk_score'] == 0.5
+    assert (days[0]['high_risk'], days[0]['medium_risk'], days[0]['low_risk']) == (1, 1, 1)
+
+    weeks = history.department_series('Sales', since, until, 'week')
+    assert [(w['period'], w['predictions']) for w in weeks] == [('2024-01-29', 4), ('2024-02-05', 1)]
+
+    months = history.department_series('Sales', since, until, 'month')
+    assert [(m['period'], m['predictions']) for m in months] == [('2024-01', 3), ('2024-02', 2)]
+    assert months[1]['average_risk_score'] == 0.5
+
+    # The range is inclusive by UTC day
+    only = history.department_series('Sales', ts('2024-02-01T23:59:00'), ts('2024-02-01T23:59:00'))
+    assert [d['period'] for d in only] == ['2024-02-01']
+
+
+def test_department_series_rejects_bad_queries():
+    history = make_history()
+    too_long = (prediction_history.HISTORY_MAX_DAYS + 1) * 86400
+    for until, interval in ((86400, 'hour'), (too_long, 'day')):
+        try:
+            history.department_series('Sales', 0, until, interval)
+            assert False, 'expected ValueError'
+        except ValueError:
+            pass
+
+
+def test_indexes_used():
+    """Trajectory and series queries are index lookups, not table scans"""
+    history = make_history()
+    write_at(history, 0.0, [row()])
+    with history._connect() as db:
+        plan = ' '.join(r[3] for r in db.execute(
+            'EXPLAIN QUERY PLAN SELECT ts FROM predictions WHERE employee_id = ? AND ts >= ? AND ts <= ? '
+            'ORDER BY ts DESC LIMIT 10', ('E1', 0, 1)))
+        assert 'predictions_employee' in plan
+        plan = ' '.join(r[3] for r in db.execute(
+            'EXPLAIN QUERY PLAN SELECT day FROM department_daily WHERE department = ? AND day >= ? AND day <= ?',
+            ('Sales', '2024-01-01', '2024-02-01')))
+        assert 'PRIMARY KEY' in plan
+
+
+def test_parse_time():
+    assert parse_time(None, default=7) == 7
+    assert parse_time('') is None
+    assert parse_time('1700000000') == 1700000000.0
+    assert parse_time('2024-01-31') == ts('2024-01-31T00:00:00')
+    assert parse_time('2024-01-31T12:00:00Z') == ts('2024-01-31T12:00:00')
+    assert parse_time('2024-01-31T14:00:00+02:00') == ts('2024-01-31T12:00:00')
+    assert utc_day(ts('2024-01-31T23:59:59')) == '2024-01-31'
+    try:
+        parse_time('last tuesday')
+        assert False, 'expected ValueError'
+    except ValueError:
+        pass
+
+
+if __name__ == "__main__":
+    tests = [
+        test_record_and_flush,
+        test_disabled_history_records_nothing,
+        test_queue_full_drops,
+        test_failed_batch_keeps_writer_alive,
+        test_trajectory_order_limit_and_range,
+        test_department_series_rollups,
+        test_department_series_rejects_bad_queries,
+        test_indexes_used,
+        test_parse_time
+    ]
+    for test in tests:
+        test()
+        print(f"✅ {test.__name__}")
@@ -0,0 +1,61 @@
+"""
+Test the offline bulk scorer (score_csv.py)
+Runs with pytest or directly: python test_score_csv.py
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+
+import pandas as pd
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def write_input(n=20):
+    directory = tempfile.mkdtemp(prefix='nexora-score-csv-')
+    path = os.path.join(directory, 'employees.csv')
+    pd.DataFrame({
+        'employee_id': [f'E{i}' for i in range(n)],
+        'salary': [3000 + 100 * i for i in range(n)],
+        'performanceRating': [3] * n,
+        'department': ['Sales'] * n,
+        'jobTitle': ['Sales Executive'] * n
+    }).to_csv(path, index=False)
+    return path, os.path.join(directory, 'scored.csv')
+
+
+def run(*args):
+    # Model artifacts are loaded from the working directory
+    return subprocess.run([sys.executable, 'score_csv.py', *args], cwd=HERE, capture_output=True, text=True,
+                          timeout=120)
+
+
+def test_scores_csv():
+    source, output = write_input()
+    result = run(source, output, '--workers', '1', '--chunksize', '8', '--engine', 'native')
+    assert result.returncode == 0, result.stderr
+    scored = pd.read_csv(output)
+    assert list(scored['employee_id']) == [f'E{i}' for i in range(20)]
+    assert scored['error'].isna().all()
+    assert not os.path.exists(output + '.progress')
+
+
+def test_invalid_engine_fails_fast():
+    """An unknown engine exits non-zero before any worker process is started"""
+    source, output = write_input()
+    result = run(source, output, '--workers', '2', '--engine', 'bogus')
+    assert result.returncode != 0
+    assert "Unknown engine 'bogus'" in result.stderr
+    assert 'Traceback' not in result.stderr
+
+
+if __name__ == "__main__":
+    tests = [
+        test_scores_csv,
+        test_invalid_engine_fails_fast
+    ]
+    for test in tests:
+        test()
+        print(f"✅ {test.__name__}")
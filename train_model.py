@@ -120,6 +120,21 @@ print("✅ Model saved: nexora_attrition_model.pkl")
 print("✅ Encoders saved: department_encoder.pkl, job_encoder.pkl")
 print("✅ Config saved: model_config.json")
 
+# Rebuild the exact risk lookup index for the new model
+from risk_index import build_index, INDEX_PATH
+build_index()
+print(f"✅ Risk index saved: {INDEX_PATH}")
+
+# Forest compiled to Python code for the 'compiled' engine
+from forest_codegen import build_compiled_module, COMPILED_PATH
+build_compiled_module()
+print(f"✅ Compiled forest saved: {COMPILED_PATH}")
+
+# Single-file memory-mappable bundle for the API workers
+from model_bundle import build_bundle, BUNDLE_PATH
+build_bundle()
+print(f"✅ Model bundle saved: {BUNDLE_PATH}")
+
 # Test with Nexora-like sample
 print("\n" + "="*70)
 print("TESTING WITH NEXORA SAMPLE DATA")